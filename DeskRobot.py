@@ -3,6 +3,7 @@ import queue
 
 
 from modules.EventBus import EventBus       # 导入事件总线
+from modules.EventRecorder import EventRecorder     # 导入事件记录器
 from configs.api_config import config       # 导入配置文件
 from configs.log_config import logger       # 导入日志工具
 
@@ -12,6 +13,8 @@ class DeskRobot:
         self.tasklist: list[threading.Thread] = []  # 任务列表
         self.event_queue = queue.Queue()            # 事件队列
         self.event_bus = EventBus()                 # 事件总线
+        self.recorder = EventRecorder()             # 事件记录器: 始终保留最近 30 秒的事件
+        self.recorder.install_crash_hooks()         # 出现未捕获的异常时保存到 localfiles/crash_events.evrec
 
     def add_task(self, task: threading.Thread):     # 添加任务
         self.tasklist.append(task)
@@ -175,6 +178,9 @@ if __name__ == "__main__":
     """
     from modules.mod_face_track import FaceTrack
     robot.add_task(FaceTrack())
+    # 计算密集的模块 (mediapipe / torch / openwakeword) 可以放到独立进程中运行, 避免争抢 GIL:
+    # from modules.EventBusIPC import ProcessTask
+    # robot.add_task(ProcessTask(FaceTrack))
 
 
     # 开始运行
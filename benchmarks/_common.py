@@ -0,0 +1,31 @@
+"""
+基准测试脚本共用的工具函数
+"""
+
+import subprocess
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def percentiles(samples):
+    """返回样本的分位数 (样本单位: 纳秒, 结果单位: 微秒)"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for p in PERCENTILES:
+        index = min(len(ordered) - 1, int(len(ordered) * p / 100))
+        result[f"p{p}"] = round(ordered[index] / 1000, 2)
+    result["max"] = round(ordered[-1] / 1000, 2)
+    result["count"] = len(ordered)
+    return result
+
+
+def git_version():
+    """当前代码的 git 版本 (git describe), 不在 git 仓库中时返回 None"""
+    try:
+        return subprocess.check_output(
+            ["git", "describe", "--always", "--dirty"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
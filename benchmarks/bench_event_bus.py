@@ -0,0 +1,242 @@
+"""
+EventBus 性能基准测试
+
+模拟机器人真实的事件拓扑, 测量消息总线本身的开销:
+    - UPDATE_LAYER      50 fps  (OLED 表情帧, 合并订阅)
+    - FACE_RECT         30 fps  (摄像头人脸位置, 合并订阅)
+    - CAR_STEER         40 Hz   (摇杆/手柄, 合并订阅)
+    - 语音事件          突发     (VOICE_COMMAND_DETECTED 携带 PCM 数据 + 一串对话控制事件)
+
+输出:
+    - publish 调用耗时分位数 (p50 / p90 / p99 / p99.9 / max)
+    - 端到端投递延迟分位数 (publish 到订阅者取出)
+    - 各优先级通道的排队等待时间
+    - 每 CPU 核心秒可发布的事件数 (满负荷模式)
+    - 内存增长 (tracemalloc)
+结果写入 JSON 文件, 便于在树莓派和 x86 上对比不同版本。
+
+用法 (在项目根目录运行):
+    python benchmarks/bench_event_bus.py                         # 默认运行 10 秒
+    python benchmarks/bench_event_bus.py --duration 30 --output localfiles/bench_pi4.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import queue
+import sys
+import threading
+import time
+import tracemalloc
+
+from _common import git_version, percentiles
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.EventBus import EventBus, EventQueue
+
+
+# (事件类型, 频率 Hz, data 生成函数)
+STREAMS = [
+    ("UPDATE_LAYER", 50, lambda: {"layer_id": "roboeyes", "image": bytes(1024), "z_index": 0, "position": (0, 0)}),
+    ("FACE_RECT", 30, lambda: {"rect": (200, 120, 160, 160)}),
+    ("CAR_STEER", 40, lambda: {"x": 0.1, "y": 0.5}),
+]
+
+# 一次语音对话产生的事件序列, 每隔 VOICE_PERIOD 秒突发一次
+VOICE_BURST = [
+    ("VOICE_COMMAND_DETECTED", lambda: {"audio_data": bytes(16000 * 2 * 3), "sample_rate": 16000, "channels": 1}),
+    ("STT_RESULT_RECEIVED", lambda: {"text": "今天天气怎么样"}),
+    ("INTERRUPTION_DETECTED", dict),
+    ("START_AI_THINKING", dict),
+    ("SPEAK_TEXT", lambda: {"text": "今天晴, 气温二十五度"}),
+    ("STOP_AI_THINKING", dict),
+    ("TTS_STARTED", dict),
+    ("TTS_FINISHED", dict),
+]
+VOICE_PERIOD = 2.0
+
+
+class Consumer(threading.Thread):
+    """模拟一个订阅模块: 从收件箱取事件并记录端到端延迟"""
+
+    def __init__(self, name, event_queue, work_time=0.0):
+        super().__init__(daemon=True, name=name)
+        self.event_queue = event_queue
+        self.work_time = work_time          # 模拟每条事件的处理耗时
+        self.latencies = []
+        self.received = 0
+
+    def run(self):
+        while True:
+            event = self.event_queue.get()
+            if event["type"] == "EXIT":
+                break
+            self.latencies.append(time.perf_counter_ns() - event["data"]["_t"])
+            self.received += 1
+            if self.work_time:
+                time.sleep(self.work_time)
+
+
+def build_topology(bus):
+    """按真实模块的订阅方式创建订阅者"""
+    oled = Consumer("OLED模块", EventQueue(), work_time=0.015)      # 模拟一次 I2C 全屏刷新
+    bus.subscribe("UPDATE_LAYER", oled.event_queue, oled.name, conflate="layer_id")
+
+    face = Consumer("人脸追踪", EventQueue())
+    bus.subscribe("FACE_RECT", face.event_queue, face.name, conflate=True)
+
+    car = Consumer("小车模块", EventQueue())
+    bus.subscribe("CAR_STEER", car.event_queue, car.name, conflate=True)
+
+    stt = Consumer("STT模块", EventQueue(), work_time=0.2)          # 模拟在线识别耗时
+    bus.subscribe("VOICE_COMMAND_DETECTED", stt.event_queue, stt.name, maxsize=2)
+
+    voice = Consumer("语音模块", queue.Queue())
+    for event_type, _ in VOICE_BURST[1:]:
+        bus.subscribe(event_type, voice.event_queue, voice.name)
+
+    consumers = [oled, face, car, stt, voice]
+    for consumer in consumers:
+        bus.subscribe("EXIT", consumer.event_queue, consumer.name)
+    return consumers
+
+
+def run_paced(bus, duration, rate_scale):
+    """按真实频率发布事件, 测量 publish 耗时和端到端延迟"""
+    consumers = build_topology(bus)
+    for consumer in consumers:
+        consumer.start()
+
+    publish_ns = {}
+    stop = threading.Event()
+
+    def stream_publisher(event_type, hz, make_data):
+        interval = 1.0 / (hz * rate_scale)
+        samples = publish_ns.setdefault(event_type, [])
+        next_time = time.monotonic()
+        while not stop.is_set():
+            data = make_data()
+            data["_t"] = start = time.perf_counter_ns()
+            bus.publish(event_type, data, "基准测试")
+            samples.append(time.perf_counter_ns() - start)
+            next_time += interval
+            stop.wait(max(0.0, next_time - time.monotonic()))
+
+    def voice_publisher():
+        samples = publish_ns.setdefault("VOICE_BURST", [])
+        while not stop.wait(VOICE_PERIOD / rate_scale):
+            for event_type, make_data in VOICE_BURST:
+                data = make_data()
+                data["_t"] = start = time.perf_counter_ns()
+                bus.publish(event_type, data, "基准测试")
+                samples.append(time.perf_counter_ns() - start)
+
+    publishers = [threading.Thread(target=stream_publisher, args=stream, daemon=True) for stream in STREAMS]
+    publishers.append(threading.Thread(target=voice_publisher, daemon=True))
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    cpu_before = time.process_time()
+    for publisher in publishers:
+        publisher.start()
+    time.sleep(duration)
+    stop.set()
+    for publisher in publishers:
+        publisher.join()
+    cpu_time = time.process_time() - cpu_before
+    memory_after, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    bus.publish("EXIT", {"_t": time.perf_counter_ns()}, "基准测试")
+    for consumer in consumers:
+        consumer.join(timeout=5)
+
+    published = sum(len(samples) for samples in publish_ns.values())
+    return {
+        "duration_s": duration,
+        "published": published,
+        "cpu_time_s": round(cpu_time, 3),
+        "cpu_utilization": round(cpu_time / duration, 3),
+        "publish_latency_us": {name: percentiles(samples) for name, samples in publish_ns.items()},
+        "delivery_latency_us": {c.name: percentiles(c.latencies) for c in consumers},
+        "received": {c.name: c.received for c in consumers},
+        "subscriptions": [s for s in bus.get_stats() if s["type"] != "EXIT"],
+        "lane_wait": {c.name: c.event_queue.lane_stats() for c in consumers if isinstance(c.event_queue, EventQueue)},
+        "memory": {
+            "growth_kb": round((memory_after - memory_before) / 1024, 1),
+            "peak_kb": round(memory_peak / 1024, 1),
+        },
+    }
+
+
+def run_saturated(bus, events):
+    """单线程满负荷发布, 测量每 CPU 核心秒能发布的事件数"""
+    inboxes = [EventQueue(), EventQueue(), queue.Queue()]
+    bus.subscribe("UPDATE_LAYER", inboxes[0], "合并订阅", conflate="layer_id")
+    bus.subscribe("CAR_STEER", inboxes[1], "限长订阅", maxsize=4)
+    bus.subscribe("FACE_RECT", inboxes[2], "普通订阅")
+
+    results = {}
+    for event_type in ("UPDATE_LAYER", "CAR_STEER", "FACE_RECT", "NO_SUBSCRIBER"):
+        data = {"layer_id": "roboeyes", "x": 0.1, "y": 0.5}
+        cpu_before = time.process_time()
+        wall_before = time.perf_counter()
+        for _ in range(events):
+            bus.publish(event_type, data, "基准测试")
+        cpu_time = time.process_time() - cpu_before
+        wall_time = time.perf_counter() - wall_before
+        results[event_type] = {
+            "events_per_cpu_s": round(events / cpu_time) if cpu_time else None,
+            "mean_publish_us": round(wall_time / events * 1e6, 3),
+        }
+        # 清空普通订阅的收件箱, 避免影响下一轮
+        while not inboxes[2].empty():
+            inboxes[2].get_nowait()
+    return results
+
+
+def fresh_bus(trace):
+    EventBus._instance = None
+    bus = EventBus()
+    if not trace:
+        bus.set_tracer(None)
+        logging.getLogger("消息总线").setLevel(logging.ERROR)   # 满负荷模式下的丢弃警告也一并关闭
+    return bus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventBus 吞吐量与延迟基准测试")
+    parser.add_argument("--duration", type=float, default=10, help="真实频率模式的运行秒数")
+    parser.add_argument("--rate-scale", type=float, default=1.0, help="所有事件频率的放大倍数")
+    parser.add_argument("--events", type=int, default=200000, help="满负荷模式每种事件的发布次数")
+    parser.add_argument("--trace", action="store_true", help="开启事件日志 (默认关闭以只测量总线本身)")
+    parser.add_argument("--output", default="localfiles/bench_event_bus.json", help="结果 JSON 文件路径")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "event_bus",
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "config": vars(args),
+    }
+    print(f"真实频率模式: 运行 {args.duration} 秒...")
+    report["paced"] = run_paced(fresh_bus(args.trace), args.duration, args.rate_scale)
+    print(f"满负荷模式: 每种事件发布 {args.events} 次...")
+    report["saturated"] = run_saturated(fresh_bus(args.trace), args.events)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps(report["saturated"], indent=2, ensure_ascii=False))
+    print("结果已保存:", args.output)
+
+
+if __name__ == "__main__":
+    main()
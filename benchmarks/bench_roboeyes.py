@@ -0,0 +1,175 @@
+"""
+RoboEyes 渲染基准测试
+
+不接屏幕, 用虚拟时钟和固定种子的随机数生成器驱动 RoboeyesAPI,
+按脚本依次播放眨眼, 闲置张望, 各种心情, 大笑和疑惑, 逐帧测量眼睛动画本身的开销:
+    - 每帧渲染耗时分位数 (p50 / p90 / p99 / p99.9 / max)
+    - 每帧内存分配 (tracemalloc 统计的临时分配峰值和渲染后保留的字节数)
+    - 每帧图像的 CRC32 校验值序列: 同样的参数下结果完全确定,
+      用 --expect 与之前保存的结果对比, 可以发现渲染结果的意外变化
+结果写入 JSON 文件, 便于在树莓派和 x86 上对比不同版本。
+
+用法 (在项目根目录运行):
+    python benchmarks/bench_roboeyes.py                              # 默认播放 30 秒动画
+    python benchmarks/bench_roboeyes.py --seconds 60 --output localfiles/bench_roboeyes_pi4.json
+    python benchmarks/bench_roboeyes.py --expect localfiles/bench_roboeyes.json   # 检查渲染结果是否变化
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+
+from _common import git_version, percentiles
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.API_OLED.roboeyes_api import RoboeyesAPI
+
+
+# 每段脚本的 (起始秒数, 方法名, 参数), 播放完一轮后从头循环
+SCRIPT = [
+    (0.0, "open_eyes", ()),
+    (2.0, "close_eyes", ()),
+    (2.3, "open_eyes", ()),
+    (4.0, "set_expression", ("tired",)),
+    (7.0, "set_expression", ("angry",)),
+    (10.0, "set_expression", ("happy",)),
+    (13.0, "set_expression", ("default",)),
+    (14.0, "trigger_quick_expression", ("laugh",)),
+    (16.0, "trigger_quick_expression", ("confused",)),
+    (18.0, "set_look_direction", (2,)),         # NE
+    (19.0, "set_look_direction", (6,)),         # SW
+    (20.0, "center_eyes", ()),
+]
+SCRIPT_LENGTH = 22.0
+
+
+class VirtualClock:
+    """虚拟时钟: 每帧手动前进, 与真实耗时无关"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def frames(seconds, frame_rate, seed):
+    """按脚本逐帧驱动动画, 依次产出 (帧序号, 渲染函数, RoboEyes 实例); 渲染函数在画面变化时返回图像"""
+    clock = VirtualClock()
+    api = RoboeyesAPI(frame_rate, 128, 64, clock=clock, rng=random.Random(seed))
+    api.set_autoblinker(True, 1, 4)
+    api.set_idle_mode(True, 2, 4)
+    cycle, next_action = 0, 0
+    for frame in range(int(seconds * frame_rate)):
+        clock.now = frame / frame_rate
+        if clock.now >= (cycle + 1) * SCRIPT_LENGTH:
+            cycle, next_action = cycle + 1, 0       # 新一轮脚本
+        offset = clock.now - cycle * SCRIPT_LENGTH
+        while next_action < len(SCRIPT) and offset >= SCRIPT[next_action][0]:
+            _, method, args = SCRIPT[next_action]
+            getattr(api, method)(*args)
+            next_action += 1
+        yield frame, api.update, api.rbe
+
+
+def run_timing(seconds, frame_rate, seed):
+    """测量每帧渲染耗时, 记录每帧的校验值"""
+    render_ns = []
+    drawn_ns = []
+    checksums = []
+    for _, draw, eyes in frames(seconds, frame_rate, seed):
+        start = time.perf_counter_ns()
+        changed = draw() is not None
+        elapsed = time.perf_counter_ns() - start
+        render_ns.append(elapsed)
+        if changed:
+            drawn_ns.append(elapsed)
+        checksums.append(zlib.crc32(eyes.image.tobytes()))
+    return {
+        "frames": len(render_ns),
+        "drawn_frames": len(drawn_ns),         # 画面有变化的帧, 其余帧被跳过或与上一帧相同
+        "render_us": percentiles(render_ns),
+        "drawn_render_us": percentiles(drawn_ns),
+        "sprite_cache": eyes.sprites.stats(),
+    }, checksums
+
+
+def run_allocations(seconds, frame_rate, seed):
+    """
+    用 tracemalloc 统计每帧的内存分配 (单独运行一遍, 避免影响耗时测量)
+
+    peak_bytes: 渲染一帧期间临时分配的峰值字节数; retained_bytes: 渲染后仍未释放的字节数 (缓存等)
+    """
+    peak_bytes = []
+    retained_bytes = 0
+    tracemalloc.start()
+    for _, draw, _ in frames(seconds, frame_rate, seed):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        draw()
+        after, peak = tracemalloc.get_traced_memory()
+        peak_bytes.append(peak - current)
+        retained_bytes += after - current
+    tracemalloc.stop()
+    return {
+        "mean_peak_bytes_per_frame": round(sum(peak_bytes) / len(peak_bytes), 1) if peak_bytes else None,
+        "max_peak_bytes_per_frame": max(peak_bytes, default=None),
+        "retained_bytes": retained_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RoboEyes 渲染耗时与确定性基准测试")
+    parser.add_argument("--seconds", type=float, default=30, help="播放的动画时长 (虚拟时间)")
+    parser.add_argument("--frame-rate", type=int, default=50, help="动画帧率")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("--expect", help="之前保存的结果 JSON, 对比校验值序列")
+    parser.add_argument("--output", default="localfiles/bench_roboeyes.json", help="结果 JSON 文件路径")
+    args = parser.parse_args()
+    logging.getLogger("Roboeyes").setLevel(logging.WARNING)
+
+    report = {
+        "benchmark": "roboeyes",
+        "version": git_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "config": vars(args),
+    }
+    print(f"渲染 {args.seconds} 秒动画 ({args.frame_rate} fps)...")
+    report["timing"], checksums = run_timing(args.seconds, args.frame_rate, args.seed)
+    report["allocations"] = run_allocations(args.seconds, args.frame_rate, args.seed)
+    report["checksum"] = f"{zlib.crc32(json.dumps(checksums).encode()):08x}"
+    report["checksums"] = checksums
+
+    exit_code = 0
+    if args.expect:
+        with open(args.expect, encoding="utf-8") as f:
+            expected = json.load(f)["checksums"]
+        mismatch = next((i for i, (a, b) in enumerate(zip(expected, checksums)) if a != b), None)
+        if mismatch is None and len(expected) == len(checksums):
+            print("校验值序列与", args.expect, "一致")
+        else:
+            frame = mismatch if mismatch is not None else min(len(expected), len(checksums))
+            print(f"校验值序列不一致: 第 {frame} 帧 ({frame / args.frame_rate:.2f} 秒) 开始不同")
+            exit_code = 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(json.dumps({k: report[k] for k in ("timing", "allocations", "checksum")}, indent=2, ensure_ascii=False))
+    print("结果已保存:", args.output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -197,6 +197,16 @@ class AiAPI:
         else:
             return "抱歉，我不明白你的意思。"
 
+    def _tool_get_temperature(self) -> str:
+        """
+        【工具逻辑】查询温湿度传感器的读数。
+        """
+        logger.info("工具[get_temperature]被调用")
+        result = self.event_bus.request("GET_TEMPERATURE", self.__class__.__name__, timeout=2.0)
+        if result is None:
+            return "温湿度传感器没有响应。"
+        return f"当前温度 {result['temperature']} 度，湿度 {result['humidity']}%。"
+
     def __get_tools(self):
         """
         定义并返回 Agent 可用的工具列表。
@@ -245,10 +255,18 @@ class AiAPI:
             description="音乐播放器有 play, pause, previous, next 等操作。调用此工具来控制音乐播放器的播放、暂停、上一曲,下一曲等操作。",
         )
 
+        get_temperature_tool = StructuredTool(
+            name="get_temperature",
+            func=self._tool_get_temperature,
+            args_schema={},
+            description="查询房间当前的温度和湿度。当用户询问温度、湿度、冷不冷、热不热时调用。",
+        )
+
         tools = [set_expr_tool,
                  trigger_expr_tool, 
                  get_secret_number_tool,
-                 music_controller_tool]
+                 music_controller_tool,
+                 get_temperature_tool]
         logger.info(f"成功加载 {len(tools)} 个工具。")
         return tools
 
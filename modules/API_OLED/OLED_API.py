@@ -11,6 +11,7 @@ OLED显示API
     oled = OLED.get_instance()              # 获取OLED的单例实例
     oled.clear_display()                    # 清屏
     oled.display_image(image)               # 显示图像 (image: PIL图像对象) 
+    oled.display_pages(pages)               # 显示 SSD1306 页格式的帧缓冲 (见 framebuffer.py), 只发送有变化的部分
 
 
 使用单例模式实现，确保全局只有一个实例。
@@ -20,8 +21,15 @@ OLED显示API
 import logging
 import time
 
+import numpy as np
+
 logger = logging.getLogger("OLED单例")
 
+# SSD1306 寻址命令 (水平寻址模式下, 数据按 "列范围 x 页范围" 依次写入)
+SET_COLUMN_ADDRESS = 0x21
+SET_PAGE_ADDRESS = 0x22
+COMMAND_OVERHEAD = 6        # 设置一个写入区域需要的命令字节数
+
 
 class OLED:
     """
@@ -83,6 +91,8 @@ class OLED:
         self.height = height
         self.i2c_address = i2c_address
         self.screen = None
+        self._last_pages = None     # 上一次发送到屏幕的页格式帧, None 表示屏幕内容未知
+        self.bytes_sent = 0         # 累计发送的显存数据字节数 (不含命令)
 
         self._import_dep()
 
@@ -109,6 +119,7 @@ class OLED:
 
     def clear_display(self):
         """清除显示"""
+        self._last_pages = None
         if not self.is_simulation and self.screen:
             with self.canvas(self.screen) as draw:
                 draw.rectangle((0, 0, self.width, self.height), outline=0, fill=0)
@@ -139,9 +150,72 @@ class OLED:
                     if self.screen:
                         with self.canvas(self.screen) as draw:
                             draw.bitmap((0, 0), image.convert("1"), fill="white")
+                        self._last_pages = None
+                        self.bytes_sent += self.width * self.height // 8
             except Exception:
                 logger.error("显示图像时发生错误", exc_info=True)
 
+    def display_pages(self, pages):
+        """
+        显示 SSD1306 页格式的帧缓冲
+
+        与上一次发送的帧逐页逐列比较, 只把有变化的列范围写入屏幕 (使用列/页寻址命令),
+        画面中只有一小块在动时 (眨眼, 加载动画), I2C 传输量只有整屏刷新的一小部分。
+
+        Args:
+            pages: (页数, 宽度) 的 uint8 数组, 每个字节是一列中竖直排列的 8 个像素
+        """
+        try:
+            if self.is_simulation:
+                from .framebuffer import unpack_pages
+                self.display_image(unpack_pages(pages, self.height))
+                return
+            if not self.screen:
+                return
+            last = self._last_pages
+            if last is None:
+                regions = [(0, pages.shape[0] - 1, 0, self.width - 1)]
+            else:
+                regions = self._dirty_regions(pages != last)
+            offset = getattr(self.screen, "_colstart", 0)
+            for first_page, last_page, start, end in regions:
+                self.screen.command(SET_COLUMN_ADDRESS, offset + start, offset + end,
+                                    SET_PAGE_ADDRESS, first_page, last_page)
+                data = pages[first_page:last_page + 1, start:end + 1]
+                self.screen.data(data.ravel().tolist())
+                self.bytes_sent += data.size
+            if last is None:
+                self._last_pages = pages.copy()
+            else:
+                np.copyto(last, pages)
+        except Exception:
+            self._last_pages = None     # 发送失败时屏幕内容未知, 下次整屏刷新
+            logger.error("显示图像时发生错误", exc_info=True)
+
+    @staticmethod
+    def _dirty_regions(changed):
+        """
+        根据 (页数, 宽度) 的变化标记, 返回需要写入的区域列表 [(起始页, 结束页, 起始列, 结束列), ...]
+
+        每个有变化的页单独写入它的变化列范围; 如果用一个覆盖所有变化页的矩形一次写入
+        传输的字节更少 (命令开销更小), 则合并为一个区域。
+        """
+        dirty_pages = np.flatnonzero(changed.any(axis=1))
+        if dirty_pages.size == 0:
+            return []
+        regions = []
+        for page in dirty_pages:
+            columns = np.flatnonzero(changed[page])
+            regions.append((int(page), int(page), int(columns[0]), int(columns[-1])))
+        per_page_cost = sum(COMMAND_OVERHEAD + end - start + 1 for _, _, start, end in regions)
+        first_page, last_page = regions[0][0], regions[-1][0]
+        start = min(region[2] for region in regions)
+        end = max(region[3] for region in regions)
+        merged_cost = COMMAND_OVERHEAD + (last_page - first_page + 1) * (end - start + 1)
+        if merged_cost <= per_page_cost:
+            return [(first_page, last_page, start, end)]
+        return regions
+
 
 if __name__ == "__main__":
     """
@@ -0,0 +1,161 @@
+"""
+OLED 帧时钟 (自适应帧率)
+
+所有往 OLED 上画东西的线程 (表情, 思考动画, 滚动文字) 和 OLED 合成线程共用同一个时间网格:
+第 n 帧的时刻是 epoch + n * interval。生产者在网格点上醒来生成一帧, 合成线程在网格点之后
+RENDER_LEAD 秒合成并发送, 同一帧里各图层的更新会一起显示, 不会错开一帧。
+
+帧率自适应: 合成线程每发送一帧报告一次耗时 (I2C 传输), 帧时钟再定期读取系统负载 (os.getloadavg);
+传输太慢或 CPU 太忙时按整数倍降低帧率 (50 -> 25 -> 16.7 -> 12.5 ...), 恢复后再逐级升回去。
+网格只是变稀疏, 相位不变, 生产者只生成真正会被显示的帧。
+
+使用方法:
+    clock = FrameClock.get_instance()               # 获取单例, 默认 50 fps
+    clock.set_fps(30)                               # 合成线程按自己的 fps 参数设置最高帧率
+    frame_time = clock.wait(stop_event)             # 生产者: 睡到下一帧, 返回该帧的时刻
+    frame_time = clock.wait(stop_event, fps=20)     # 本身不需要更高帧率的生产者可以限速
+    render_at = clock.render_time(now)              # 合成线程: 下一次合成的时刻
+    clock.report_display(seconds)                   # 合成线程: 报告一帧的发送耗时
+    clock.stats()
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+
+logger = logging.getLogger("OLED帧时钟")
+
+RENDER_LEAD = 0.004         # 合成时刻比生产者的网格点晚多少秒, 留给生产者生成并发布图像
+LOAD_CHECK_INTERVAL = 1.0   # 读取系统负载的间隔 (秒)
+HIGH_LOAD = 0.9             # 每个 CPU 核心的 1 分钟平均负载超过该值时降低帧率
+LOW_LOAD = 0.6              # 低于该值时才允许升高帧率
+HIGH_DISPLAY = 0.5          # 发送一帧的平均耗时超过帧间隔的该比例时降低帧率
+LOW_DISPLAY = 0.25          # 低于该比例时才允许升高帧率
+DISPLAY_SMOOTHING = 0.2     # 发送耗时的指数平均系数
+
+
+class FrameClock:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @staticmethod
+    def get_instance(fps=50, min_fps=10):
+        """获取帧时钟的单例实例; fps 和 min_fps 只在第一次创建时生效, 之后用 set_fps() 修改"""
+        if FrameClock._instance is None:
+            with FrameClock._instance_lock:
+                if FrameClock._instance is None:
+                    FrameClock._instance = FrameClock(fps, min_fps)
+        return FrameClock._instance
+
+    def __init__(self, fps=50, min_fps=10, clock=time.monotonic, loadavg=None):
+        """
+        param fps: 最高帧率, 网格的基本间隔为 1 / fps
+        param min_fps: 自适应降低帧率的下限
+        param clock: 时间源, 测试中可以替换
+        param loadavg: 返回 1 分钟平均负载的函数, 默认使用 os.getloadavg, 不支持的平台上不参考负载
+        """
+        self.min_fps = min_fps
+        self.set_fps(fps)
+        self.clock = clock
+        self.epoch = clock()
+        self.loadavg = loadavg if loadavg is not None else getattr(os, "getloadavg", None)
+        self.cpu_count = os.cpu_count() or 1
+        self.display_time = 0.0             # 发送一帧的平均耗时 (秒)
+        self.load = 0.0                     # 每个 CPU 核心的平均负载
+        self.frames = 0
+        self._next_load_check = self.epoch
+        self._hold_until = self.epoch       # 调整帧率后的冷却时间, 避免来回跳动
+        self._lock = threading.Lock()
+
+    def set_fps(self, fps, min_fps=None):
+        """重新设置最高帧率 (以及自适应降低帧率的下限), 之前的自适应降速被清除"""
+        if min_fps is not None:
+            self.min_fps = min_fps
+        self.base_interval = 1.0 / fps
+        self.max_divisor = max(1, int(fps / self.min_fps))
+        self.divisor = 1                    # 当前帧间隔是基本间隔的多少倍
+
+    @property
+    def interval(self):
+        """当前的帧间隔 (秒)"""
+        return self.base_interval * self.divisor
+
+    @property
+    def fps(self):
+        return 1.0 / self.interval
+
+    def next_tick(self, after=None, fps=None):
+        """
+        返回 after 之后的第一个网格点 (严格晚于 after)
+
+        param fps: 调用者需要的最高帧率, 网格会取当前帧率和它之中较低的一个
+        """
+        if after is None:
+            after = self.clock()
+        divisor = self.divisor
+        if fps:
+            divisor = max(divisor, math.ceil(round(1.0 / (fps * self.base_interval), 6)))
+        step = self.base_interval * divisor
+        n = math.floor((after - self.epoch) / step) + 1
+        return self.epoch + n * step
+
+    def wait(self, stop_event=None, fps=None):
+        """生产者调用: 睡到下一个网格点, 返回该网格点的时刻; stop_event 被设置时提前返回"""
+        tick = self.next_tick(fps=fps)
+        delay = tick - self.clock()
+        if delay > 0:
+            if stop_event is not None:
+                stop_event.wait(delay)
+            else:
+                time.sleep(delay)
+        return tick
+
+    def render_time(self, now=None, last_render=None):
+        """合成线程调用: 返回下一次合成的时刻 (网格点 + RENDER_LEAD), 距离上一次合成至少一个帧间隔"""
+        if now is None:
+            now = self.clock()
+        render_at = self.next_tick(now - RENDER_LEAD - 1e-9) + RENDER_LEAD
+        if last_render is not None:
+            while render_at < last_render + self.interval - 1e-6:
+                render_at += self.interval
+        return render_at
+
+    def report_display(self, seconds, now=None):
+        """合成线程调用: 报告发送一帧到屏幕的耗时, 并按需调整帧率"""
+        with self._lock:
+            self.frames += 1
+            self.display_time += (seconds - self.display_time) * DISPLAY_SMOOTHING
+            self._govern(self.clock() if now is None else now)
+
+    def _govern(self, now):
+        if self.loadavg is not None and now >= self._next_load_check:
+            self._next_load_check = now + LOAD_CHECK_INTERVAL
+            try:
+                self.load = self.loadavg()[0] / self.cpu_count
+            except OSError:
+                self.loadavg = None
+        if now < self._hold_until:
+            return
+        if self.divisor < self.max_divisor and (
+                self.display_time > self.interval * HIGH_DISPLAY or self.load > HIGH_LOAD):
+            self.divisor += 1
+        elif self.divisor > 1 and self.load < LOW_LOAD and (
+                # 按升高后的帧间隔估算, 升回去之后也不会马上又超过阈值
+                self.display_time < self.base_interval * (self.divisor - 1) * LOW_DISPLAY):
+            self.divisor -= 1
+        else:
+            return
+        self._hold_until = now + LOAD_CHECK_INTERVAL
+        logger.info(f"OLED 帧率调整为 {self.fps:.1f} fps (发送耗时 {self.display_time * 1000:.1f} ms, "
+                    f"负载 {self.load:.2f})")
+
+    def stats(self):
+        return {
+            "fps": round(self.fps, 2),
+            "divisor": self.divisor,
+            "display_ms": round(self.display_time * 1000, 2),
+            "load_per_cpu": round(self.load, 2),
+            "frames": self.frames,
+        }
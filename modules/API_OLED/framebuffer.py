@@ -0,0 +1,79 @@
+"""
+SSD1306 页格式帧缓冲
+
+SSD1306 的显存按 "页" 组织: 每页 8 行, 每个字节是一列中竖直排列的 8 个像素 (最低位在最上面)。
+128x64 的屏幕一共 8 页 x 128 列 = 1024 字节。
+把图层预先转换成同样的格式后, 合成一帧只需要对几个 (8, 128) 的 uint8 数组做按位运算,
+不再需要每帧创建 PIL 图像; 合成结果也可以直接按页发送给屏幕。
+
+图层图像可以是 PIL 图像, 也可以是 (高, 宽) 的布尔数组 (例如滚动文字从预先渲染的条带里切出的视图)。
+
+可用接口:
+    bits = pack_image(image, (x, y), width, height)      # PIL 图像或布尔数组 -> 整屏大小的页格式数组
+    w, h = image_size(image)                             # 图层图像的宽和高
+    mask = pack_rect((x, y, w, h), width, height)        # 矩形区域的页格式遮罩
+    image = unpack_pages(pages)                          # 页格式数组 -> PIL "1" 模式图像
+"""
+
+import numpy as np
+from PIL import Image
+
+
+def pages_shape(width, height):
+    """页格式数组的形状: (页数, 列数)"""
+    return (height + 7) // 8, width
+
+
+def pack_pixels(pixels):
+    """把 (height, width) 的布尔数组按页打包成 (pages, width) 的 uint8 数组"""
+    height, width = pixels.shape
+    pages = (height + 7) // 8
+    if height != pages * 8:
+        padded = np.zeros((pages * 8, width), dtype=bool)
+        padded[:height] = pixels
+        pixels = padded
+    return np.packbits(pixels.reshape(pages, 8, width), axis=1, bitorder="little")[:, 0, :]
+
+
+def _place(pixels, position, width, height):
+    """把图层像素放到整屏画布的 position 处, 超出屏幕的部分被裁掉"""
+    canvas = np.zeros((height, width), dtype=bool)
+    x, y = position
+    layer_height, layer_width = pixels.shape
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(width, x + layer_width), min(height, y + layer_height)
+    if left < right and top < bottom:
+        canvas[top:bottom, left:right] = pixels[top - y:bottom - y, left - x:right - x]
+    return canvas
+
+
+def image_size(image):
+    """图层图像的 (宽, 高), 支持 PIL 图像和 (高, 宽) 的布尔数组"""
+    if isinstance(image, np.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.size
+
+
+def pack_image(image, position, width, height):
+    """把 PIL 图像或 (高, 宽) 的布尔数组放到屏幕的 position 处, 返回整屏大小的页格式数组"""
+    if isinstance(image, np.ndarray):
+        pixels = image.astype(bool, copy=False)
+    else:
+        if image.mode != "1":
+            image = image.convert("1")
+        pixels = np.asarray(image, dtype=bool)
+    return pack_pixels(_place(pixels, position, width, height))
+
+
+def pack_rect(rect, width, height):
+    """返回矩形 (x, y, w, h) 覆盖区域为 1 的页格式遮罩, 用于不透明图层"""
+    x, y, w, h = rect
+    return pack_pixels(_place(np.ones((h, w), dtype=bool), (x, y), width, height))
+
+
+def unpack_pages(pages, height=None):
+    """把页格式数组还原为 PIL "1" 模式图像"""
+    page_count, width = pages.shape
+    pixels = np.unpackbits(pages[:, np.newaxis, :], axis=1, bitorder="little")
+    pixels = pixels.reshape(page_count * 8, width)[:height or page_count * 8]
+    return Image.fromarray(pixels.astype(bool))
@@ -0,0 +1,217 @@
+"""
+单色字形图集
+
+每种字体和字号一个图集: 字符第一次出现时用 FreeType 栅格化一次 (单色, 不抗锯齿), 裁掉空白后
+按列追加到一张布尔位图 (sheet) 里。之后排版文字只需要把 sheet 的切片复制到画布上, 不再调用 FreeType;
+常用的几百个汉字栅格化一次之后, 静态文字和滚动文字的渲染基本只剩数组拷贝。
+字形放在整数像素上, 与 PIL 按小数位置渲染的结果可能相差 1 个像素。
+
+排版规则与 PIL 的多行文本一致: 行距为 "A" 的底边 + 4 像素, 每行按各字符前进宽度之和对齐
+(不计字距调整, 与 TextRenderer.text_width 相同)。
+
+可选的磁盘缓存: 指定 cache_path 后, 构造时从 .npz 文件载入已经栅格化的字形, save() 时写回,
+重启后不需要重新栅格化。字体文件或 Pillow 版本变化后缓存自动作废。
+
+使用方法:
+    atlas = GlyphAtlas(ImageFont.truetype(path, 16), "localfiles/glyph_atlas/font-16.npz")
+    left, top, right, bottom = atlas.bbox(["第一行", "第二行"])
+    atlas.draw(canvas, ["第一行", "第二行"], origin=(x, y), align="center")   # canvas 为 (高, 宽) 的布尔数组
+    atlas.save()
+"""
+
+import collections
+import logging
+import math
+import os
+import threading
+
+import numpy as np
+import PIL
+from PIL import Image, ImageDraw
+
+logger = logging.getLogger("OLED字形图集")
+
+LINE_SPACING = 4            # 行间距, 与 PIL 多行文本的默认值相同
+INITIAL_COLUMNS = 1024      # sheet 的初始列数, 不够时按倍数扩大
+
+# column: 在 sheet 中的起始列; width, height: 墨迹大小; left, top: 墨迹相对笔位置的偏移;
+# shift: 字形在行首时整行的偏移 (PIL 画行首字形的位置与行中间不同, 左边距为负的 "j" 之类会让整行左移 1 像素);
+# right: 字形轮廓的右边界 (计算包围盒用, 可能比墨迹宽); advance: 前进宽度
+Glyph = collections.namedtuple("Glyph", "column width height left top shift right advance")
+
+
+def blit(canvas, pixels, position):
+    """把布尔数组 pixels 按位或到 canvas 的 position (x, y) 处, 超出画布的部分被裁掉"""
+    x, y = position
+    height, width = pixels.shape
+    canvas_height, canvas_width = canvas.shape
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(canvas_width, x + width), min(canvas_height, y + height)
+    if left < right and top < bottom:
+        canvas[top:bottom, left:right] |= pixels[top - y:bottom - y, left - x:right - x]
+
+
+class GlyphAtlas:
+    """
+    param font: PIL 的 FreeTypeFont
+    param cache_path: 磁盘缓存文件路径 (.npz), None 表示不使用磁盘缓存
+    """
+
+    def __init__(self, font, cache_path=None):
+        self.font = font
+        self.cache_path = cache_path
+        self.line_spacing = font.getbbox("A", "1")[3] + LINE_SPACING
+        self.space_advance = font.getlength(" ", "1")
+        self.sheet = np.zeros((1, INITIAL_COLUMNS), dtype=bool)
+        self.used = 0           # sheet 中已经使用的列数
+        self.glyphs = {}        # 字符 -> Glyph
+        self.dirty = False      # 有没有磁盘缓存里还没有的字形
+        self._lock = threading.Lock()
+        if cache_path and os.path.exists(cache_path):
+            self._load()
+
+    def glyph(self, char):
+        """返回字符的字形记录, 第一次使用时栅格化"""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            with self._lock:
+                glyph = self.glyphs.get(char) or self._rasterize(char)
+        return glyph
+
+    def _ink(self, text):
+        """用 PIL 画出 text, 返回 (裁掉空白后的布尔数组, 墨迹相对原点的 left, top), 没有墨迹时返回 None"""
+        left, top, right, bottom = self.font.getbbox(text, "1")
+        if right <= left or bottom <= top:
+            return None
+        image = Image.new("1", (right - left, bottom - top), 0)
+        ImageDraw.Draw(image).text((-left, -top), text, font=self.font, fill=1)
+        pixels = np.asarray(image, dtype=bool)
+        rows = np.flatnonzero(pixels.any(axis=1))
+        if not rows.size:
+            return None
+        columns = np.flatnonzero(pixels.any(axis=0))
+        pixels = pixels[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+        return pixels, left + int(columns[0]), top + int(rows[0])
+
+    def _rasterize(self, char):
+        advance = self.font.getlength(char, "1")
+        right = self.font.getbbox(char, "1")[2]
+        # 字符画在一个空格后面, 得到它在一行文字中间时的位置; 单独画时的位置与它的差记在 shift 里
+        ink = self._ink(" " + char)
+        if ink is None:
+            return self._append(char, np.zeros((0, 0), dtype=bool), 0, 0, 0, right, advance)
+        pixels, left, top = ink
+        left -= round(self.space_advance)
+        shift = self._ink(char)[1] - left
+        return self._append(char, pixels, left, top, shift, right, advance)
+
+    def _append(self, char, pixels, left, top, shift, right, advance):
+        height, width = pixels.shape
+        rows, columns = self.sheet.shape
+        if self.used + width > columns or height > rows:
+            sheet = np.zeros((max(rows, height), max(columns * 2, self.used + width)), dtype=bool)
+            sheet[:rows, :self.used] = self.sheet[:, :self.used]
+            self.sheet = sheet
+        self.sheet[:height, self.used:self.used + width] = pixels
+        glyph = Glyph(self.used, width, height, left, top, shift, right, advance)
+        self.used += width
+        self.glyphs[char] = glyph
+        self.dirty = True
+        return glyph
+
+    def layout(self, lines, align="left", origin=(0, 0)):
+        """
+        排版多行文字, 返回 ([(x, y, 字形), ...], 包围盒 (left, top, right, bottom))
+        与 ImageDraw.textbbox 一样, 包围盒竖直方向按墨迹计算, 水平方向还包括每行的原点和字形轮廓
+
+        origin 是第一行原点 (左上角, PIL 的 "la" 锚点) 的位置, 可以是小数;
+        取整方式与 PIL 画文字时相同: x 方向 .5 进位, y 方向 .5 舍去。
+        没有墨迹时包围盒为 (0, 0, 0, 0)
+        """
+        rows = [[self.glyph(char) for char in line] for line in lines]
+        widths = [sum(glyph.advance for glyph in row) for row in rows]
+        max_width = max(widths, default=0)
+        placements = []
+        left = top = float("inf")
+        right = bottom = float("-inf")
+        for index, (row, width) in enumerate(zip(rows, widths)):
+            line_x = origin[0]
+            if align == "center":
+                line_x += (max_width - width) / 2
+            elif align == "right":
+                line_x += max_width - width
+            line_x = math.floor(line_x + 0.5)
+            line_y = math.ceil(origin[1] + index * self.line_spacing - 0.5)
+            shift = row[0].shift if row else 0
+            pen = 0
+            for glyph in row:
+                x = line_x + math.floor(pen + 0.5)
+                right = max(right, x + glyph.right)
+                if glyph.width:
+                    x, y = x + glyph.left + shift, line_y + glyph.top
+                    placements.append((x, y, glyph))
+                    left, top = min(left, x), min(top, y)
+                    right, bottom = max(right, x + glyph.width), max(bottom, y + glyph.height)
+                pen += glyph.advance
+            left, right = min(left, line_x), max(right, line_x + math.floor(pen + 0.5))
+        if not placements:
+            return placements, (0, 0, 0, 0)
+        return placements, (left, top, right, bottom)
+
+    def bbox(self, lines, align="left"):
+        """原点在 (0, 0) 时多行文字的包围盒, 与 ImageDraw.textbbox 的含义相同"""
+        return self.layout(lines, align)[1]
+
+    def draw(self, canvas, lines, origin=(0, 0), align="left"):
+        """把多行文字按位或到布尔数组 canvas 上, origin 为第一行原点的位置, 超出画布的部分被裁掉"""
+        placements, _ = self.layout(lines, align, origin)
+        sheet = self.sheet
+        for x, y, glyph in placements:
+            blit(canvas, sheet[:glyph.height, glyph.column:glyph.column + glyph.width], (x, y))
+
+    def _key(self):
+        """磁盘缓存的有效性标识: 字体文件, 修改时间, 字号, Pillow 版本"""
+        path = str(getattr(self.font, "path", ""))
+        mtime = os.path.getmtime(path) if os.path.isfile(path) else 0
+        return np.array([path, repr(mtime), str(self.font.size), PIL.__version__])
+
+    def save(self):
+        """把图集写入磁盘缓存, 没有新字形时什么都不做; 返回是否写入"""
+        if not self.cache_path or not self.dirty:
+            return False
+        with self._lock:
+            chars = list(self.glyphs)
+            records = np.array([self.glyphs[char][:7] for char in chars], dtype=np.int32).reshape(-1, 7)
+            advances = np.array([self.glyphs[char].advance for char in chars], dtype=np.float64)
+            used = self.used
+            sheet = np.packbits(self.sheet[:, :used], axis=1)
+            self.dirty = False
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        temporary = self.cache_path + ".tmp"
+        with open(temporary, "wb") as f:
+            np.savez_compressed(f, key=self._key(), chars=np.array(chars, dtype="U1"), records=records,
+                                advances=advances, sheet=sheet, used=np.array(used))
+        os.replace(temporary, self.cache_path)
+        logger.info(f"已保存 {len(chars)} 个字形到 {self.cache_path}")
+        return True
+
+    def _load(self):
+        try:
+            with np.load(self.cache_path) as data:
+                if data["key"].tolist() != self._key().tolist():
+                    logger.info(f"字体已变化, 忽略字形缓存 {self.cache_path}")
+                    return
+                used = int(data["used"])
+                sheet = np.unpackbits(data["sheet"], axis=1, count=used).astype(bool)
+                glyphs = {
+                    str(char): Glyph(*map(int, record), float(advance))
+                    for char, record, advance in zip(data["chars"], data["records"], data["advances"])
+                }
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"读取字形缓存 {self.cache_path} 失败: {e}")
+            return
+        self.sheet = np.zeros((max(1, sheet.shape[0]), max(INITIAL_COLUMNS, used)), dtype=bool)
+        self.sheet[:sheet.shape[0], :used] = sheet
+        self.used = used
+        self.glyphs = glyphs
+        logger.info(f"从 {self.cache_path} 载入 {len(glyphs)} 个字形")
@@ -0,0 +1,103 @@
+"""
+有上限的 LRU 缓存
+
+OLED 相关的渲染代码 (眼睛图形, 字体, 字形) 都需要 "算一次, 之后直接复用" 的缓存,
+树莓派内存有限, 缓存必须有上限: 超过条目数或字节数时淘汰最久没用过的条目。
+
+使用方法:
+    cache = LRUCache(maxsize=256, maxbytes=512 * 1024, sizeof=lambda image: len(image.tobytes()))
+    sprite = cache.get(key)
+    if sprite is None:
+        sprite = cache.put(key, render(key))
+    # 或者
+    sprite = cache.get_or_create(key, render)
+    cache.stats()       # {"size": ..., "bytes": ..., "hits": ..., "misses": ..., "evictions": ...}
+"""
+
+import collections
+import threading
+
+
+class LRUCache:
+    """
+    线程安全的 LRU 缓存
+
+    param maxsize: 最多缓存的条目数
+    param maxbytes: 最多占用的字节数, None 表示只按条目数限制
+    param sizeof: 计算单个值字节数的函数, 设置了 maxbytes 时必须提供
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None):
+        if maxsize < 1:
+            raise ValueError("maxsize 必须大于 0")
+        if maxbytes is not None and sizeof is None:
+            raise ValueError("设置 maxbytes 时必须提供 sizeof")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._items = collections.OrderedDict()     # key -> (value, 字节数)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """查找并把条目标记为最近使用, 同时更新命中/未命中计数"""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """加入缓存并返回 value; 超出上限时淘汰最久没用过的条目"""
+        nbytes = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(self._items) > self.maxsize or (
+                    self.maxbytes is not None and self._bytes > self.maxbytes and len(self._items) > 1):
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_create(self, key, factory):
+        """缓存中没有时调用 factory(key) 生成并缓存"""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, factory(key))
+        return value
+
+    def values(self):
+        """返回所有缓存值的列表 (拷贝), 不影响使用顺序和命中计数"""
+        with self._lock:
+            return [value for value, _ in self._items.values()]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """返回缓存的使用情况"""
+        return {
+            "size": len(self._items),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
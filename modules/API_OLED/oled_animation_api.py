@@ -1,24 +1,26 @@
 """
 OLED 动画 API
 这是一个用于生成各种小动画帧的图形库。
-它本身是无状态的，只根据传入的参数生成图像。
+每种动画的所有帧只生成一次, 以单色精灵图 (SpriteSheet) 的形式缓存, 之后按帧序号直接取出。
+除了代码绘制的动画, 也可以用 load_animation 从 GIF 或网格 PNG 精灵图载入动画。
 """
 
 import math
+import threading
 
-from PIL import Image, ImageDraw
+from .sprite_sheet import SpriteSheet
 
 
 class OledAnimationAPI:
     def __init__(self, width=128, height=64):
         self.width = width
         self.height = height
+        self._sheets = {}               # 动画名 (或代码动画的参数) -> SpriteSheet
+        self._lock = threading.Lock()
 
-    def get_thinking_spinner_frame(
-        self, frame_index: int, num_segments=8, line_length=10
-    ) -> Image:
+    def get_thinking_spinner_frame(self, frame_index: int, num_segments=8, line_length=10):
         """
-        生成“思考中”旋转加载动画的单帧图像。
+        获取“思考中”旋转加载动画的单帧图像。
 
         Args:
             frame_index (int): 当前动画的帧序号。
@@ -26,33 +28,43 @@ class OledAnimationAPI:
             line_length (int): 加载线条的长度。
 
         Returns:
-            Image: 一个包含单帧动画的Pillow图像对象。
+            numpy.ndarray: (高, 宽) 的只读布尔数组, 可直接作为图层图像 (UPDATE_LAYER 的 image)。
+                注意: 以前返回 "1" 模式的 PIL 图像; 需要 PIL 图像的调用者可以用
+                Image.fromarray(frame) 转换。
         """
-        # 创建一个全黑的透明背景图像
-        image = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
+        key = ("thinking_spinner", num_segments, line_length)
+        with self._lock:
+            sheet = self._sheets.get(key)
+            if sheet is None:
+                sheet = self._sheets[key] = self._build_spinner(num_segments, line_length)
+        return sheet.frame(frame_index)
 
-        # 计算动画的中心点 (Y坐标上移12像素)
+    def _build_spinner(self, num_segments, line_length):
+        # 动画的中心点
         center_x, center_y = self.width // 2, self.height // 2
 
-        # 根据帧序号计算当前应该在哪一段
-        segment = frame_index % num_segments
+        def draw_segment(draw, segment):
+            # 当前段的角度, 转换为弧度后计算线条的终点坐标
+            rad = math.radians((360 / num_segments) * segment)
+            end_x = center_x + int(line_length * math.cos(rad))
+            end_y = center_y + int(line_length * math.sin(rad))
+            # 绘制线条，宽度为2
+            draw.line([(center_x, center_y), (end_x, end_y)], fill=1, width=2)
 
-        # 计算当前段的角度
-        angle = (360 / num_segments) * segment
+        return SpriteSheet.from_function(num_segments, (self.width, self.height), draw_segment)
 
-        # 将角度转换为弧度
-        rad = math.radians(angle)
-
-        # 计算线条的终点坐标
-        end_x = center_x + int(line_length * math.cos(rad))
-        end_y = center_y + int(line_length * math.sin(rad))
+    def load_animation(self, name, path, frame_size=None, count=None):
+        """
+        从 GIF 动图或网格 PNG 精灵图载入动画, 参数见 SpriteSheet.load
 
-        # 绘制线条，白色，宽度为2
-        draw.line([(center_x, center_y), (end_x, end_y)], fill="white", width=2)
+        Returns:
+            int: 动画的帧数
+        """
+        sheet = SpriteSheet.load(path, frame_size, count)
+        with self._lock:
+            self._sheets[name] = sheet
+        return len(sheet)
 
-        # 为了在单色OLED上显示，需要转换图像模式
-        # "1" 模式表示1位像素，黑白
-        # 我们使用 "L" (luminance) 作为中间步骤，然后通过 point 转换为 "1"
-        # 阈值128，意味着任何非纯黑的颜色都会变成白色
-        return image.convert("L").point(lambda x: 255 if x > 128 else 0, mode="1")
+    def get_frame(self, name, frame_index: int):
+        """获取已载入动画 name 的第 frame_index 帧 (循环), 返回只读布尔数组"""
+        return self._sheets[name].frame(frame_index)
@@ -27,6 +27,9 @@ import time
 
 from PIL import Image, ImageDraw
 
+from .lru_cache import LRUCache
+from .tween import Tween, ease_out_cubic
+
 # Usage of monochrome display colors
 BGCOLOR = 0  # background and overlays
 MAINCOLOR = 1  # drawings
@@ -52,9 +55,95 @@ W = 7  # west, middle left
 NW = 8  # north-west, top left
 # for middle center set "DEFAULT"
 
+# Tween durations in seconds, independent of the frame rate
+TWEEN_DURATIONS = {
+    "eyeL_height": 0.1, "eyeR_height": 0.1,                 # blinking and opening
+    "eyeL_width": 0.12, "eyeR_width": 0.12, "spaceBetween": 0.12,
+    "eyeL_x": 0.15, "eyeL_y": 0.15,                         # looking around
+    "eyeL_border_radius": 0.12, "eyeR_border_radius": 0.12,
+    "eyelids_tired_height": 0.12, "eyelids_angry_height": 0.12,
+    "eyelids_happy_bottom_offset": 0.12,
+}
+FLICKER_INTERVAL = 0.02  # seconds per flicker half-period (one frame at 50 fps)
+# Frames paced by an external frame clock wake up with some jitter; accept a frame that
+# comes this much earlier than frame_interval instead of dropping it
+FRAME_JITTER = 0.002
+
+# Eye sprite cache bound: a 128x64 "1" mode sprite is at most ~1 KB of pixels
+SPRITE_CACHE_SIZE = 256
+SPRITE_CACHE_BYTES = 256 * 1024
+
+
+def render_eye_sprite(side, width, height, radius, tired_height, angry_height,
+                      happy_offset, height_default):
+    # Rasterize one eye into (dx, dy, fill, erase): "fill" is the rounded eye shape, "erase"
+    # covers the eyelids (None if there are none), both placed at (x + dx, y + dy).
+    # side is "L" / "R" for the two eyes or "C" for the cyclops eye. The drawing calls are the
+    # ones draw_eyes used to issue on the full frame, shifted so that eyelids reaching outside
+    # the eye box are kept; erasing after all eyes are filled keeps the original result when
+    # the eyes overlap during transitions.
+    top_edge, bottom_edge = -1, max(height, tired_height - 1, angry_height - 1)
+    if happy_offset > 0:
+        top_edge = min(top_edge, height - happy_offset + 1)
+        bottom_edge = max(bottom_edge, height + height_default)
+    dx, dy = -1, top_edge
+    size = (width + 3, bottom_edge - top_edge + 1)
+
+    fill = Image.new("1", size, BGCOLOR)
+    ImageDraw.Draw(fill).rounded_rectangle(
+        (-dx, -dy, width - dx, height - dy), radius=radius, fill=MAINCOLOR
+    )
+    if tired_height <= 0 and angry_height <= 0 and happy_offset <= 0:
+        return dx, dy, fill, None
+
+    erase = Image.new("1", size, BGCOLOR)
+    draw = ImageDraw.Draw(erase)
+    left, top, right, half = -dx, -dy, width - dx, width // 2 - dx
+
+    # Tired top eyelids
+    if tired_height > 0:
+        lid = top + tired_height - 1
+        if side == "L":
+            draw.polygon([(left, top - 1), (right, top - 1), (left, lid)], fill=MAINCOLOR)
+        elif side == "R":
+            draw.polygon([(left, top - 1), (right, top - 1), (right, lid)], fill=MAINCOLOR)
+        else:  # Cyclops: left half and right half
+            draw.polygon([(left, top - 1), (half, top - 1), (left, lid)], fill=MAINCOLOR)
+            draw.polygon([(half, top - 1), (right, top - 1), (right, lid)], fill=MAINCOLOR)
+
+    # Angry top eyelids
+    if angry_height > 0:
+        lid = top + angry_height - 1
+        if side == "L":
+            draw.polygon([(left, top - 1), (right, top - 1), (right, lid)], fill=MAINCOLOR)
+        elif side == "R":
+            draw.polygon([(left, top - 1), (right, top - 1), (left, lid)], fill=MAINCOLOR)
+        else:  # Cyclops: left half and right half
+            draw.polygon([(left, top - 1), (half, top - 1), (half, lid)], fill=MAINCOLOR)
+            draw.polygon([(half, top - 1), (right, top - 1), (half, lid)], fill=MAINCOLOR)
+
+    # Happy bottom eyelids, ends well below the eye
+    if happy_offset > 0:
+        draw.rounded_rectangle(
+            (left - 1, top + height - happy_offset + 1, right + 1, top + height + height_default),
+            radius=radius,
+            fill=MAINCOLOR,
+        )
+    return dx, dy, fill, erase
+
+
+def _sprite_bytes(sprite):
+    return sum((mask.width + 7) // 8 * mask.height for mask in sprite[2:] if mask is not None)
+
 
 class RoboEyes:
-    def __init__(self, screen_width=128, screen_height=64, frame_rate=50):
+    def __init__(self, screen_width=128, screen_height=64, frame_rate=50,
+                 clock=time.monotonic, rng=random):
+        # Time source and random generator, injectable for reproducible playback and benchmarks.
+        # clock() returns seconds as a float; rng provides randrange() and randint()
+        self.clock = clock
+        self.rng = rng
+
         # For general setup - screen size and max. frame rate
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -194,6 +283,37 @@ class RoboEyes:
         self.laugh_animation_duration = 0.5  # seconds
         self.laugh_toggle = True
 
+        # One tween per animated parameter, starting from the initial geometry
+        self.tweens = {
+            "eyeL_height": self.eyeL_height_current,
+            "eyeR_height": self.eyeR_height_current,
+            "eyeL_width": self.eyeL_width_current,
+            "eyeR_width": self.eyeR_width_current,
+            "spaceBetween": self.spaceBetween_current,
+            "eyeL_x": self.eyeL_x,
+            "eyeL_y": self.eyeL_y_next,
+            "eyeL_border_radius": self.eyeL_border_radius_current,
+            "eyeR_border_radius": self.eyeR_border_radius_current,
+            "eyelids_tired_height": self.eyelids_tired_height,
+            "eyelids_angry_height": self.eyelids_angry_height,
+            "eyelids_happy_bottom_offset": self.eyelids_happy_bottom_offset,
+        }
+        self.tweens = {
+            name: Tween(value, TWEEN_DURATIONS[name], ease_out_cubic)
+            for name, value in self.tweens.items()
+        }
+        # Inputs of the last frame after which nothing moves anymore, None while animating
+        self.settled_inputs = None
+
+        # Geometry of the last drawn frame, used to skip redrawing identical frames
+        self.last_geometry = None
+        self.changed = False  # whether the last update() produced a new frame
+        # Pre-rendered eye shapes, keyed by the integer geometry of one eye
+        self.sprites = LRUCache(
+            SPRITE_CACHE_SIZE, SPRITE_CACHE_BYTES,
+            sizeof=_sprite_bytes,
+        )
+
         self.begin(screen_width, screen_height, frame_rate)
 
     # *********************************************************************************************
@@ -206,19 +326,59 @@ class RoboEyes:
             [(0, 0), (self.screen_width, self.screen_height)], fill=BGCOLOR
         )  # clear image
         # self.image.save("debug_begin.png") # for debugging image state
+        self.last_geometry = None  # force the next frame to be drawn
         self.eyeL_height_current = 1  # start with closed eyes
         self.eyeR_height_current = 1  # start with closed eyes
+        self.tweens["eyeL_height"].jump(1)
+        self.tweens["eyeR_height"].jump(1)
+        self.settled_inputs = None
         self.set_framerate(frame_rate)
 
     def update(self):
         # Limit drawing updates to defined max framerate
-        current_time = time.monotonic()
-        if current_time - self.fps_timer >= self.frame_interval:
-            self.draw_eyes()
+        # Returns the image only if the eyes look different from the last returned frame
+        current_time = self.clock()
+        if current_time - self.fps_timer >= self.frame_interval - FRAME_JITTER:
             self.fps_timer = current_time
-            return self.image  # Return the image for external use
+            if self.is_settled(current_time):
+                # All tweens have arrived and no input changed: skip the frame entirely
+                self.changed = False
+                return None
+            self.changed = self.draw_eyes()
+            if self.changed:
+                return self.image  # Return the image for external use
         return None
 
+    def is_settled(self, current_time):
+        # True while the eyes are guaranteed to stay still: every tween settled, no setter
+        # called since, and no blink or idle movement due yet
+        if self.settled_inputs is None or self.settled_inputs != self._inputs():
+            return False
+        if self.autoblinker and current_time >= self.blinktimer:
+            return False
+        if self.idle and current_time >= self.idle_animation_timer:
+            return False
+        return True
+
+    def _inputs(self):
+        # Everything a setter or macro animation can change
+        return (
+            self.eyeL_width_next, self.eyeR_width_next,
+            self.eyeL_height_next, self.eyeR_height_next,
+            self.eyeL_border_radius_next, self.eyeR_border_radius_next,
+            self.spaceBetween_next, self.eyeL_x_next, self.eyeL_y_next,
+            self.eyeL_height_default, self.eyeR_height_default,
+            self.tired, self.angry, self.happy, self.curious, self.cyclops,
+            self.eyeL_open, self.eyeR_open, self.h_flicker, self.v_flicker,
+            self.laugh, self.confused, self.autoblinker, self.idle,
+        )
+
+    def _animate(self, name, target, current_time):
+        # Move one tween towards target and return its current integer value
+        tween = self.tweens[name]
+        tween.retarget(target, current_time)
+        return int(round(tween.update(current_time)))
+
     # *********************************************************************************************
     #  SETTERS METHODS
     # *********************************************************************************************
@@ -371,18 +531,19 @@ class RoboEyes:
     # *********************************************************************************************
     def anim_confused(self):
         self.confused = True
-        self.confused_animation_timer = time.monotonic()  # Reset timer
+        self.confused_animation_timer = self.clock()  # Reset timer
 
     def anim_laugh(self):
         self.laugh = True
-        self.laugh_animation_timer = time.monotonic()  # Reset timer
+        self.laugh_animation_timer = self.clock()  # Reset timer
 
     # *********************************************************************************************
     #  PRE-CALCULATIONS AND ACTUAL DRAWINGS
     # *********************************************************************************************
     def draw_eyes(self):  # Renamed from drawEyes
+        # Returns True if the frame was redrawn, False if its geometry is unchanged
         # PRE-CALCULATIONS - EYE SIZES AND VALUES FOR ANIMATION TWEENINGS
-        current_time = time.monotonic()
+        current_time = self.clock()
 
         if self.curious:
             if self.eyeL_x_next <= 10:
@@ -405,18 +566,15 @@ class RoboEyes:
             self.eyeL_height_offset = 0
             self.eyeR_height_offset = 0
 
-        # Left eye height
-        self.eyeL_height_current = (
-            self.eyeL_height_current + self.eyeL_height_next + self.eyeL_height_offset
-        ) // 2
-        self.eyeL_y += (self.eyeL_height_default - self.eyeL_height_current) // 2
-        self.eyeL_y -= self.eyeL_height_offset // 2
-        # Right eye height
-        self.eyeR_height_current = (
-            self.eyeR_height_current + self.eyeR_height_next + self.eyeR_height_offset
-        ) // 2
-        self.eyeR_y += (self.eyeR_height_default - self.eyeR_height_current) // 2
-        self.eyeR_y -= self.eyeR_height_offset // 2
+        # Time-based tweens: every parameter moves towards its "next" value over a fixed
+        # duration, so motion speed does not depend on how often draw_eyes is called
+        # Eye heights (plus the curious offset)
+        self.eyeL_height_current = self._animate(
+            "eyeL_height", self.eyeL_height_next + self.eyeL_height_offset, current_time
+        )
+        self.eyeR_height_current = self._animate(
+            "eyeR_height", self.eyeR_height_next + self.eyeR_height_offset, current_time
+        )
 
         if self.eyeL_open:
             if self.eyeL_height_current <= 1 + self.eyeL_height_offset:
@@ -425,38 +583,53 @@ class RoboEyes:
             if self.eyeR_height_current <= 1 + self.eyeR_height_offset:
                 self.eyeR_height_next = self.eyeR_height_default
 
-        self.eyeL_width_current = (self.eyeL_width_current + self.eyeL_width_next) // 2
-        self.eyeR_width_current = (self.eyeR_width_current + self.eyeR_width_next) // 2
-        self.spaceBetween_current = (
-            self.spaceBetween_current + self.spaceBetween_next
-        ) // 2
+        self.eyeL_width_current = self._animate("eyeL_width", self.eyeL_width_next, current_time)
+        self.eyeR_width_current = self._animate("eyeR_width", self.eyeR_width_next, current_time)
+        self.spaceBetween_current = self._animate(
+            "spaceBetween", self.spaceBetween_next, current_time
+        )
 
-        self.eyeL_x = (self.eyeL_x + self.eyeL_x_next) // 2
-        self.eyeL_y = (self.eyeL_y + self.eyeL_y_next) // 2
+        # Positions: eyes stay vertically centered on their target row while the height changes,
+        # the right eye follows the left eye
+        self.eyeL_x = self._animate("eyeL_x", self.eyeL_x_next, current_time)
+        eye_y = self._animate("eyeL_y", self.eyeL_y_next, current_time)
+        self.eyeL_y = (
+            eye_y
+            + (self.eyeL_height_default - self.eyeL_height_current) // 2
+            - self.eyeL_height_offset // 2
+        )
 
         self.eyeR_x_next = (
             self.eyeL_x_next + self.eyeL_width_current + self.spaceBetween_current
         )
         self.eyeR_y_next = self.eyeL_y_next
-        self.eyeR_x = (self.eyeR_x + self.eyeR_x_next) // 2
-        self.eyeR_y = (self.eyeR_y + self.eyeR_y_next) // 2
+        self.eyeR_x = self.eyeL_x + self.eyeL_width_current + self.spaceBetween_current
+        self.eyeR_y = (
+            eye_y
+            + (self.eyeR_height_default - self.eyeR_height_current) // 2
+            - self.eyeR_height_offset // 2
+        )
 
-        self.eyeL_border_radius_current = (
-            self.eyeL_border_radius_current + self.eyeL_border_radius_next
-        ) // 2
-        self.eyeR_border_radius_current = (
-            self.eyeR_border_radius_current + self.eyeR_border_radius_next
-        ) // 2
+        self.eyeL_border_radius_current = self._animate(
+            "eyeL_border_radius", self.eyeL_border_radius_next, current_time
+        )
+        self.eyeR_border_radius_current = self._animate(
+            "eyeR_border_radius", self.eyeR_border_radius_next, current_time
+        )
 
         # APPLYING MACRO ANIMATIONS
+        # A blink or idle glance sets new targets after the tweens above have run; the frame
+        # that triggers it must not count as settled or the new motion would be skipped
+        retargeted = False
         if self.autoblinker:
             if current_time >= self.blinktimer:
                 self.blink()
+                retargeted = True
                 self.blinktimer = (
                     current_time
                     + (self.blink_interval)
                     + (
-                        random.randrange(self.blink_interval_variation)
+                        self.rng.randrange(self.blink_interval_variation)
                         if self.blink_interval_variation > 0
                         else 0
                     )
@@ -490,21 +663,22 @@ class RoboEyes:
 
         if self.idle:
             if current_time >= self.idle_animation_timer:
+                retargeted = True
                 constraint_x = self.get_screen_constraint_X()
                 constraint_y = self.get_screen_constraint_Y()
                 if constraint_x > 0:
-                    self.eyeL_x_next = random.randint(
+                    self.eyeL_x_next = self.rng.randint(
                         0, int(constraint_x)
                     )  # Convert to int
                 if constraint_y > 0:
-                    self.eyeL_y_next = random.randint(
+                    self.eyeL_y_next = self.rng.randint(
                         0, int(constraint_y)
                     )  # Convert to int
                 self.idle_animation_timer = (
                     current_time
                     + (self.idle_interval)
                     + (
-                        random.randrange(self.idle_interval_variation)
+                        self.rng.randrange(self.idle_interval_variation)
                         if self.idle_interval_variation > 0
                         else 0
                     )
@@ -515,23 +689,25 @@ class RoboEyes:
         eyeL_y_draw = self.eyeL_y
         eyeR_y_draw = self.eyeR_y
 
+        # Flicker alternates on a fixed time grid instead of on every drawn frame
+        flicker_phase = int(current_time / FLICKER_INTERVAL) % 2 == 0
         if self.h_flicker:
+            self.h_flicker_alternate = flicker_phase
             if self.h_flicker_alternate:
                 eyeL_x_draw += self.h_flicker_amplitude
                 eyeR_x_draw += self.h_flicker_amplitude
             else:
                 eyeL_x_draw -= self.h_flicker_amplitude
                 eyeR_x_draw -= self.h_flicker_amplitude
-            self.h_flicker_alternate = not self.h_flicker_alternate
 
         if self.v_flicker:
+            self.v_flicker_alternate = flicker_phase
             if self.v_flicker_alternate:
                 eyeL_y_draw += self.v_flicker_amplitude
                 eyeR_y_draw += self.v_flicker_amplitude
             else:
                 eyeL_y_draw -= self.v_flicker_amplitude
                 eyeR_y_draw -= self.v_flicker_amplitude
-            self.v_flicker_alternate = not self.v_flicker_alternate
 
         # Correctly implement cyclops mode by modifying instance attributes
         # This follows the C++ logic where attributes are changed before drawing
@@ -540,48 +716,8 @@ class RoboEyes:
             self.eyeR_width_current = 0
             self.eyeR_height_current = 0
             self.spaceBetween_current = 0  # Match C++ behavior
-
-        # ACTUAL DRAWINGS
-        self.draw.rectangle(
-            [(0, 0), (self.screen_width, self.screen_height)], fill=BGCOLOR
-        )  # Clear screen
-
-        # Ensure all coordinates and dimensions are integers before drawing
-        eyeL_x_draw_int = int(eyeL_x_draw)
-        eyeL_y_draw_int = int(eyeL_y_draw)
-        eyeL_width_current_int = int(self.eyeL_width_current)
-        eyeL_height_current_int = int(self.eyeL_height_current)
-        eyeL_border_radius_current_int = int(self.eyeL_border_radius_current)
-
-        eyeR_x_draw_int = int(eyeR_x_draw)
-        eyeR_y_draw_int = int(eyeR_y_draw)
-        eyeR_width_current_int = int(self.eyeR_width_current)
-        eyeR_height_current_int = int(self.eyeR_height_current)
-        eyeR_border_radius_current_int = int(self.eyeR_border_radius_current)
-
-        # Draw basic eye rectangles
-        # Pillow's rounded_rectangle takes (x0, y0, x1, y1)
-        self.draw.rounded_rectangle(
-            (
-                eyeL_x_draw_int,
-                eyeL_y_draw_int,
-                eyeL_x_draw_int + eyeL_width_current_int,
-                eyeL_y_draw_int + eyeL_height_current_int,
-            ),
-            radius=eyeL_border_radius_current_int,
-            fill=MAINCOLOR,
-        )
-        if not self.cyclops:
-            self.draw.rounded_rectangle(
-                (
-                    eyeR_x_draw_int,
-                    eyeR_y_draw_int,
-                    eyeR_x_draw_int + eyeR_width_current_int,
-                    eyeR_y_draw_int + eyeR_height_current_int,
-                ),
-                radius=eyeR_border_radius_current_int,
-                fill=MAINCOLOR,
-            )
+            for name in ("eyeR_width", "eyeR_height", "spaceBetween"):
+                self.tweens[name].jump(0)
 
         # Prepare mood type transitions
         if self.tired:
@@ -601,166 +737,91 @@ class RoboEyes:
         else:
             self.eyelids_happy_bottom_offset_next = 0
 
-        # Draw tired top eyelids
-        self.eyelids_tired_height = (
-            self.eyelids_tired_height + self.eyelids_tired_height_next
-        ) // 2
-        if self.eyelids_tired_height > 0:  # Only draw if there's something to draw
-            if not self.cyclops:
-                # Left eye
-                self.draw.polygon(
-                    [
-                        (eyeL_x_draw_int, eyeL_y_draw_int - 1),
-                        (eyeL_x_draw_int + eyeL_width_current_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int,
-                            eyeL_y_draw_int + int(self.eyelids_tired_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-                # Right eye
-                self.draw.polygon(
-                    [
-                        (eyeR_x_draw_int, eyeR_y_draw_int - 1),
-                        (eyeR_x_draw_int + eyeR_width_current_int, eyeR_y_draw_int - 1),
-                        (
-                            eyeR_x_draw_int + eyeR_width_current_int,
-                            eyeR_y_draw_int + int(self.eyelids_tired_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-            else:  # Cyclops
-                # Left half
-                self.draw.polygon(
-                    [
-                        (eyeL_x_draw_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int - 1,
-                        ),
-                        (
-                            eyeL_x_draw_int,
-                            eyeL_y_draw_int + int(self.eyelids_tired_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-                # Right half
-                self.draw.polygon(
-                    [
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int - 1,
-                        ),
-                        (eyeL_x_draw_int + eyeL_width_current_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int + eyeL_width_current_int,
-                            eyeL_y_draw_int + int(self.eyelids_tired_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
+        self.eyelids_tired_height = self._animate(
+            "eyelids_tired_height", self.eyelids_tired_height_next, current_time
+        )
+        self.eyelids_angry_height = self._animate(
+            "eyelids_angry_height", self.eyelids_angry_height_next, current_time
+        )
+        self.eyelids_happy_bottom_offset = self._animate(
+            "eyelids_happy_bottom_offset", self.eyelids_happy_bottom_offset_next, current_time
+        )
 
-        # Draw angry top eyelids
-        self.eyelids_angry_height = (
-            self.eyelids_angry_height + self.eyelids_angry_height_next
-        ) // 2
-        if self.eyelids_angry_height > 0:
-            if not self.cyclops:
-                # Left eye
-                self.draw.polygon(
-                    [
-                        (eyeL_x_draw_int, eyeL_y_draw_int - 1),
-                        (eyeL_x_draw_int + eyeL_width_current_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int + eyeL_width_current_int,
-                            eyeL_y_draw_int + int(self.eyelids_angry_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-                # Right eye
-                self.draw.polygon(
-                    [
-                        (eyeR_x_draw_int, eyeR_y_draw_int - 1),
-                        (eyeR_x_draw_int + eyeR_width_current_int, eyeR_y_draw_int - 1),
-                        (
-                            eyeR_x_draw_int,
-                            eyeR_y_draw_int + int(self.eyelids_angry_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-            else:  # Cyclops
-                # Left half
-                self.draw.polygon(
-                    [
-                        (eyeL_x_draw_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int - 1,
-                        ),
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int + int(self.eyelids_angry_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
-                # Right half
-                self.draw.polygon(
-                    [
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int - 1,
-                        ),
-                        (eyeL_x_draw_int + eyeL_width_current_int, eyeL_y_draw_int - 1),
-                        (
-                            eyeL_x_draw_int + (eyeL_width_current_int // 2),
-                            eyeL_y_draw_int + int(self.eyelids_angry_height) - 1,
-                        ),
-                    ],
-                    fill=BGCOLOR,
-                )
+        # Nothing moves until the next input change or macro timer: update() can skip frames
+        if not retargeted and all(tween.settled for tween in self.tweens.values()) and not (
+            self.h_flicker or self.v_flicker or self.laugh or self.confused
+        ):
+            self.settled_inputs = self._inputs()
+        else:
+            self.settled_inputs = None
 
-        # Draw happy bottom eyelids
-        self.eyelids_happy_bottom_offset = (
-            self.eyelids_happy_bottom_offset + self.eyelids_happy_bottom_offset_next
-        ) // 2
-        if self.eyelids_happy_bottom_offset > 0:
-            eyelids_happy_bottom_offset_int = int(self.eyelids_happy_bottom_offset)
-            # Left eye
-            self.draw.rounded_rectangle(
-                (
-                    eyeL_x_draw_int - 1,
-                    (eyeL_y_draw_int + eyeL_height_current_int)
-                    - eyelids_happy_bottom_offset_int
-                    + 1,
-                    eyeL_x_draw_int + eyeL_width_current_int + 1,
-                    eyeL_y_draw_int
-                    + eyeL_height_current_int
-                    + int(self.eyeL_height_default),
-                ),  # Ends well below the eye
-                radius=eyeL_border_radius_current_int,
-                fill=BGCOLOR,
+        # Ensure all coordinates and dimensions are integers before drawing
+        eyeL_x_draw_int = int(eyeL_x_draw)
+        eyeL_y_draw_int = int(eyeL_y_draw)
+        eyeL_width_current_int = int(self.eyeL_width_current)
+        eyeL_height_current_int = int(self.eyeL_height_current)
+        eyeL_border_radius_current_int = int(self.eyeL_border_radius_current)
+
+        eyeR_x_draw_int = int(eyeR_x_draw)
+        eyeR_y_draw_int = int(eyeR_y_draw)
+        eyeR_width_current_int = int(self.eyeR_width_current)
+        eyeR_height_current_int = int(self.eyeR_height_current)
+        eyeR_border_radius_current_int = int(self.eyeR_border_radius_current)
+
+        # Everything the drawing below depends on; skip drawing if nothing changed
+        geometry = (
+            eyeL_x_draw_int, eyeL_y_draw_int, eyeL_width_current_int,
+            eyeL_height_current_int, eyeL_border_radius_current_int,
+            eyeR_x_draw_int, eyeR_y_draw_int, eyeR_width_current_int,
+            eyeR_height_current_int, eyeR_border_radius_current_int,
+            int(self.eyelids_tired_height), int(self.eyelids_angry_height),
+            int(self.eyelids_happy_bottom_offset), self.cyclops,
+            int(self.eyeL_height_default), int(self.eyeR_height_default),
+        )
+        if geometry == self.last_geometry:
+            return False
+        self.last_geometry = geometry
+
+        # ACTUAL DRAWINGS
+        self.draw.rectangle(
+            [(0, 0), (self.screen_width, self.screen_height)], fill=BGCOLOR
+        )  # Clear screen
+
+        # Each eye (including its eyelids) is a cached sprite blitted at its position,
+        # so steady expressions cost a cache lookup and a paste instead of a dozen draw calls
+        tired_height = int(self.eyelids_tired_height)
+        angry_height = int(self.eyelids_angry_height)
+        happy_offset = int(self.eyelids_happy_bottom_offset)
+        if not self.cyclops:
+            eyes = (
+                ("L", eyeL_x_draw_int, eyeL_y_draw_int, eyeL_width_current_int,
+                 eyeL_height_current_int, eyeL_border_radius_current_int,
+                 int(self.eyeL_height_default)),
+                ("R", eyeR_x_draw_int, eyeR_y_draw_int, eyeR_width_current_int,
+                 eyeR_height_current_int, eyeR_border_radius_current_int,
+                 int(self.eyeR_height_default)),
             )
-            if not self.cyclops:
-                # Right eye
-                self.draw.rounded_rectangle(
-                    (
-                        eyeR_x_draw_int - 1,
-                        (eyeR_y_draw_int + eyeR_height_current_int)
-                        - eyelids_happy_bottom_offset_int
-                        + 1,
-                        eyeR_x_draw_int + eyeR_width_current_int + 1,
-                        eyeR_y_draw_int
-                        + eyeR_height_current_int
-                        + int(self.eyeR_height_default),
-                    ),
-                    radius=eyeR_border_radius_current_int,
-                    fill=BGCOLOR,
-                )
+        else:
+            eyes = (
+                ("C", eyeL_x_draw_int, eyeL_y_draw_int, eyeL_width_current_int,
+                 eyeL_height_current_int, eyeL_border_radius_current_int,
+                 int(self.eyeL_height_default)),
+            )
+        placed = []
+        for side, x, y, width, height, radius, height_default in eyes:
+            key = (
+                side, width, height, radius, tired_height, angry_height,
+                happy_offset, height_default if happy_offset > 0 else 0,
+            )
+            sprite = self.sprites.get(key)
+            if sprite is None:
+                sprite = self.sprites.put(key, render_eye_sprite(*key))
+            placed.append(((x + sprite[0], y + sprite[1]), sprite[2], sprite[3]))
+        for origin, fill, erase in placed:
+            self.image.paste(MAINCOLOR, origin, fill)
+        for origin, fill, erase in placed:
+            if erase is not None:
+                self.image.paste(BGCOLOR, origin, erase)
 
         # self.image.save(f"debug_frame_{int(current_time*100)}.png") # For debugging
+        return True
@@ -4,6 +4,8 @@ RoboEyes 表情生成API
 """
 
 import logging
+import random
+import time
 
 from .roboeyes import ANGRY, DEFAULT, HAPPY, TIRED, RoboEyes
 
@@ -16,9 +18,13 @@ class RoboeyesAPI:
     负责初始化和控制RoboEyes动画
     """
 
-    def __init__(self, frame_rate, width, height):
-        """初始化RoboEyes控制器"""
-        self.rbe = RoboEyes(width, height, frame_rate)
+    def __init__(self, frame_rate, width, height, clock=time.monotonic, rng=random):
+        """
+        初始化RoboEyes控制器
+        param clock: 时间源, 返回秒数; 测试和基准测试中可以传入虚拟时钟
+        param rng: 随机数生成器 (需要 randrange / randint), 例如 random.Random(0) 可使动画可重现
+        """
+        self.rbe = RoboEyes(width, height, frame_rate, clock=clock, rng=rng)
         self.expression_map = {
             "happy": HAPPY,
             "angry": ANGRY,
@@ -0,0 +1,109 @@
+"""
+单色精灵图 (sprite sheet)
+
+一段动画的所有帧只生成一次: 可以用代码画 (from_function), 也可以从 GIF 动图或
+按网格排列的 PNG 精灵图读取 (load)。每帧保存为 (高, 宽) 的只读布尔数组,
+之后按帧序号直接取出, 可以作为图层图像发给 OLED 合成线程, 不再每帧画图和转换颜色模式。
+
+使用方法:
+    spinner = SpriteSheet.from_function(8, (128, 64), lambda draw, i: draw.line(...))
+    walk = SpriteSheet.load("localfiles/walk.png", frame_size=(32, 32))   # 网格精灵图, 按行依次取帧
+    blink = SpriteSheet.load("localfiles/blink.gif")                        # GIF 的每一帧
+    pixels = walk.frame(index)      # 序号超过帧数时循环
+"""
+
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageSequence
+
+THRESHOLD = 128     # 亮度 (和不透明度) 超过该值的像素点亮
+
+
+def to_pixels(image, threshold=THRESHOLD):
+    """把任意模式的 PIL 图像转换为布尔数组; 带透明通道时, 透明的像素不点亮"""
+    if image.mode == "1":
+        return np.asarray(image, dtype=bool)
+    if "transparency" in image.info or image.mode in ("LA", "PA", "RGBA"):
+        image = image.convert("RGBA")
+        pixels = np.asarray(image.convert("L")) > threshold
+        return pixels & (np.asarray(image.getchannel("A")) > threshold)
+    return np.asarray(image.convert("L")) > threshold
+
+
+def _read_only(pixels):
+    """帧会被多个图层和线程共用, 不允许通过它们修改"""
+    pixels = np.ascontiguousarray(pixels, dtype=bool)
+    pixels.setflags(write=False)
+    return pixels
+
+
+class SpriteSheet:
+    """
+    param frames: 帧列表, 每帧是 PIL 图像或 (高, 宽) 的布尔数组, 尺寸必须相同
+    """
+
+    def __init__(self, frames):
+        if not frames:
+            raise ValueError("精灵图至少需要一帧")
+        self.frames = [
+            _read_only(frame if isinstance(frame, np.ndarray) else to_pixels(frame)) for frame in frames
+        ]
+        if len({frame.shape for frame in self.frames}) != 1:
+            raise ValueError("精灵图的各帧尺寸必须相同")
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def size(self):
+        """帧的 (宽, 高)"""
+        height, width = self.frames[0].shape
+        return width, height
+
+    def frame(self, index):
+        """返回第 index 帧, 序号超过帧数时循环"""
+        return self.frames[index % len(self.frames)]
+
+    @classmethod
+    def from_function(cls, count, size, draw_frame):
+        """
+        用代码生成 count 帧: 对每一帧调用 draw_frame(draw, index), 在 size 大小的 "1" 模式图像上绘制
+        """
+        frames = []
+        for index in range(count):
+            image = Image.new("1", size, 0)
+            draw_frame(ImageDraw.Draw(image), index)
+            frames.append(image)
+        return cls(frames)
+
+    @classmethod
+    def load(cls, path, frame_size=None, count=None, threshold=THRESHOLD):
+        """
+        从图像文件读取帧
+
+        param path: 文件路径 (str 或 os.PathLike) 或已打开的 PIL 图像
+        param frame_size: 网格精灵图中每帧的 (宽, 高), 按从左到右, 从上到下的顺序取帧;
+                          为 None 时, 多帧图像 (GIF) 的每一帧是一帧, 单帧图像整张是一帧
+        param count: 最多取多少帧, 网格最后一行没有排满时使用
+        """
+        if isinstance(path, (str, os.PathLike)):
+            # 像素在 with 块内全部转换成数组, 之后不再需要打开的文件
+            with Image.open(path) as image:
+                frames = _slice_frames(image, frame_size, threshold)
+        else:
+            frames = _slice_frames(path, frame_size, threshold)
+        return cls(frames[:count])
+
+
+def _slice_frames(image, frame_size, threshold):
+    """把图像切成帧的布尔数组列表, 参数见 SpriteSheet.load"""
+    if frame_size is None:
+        return [to_pixels(frame, threshold) for frame in ImageSequence.Iterator(image)]
+    pixels = to_pixels(image, threshold)
+    width, height = frame_size
+    return [
+        pixels[top:top + height, left:left + width]
+        for top in range(0, pixels.shape[0] - height + 1, height)
+        for left in range(0, pixels.shape[1] - width + 1, width)
+    ]
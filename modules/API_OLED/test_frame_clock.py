@@ -0,0 +1,54 @@
+"""
+frame_clock 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_frame_clock.py
+"""
+
+import pytest
+
+from modules.API_OLED.frame_clock import RENDER_LEAD, FrameClock
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_producers_and_compositor_share_the_grid():
+    now = FakeTime()
+    clock = FrameClock(fps=50, clock=now, loadavg=lambda: (0.0, 0.0, 0.0))
+    now.now = 100.005
+    assert clock.next_tick() == pytest.approx(100.02)
+    assert clock.next_tick(fps=20) == pytest.approx(100.06)        # 20 fps 取 50 / 3 fps 的网格
+    # 合成时刻在生产者的网格点之后, 且与上一次合成至少间隔一帧
+    assert clock.render_time(100.005) == pytest.approx(100.02 + RENDER_LEAD)
+    assert clock.render_time(100.021) == pytest.approx(100.02 + RENDER_LEAD)
+    assert clock.render_time(100.021, last_render=100.024) == pytest.approx(100.04 + RENDER_LEAD)
+
+
+def test_governor_follows_display_time_and_load():
+    now = FakeTime()
+    load = [0.0]
+    clock = FrameClock(fps=50, min_fps=10, clock=now, loadavg=lambda: (load[0], 0.0, 0.0))
+    for _ in range(20):                 # 发送一帧要 15 ms, 超过 20 ms 帧间隔的一半
+        now.now += 0.1
+        clock.report_display(0.015)
+    assert clock.divisor == 2 and clock.fps == pytest.approx(25)
+    now.now += 2
+    clock.report_display(0.015)         # 40 ms 帧间隔下 15 ms 不算慢, 也不足以升回 50 fps
+    assert clock.divisor == 2
+    load[0] = 100.0                     # CPU 满负荷
+    for _ in range(100):
+        now.now += 0.5
+        clock.report_display(0.002)
+    assert clock.divisor == clock.max_divisor == 5
+    load[0] = 0.0
+    for _ in range(100):
+        now.now += 0.5
+        clock.report_display(0.002)
+    assert clock.divisor == 1
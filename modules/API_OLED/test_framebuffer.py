@@ -0,0 +1,111 @@
+"""
+framebuffer 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_framebuffer.py
+"""
+
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw
+
+from modules.API_OLED.framebuffer import image_size, pack_image, pack_rect, pages_shape, unpack_pages
+
+
+def reference_composite(layers, width=128, height=64):
+    """原来基于 PIL 的合成方式, 作为对照"""
+    final = Image.new("1", (width, height), 0)
+    for image, position in layers:
+        temp = Image.new("1", (width, height), 0)
+        temp.paste(image.convert("1"), position)
+        final = ImageChops.logical_or(final, temp)
+    return final
+
+
+def random_layer(rng, size):
+    image = Image.new("1", size, 0)
+    draw = ImageDraw.Draw(image)
+    for _ in range(5):
+        x0, y0 = rng.integers(0, size[0]), rng.integers(0, size[1])
+        draw.ellipse((x0, y0, x0 + 9, y0 + 7), fill=1)
+    return image
+
+
+def test_page_layout():
+    image = Image.new("1", (128, 64), 0)
+    image.putpixel((3, 0), 1)       # 第 0 页第 3 列的最低位
+    image.putpixel((5, 15), 1)      # 第 1 页第 5 列的最高位
+    pages = pack_image(image, (0, 0), 128, 64)
+    assert pages.shape == pages_shape(128, 64) == (8, 128)
+    assert pages[0, 3] == 0x01 and pages[1, 5] == 0x80
+    assert pages.sum() == 0x81
+
+
+def test_matches_pil_composite_with_clipping():
+    rng = np.random.default_rng(0)
+    layers = [(random_layer(rng, (40, 30)), (int(rng.integers(-30, 120)), int(rng.integers(-20, 60))))
+              for _ in range(6)]
+    frame = np.zeros((8, 128), dtype=np.uint8)
+    for image, position in layers:
+        frame |= pack_image(image, position, 128, 64)
+    assert unpack_pages(frame).tobytes() == reference_composite(layers).tobytes()
+
+
+def test_boolean_array_layers_pack_like_images():
+    rng = np.random.default_rng(1)
+    image = random_layer(rng, (40, 30))
+    strip = np.hstack([np.asarray(image, dtype=bool)] * 2)
+    view = strip[:, 5:45]                                   # 不连续的视图
+    assert image_size(view) == image_size(image) == (40, 30)
+    expected = Image.fromarray(np.ascontiguousarray(view))
+    assert (pack_image(view, (-3, 50), 128, 64) == pack_image(expected, (-3, 50), 128, 64)).all()
+
+
+def test_opaque_mask_clears_lower_layers():
+    frame = pack_image(Image.new("1", (128, 64), 1), (0, 0), 128, 64)
+    mask = pack_rect((10, 3, 20, 10), 128, 64)
+    frame &= ~mask
+    image = unpack_pages(frame)
+    assert image.getpixel((10, 3)) == 0 and image.getpixel((29, 12)) == 0
+    assert image.getpixel((9, 3)) and image.getpixel((10, 13))
+
+
+class FakeScreen:
+    """记录发送给 SSD1306 的命令和数据, 并模拟显存"""
+
+    def __init__(self):
+        self.ram = np.zeros((8, 128), dtype=np.uint8)
+        self.window = None
+        self.data_bytes = 0
+
+    def command(self, *cmd):
+        assert cmd[0] == 0x21 and cmd[3] == 0x22
+        self.window = cmd
+
+    def data(self, values):
+        _, start, end, _, first_page, last_page = self.window
+        self.ram[first_page:last_page + 1, start:end + 1] = np.array(values).reshape(
+            last_page - first_page + 1, end - start + 1)
+        self.data_bytes += len(values)
+
+
+def test_display_pages_sends_only_dirty_columns():
+    from modules.API_OLED.OLED_API import OLED
+
+    oled = OLED.__new__(OLED)
+    oled.is_simulation, oled.width, oled.height = False, 128, 64
+    oled.screen, oled._last_pages, oled.bytes_sent = FakeScreen(), None, 0
+
+    frame = np.zeros((8, 128), dtype=np.uint8)
+    frame[2:4, 10:20] = 0xFF
+    oled.display_pages(frame)
+    assert oled.screen.data_bytes == 1024             # 第一帧整屏发送
+
+    frame[3, 15] = 0x00                               # 只改一个字节
+    frame[6, 100:103] = 0x0F
+    oled.display_pages(frame)
+    assert oled.screen.data_bytes == 1024 + 1 + 3
+    assert (oled.screen.ram == frame).all()
+
+    oled.display_pages(frame)                         # 没有变化时不发送
+    assert oled.screen.data_bytes == 1028
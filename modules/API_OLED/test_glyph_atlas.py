@@ -0,0 +1,48 @@
+"""
+glyph_atlas 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_glyph_atlas.py
+"""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont, features
+
+from modules.API_OLED.glyph_atlas import GlyphAtlas
+
+pytestmark = pytest.mark.skipif(not features.check("freetype2"), reason="需要 FreeType")
+
+
+def pil_pixels(font, text, origin, size=(160, 48)):
+    image = Image.new("1", size, 0)
+    ImageDraw.Draw(image).text(origin, text, font=font, fill=1)
+    return np.asarray(image, dtype=bool)
+
+
+def test_draw_matches_pil_rendering():
+    font = ImageFont.load_default(16)
+    atlas = GlyphAtlas(font)
+    draw = ImageDraw.Draw(Image.new("1", (1, 1)))
+    for text, origin in [("hello world", (3, 4)), ("jumps over", (2.5, 6.5)), ("a\nbcd", (10, 0))]:
+        canvas = np.zeros((48, 160), dtype=bool)
+        atlas.draw(canvas, text.split("\n"), origin)
+        assert (canvas == pil_pixels(font, text, origin)).all(), text
+        assert atlas.bbox(text.split("\n")) == draw.textbbox((0, 0), text, font=font)
+    assert atlas.bbox([""]) == (0, 0, 0, 0)
+
+
+def test_disk_cache_round_trip(tmp_path):
+    font = ImageFont.load_default(12)
+    path = str(tmp_path / "atlas.npz")
+    atlas = GlyphAtlas(font, path)
+    atlas.bbox(["cached glyphs"])
+    assert atlas.save() and not atlas.save()        # 没有新字形时不再写入
+
+    loaded = GlyphAtlas(font, path)
+    assert loaded.glyphs == atlas.glyphs and not loaded.dirty
+    canvas, expected = np.zeros((48, 160), dtype=bool), np.zeros((48, 160), dtype=bool)
+    loaded.draw(canvas, ["cached glyphs"], (4, 4))
+    atlas.draw(expected, ["cached glyphs"], (4, 4))
+    assert canvas.any() and (canvas == expected).all()
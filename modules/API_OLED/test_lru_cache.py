@@ -0,0 +1,32 @@
+"""
+lru_cache 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_lru_cache.py
+"""
+
+from modules.API_OLED.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # "a" 变为最近使用
+    cache.put("c", 3)                   # 淘汰 "b"
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get_or_create("c", lambda key: 0) == 3
+    assert cache.stats() == {"size": 2, "bytes": 0, "hits": 2, "misses": 1, "evictions": 1}
+
+
+def test_byte_limit():
+    cache = LRUCache(maxsize=100, maxbytes=10, sizeof=len)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.put("a", b"123456")           # 替换已有条目, 总计 10 字节
+    assert len(cache) == 2
+    cache.put("c", b"1")                # 超出 10 字节, 淘汰最久没用的 "b"
+    assert "b" not in cache and "a" in cache
+    assert cache.stats()["bytes"] == 7
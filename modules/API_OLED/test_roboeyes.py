@@ -0,0 +1,42 @@
+"""
+RoboEyes 动画节奏单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_roboeyes.py
+"""
+
+import random
+
+from modules.API_OLED.roboeyes import RoboEyes
+
+
+def run(setup, seconds=5.0, fps=50):
+    """用虚拟时钟按帧率驱动 RoboEyes, 返回每帧的 (时间, 左眼高度, 左眼 x 目标, 左眼 x) 和跳过的帧数"""
+    now = [0.0]
+    eyes = RoboEyes(128, 64, fps, clock=lambda: now[0], rng=random.Random(1))
+    setup(eyes)
+    samples, skipped = [], 0
+    for i in range(int(seconds * fps) + 1):
+        now[0] = i / fps
+        eyes.update()
+        skipped += not eyes.changed
+        samples.append((now[0], eyes.eyeL_height_current, eyes.eyeL_x_next, eyes.eyeL_x))
+    return eyes, samples, skipped
+
+
+def test_autoblink_keeps_its_interval_while_settled_frames_are_skipped():
+    eyes, samples, skipped = run(lambda eyes: eyes.set_autoblinker(True, 1, 0))
+    closed = [height < eyes.eyeL_height_default // 2 for _, height, _, _ in samples]
+    blinks = [t for (t, _, _, _), was, now in zip(samples[1:], closed, closed[1:]) if now and not was]
+    assert skipped > 100                                # 两次眨眼之间的静止帧仍然被跳过
+    assert len(blinks) == 5                             # 1.08, 2.08, ... 每秒一次, 不是每两秒一次
+    assert all(0.9 < b - a < 1.1 for a, b in zip(blinks, blinks[1:]))
+
+
+def test_idle_mode_reaches_every_target():
+    _, samples, skipped = run(lambda eyes: eyes.set_idle_mode(True, 1, 0))
+    targets = {target for _, _, target, _ in samples[1:]}
+    reached = {x for _, _, target, x in samples if x == target}
+    assert skipped > 100 and len(targets) == 5       # 每秒换一次目标
+    assert targets <= reached
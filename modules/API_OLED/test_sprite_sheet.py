@@ -0,0 +1,44 @@
+"""
+sprite_sheet 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_sprite_sheet.py
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from modules.API_OLED.sprite_sheet import SpriteSheet
+
+
+def test_grid_sheet_frames_in_row_order(tmp_path):
+    sheet = Image.new("L", (24, 16), 0)
+    for index in range(5):
+        sheet.putpixel(((index % 3) * 8 + index, (index // 3) * 8), 255)
+    path = str(tmp_path / "sheet.png")
+    sheet.save(path)
+
+    sprites = SpriteSheet.load(path, frame_size=(8, 8), count=5)
+    assert len(sprites) == 5 and sprites.size == (8, 8)
+    for index in range(5):
+        assert list(zip(*np.nonzero(sprites.frame(index)))) == [(0, index)]
+    assert sprites.frame(7) is sprites.frame(2)
+    with pytest.raises(ValueError):
+        sprites.frame(0)[0, 0] = True
+
+
+def test_gif_frames_respect_transparency(tmp_path):
+    frames = []
+    for index in range(3):
+        frame = Image.new("RGBA", (6, 4), (255, 255, 255, 0))       # 透明的白色背景不点亮
+        frame.putpixel((index, 1), (255, 255, 255, 255))
+        frames.append(frame)
+    path = tmp_path / "anim.gif"                                    # pathlib.Path 也可以
+    frames[0].save(path, save_all=True, append_images=frames[1:], disposal=2)
+
+    sprites = SpriteSheet.load(path)
+    assert len(sprites) == 3
+    for index in range(3):
+        assert list(zip(*np.nonzero(sprites.frame(index)))) == [(1, index)]
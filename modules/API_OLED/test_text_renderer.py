@@ -0,0 +1,71 @@
+"""
+TextRenderer 换行单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_text_renderer.py
+"""
+
+import pytest
+
+from modules.API_OLED import text_renderer
+from modules.API_OLED.lru_cache import LRUCache
+from modules.API_OLED.text_renderer import FONT_CACHE_SIZE, TextRenderer
+
+
+class FixedWidthRenderer(TextRenderer):
+    """每个字符宽 1, CJK 字符宽 2, 不需要字体文件"""
+
+    def __init__(self):
+        super().__init__(font_path=None)
+
+    def char_width(self, char, font_size):
+        return 2 if ord(char) > 0x2E80 else 1
+
+
+def test_wraps_at_spaces_and_splits_overlong_words():
+    renderer = FixedWidthRenderer()
+    assert renderer._wrap_text("the quick brown fox", 16, 10) == "the quick\nbrown fox"
+    assert renderer._wrap_text("abcdefghijkl xy", 16, 5) == "abcde\nfghij\nkl xy"
+    assert renderer._wrap_text("short\nlines", 16, 10) == "short\nlines"
+    assert renderer._wrap_text("  fits ", 16, 10) == "  fits "      # 不需要换行时原样返回
+
+
+def test_wraps_cjk_without_spaces_and_keeps_punctuation_attached():
+    renderer = FixedWidthRenderer()
+    assert renderer._wrap_text("你好世界再见", 16, 8) == "你好世界\n再见"
+    # 句号不能出现在行首, 和前一个字一起换到下一行
+    assert renderer._wrap_text("你好世界。再见", 16, 8) == "你好世\n界。再见"
+    assert renderer._wrap_text("hello你好", 16, 6) == "hello\n你好"
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    """每个测试使用空的字体和字符宽度缓存"""
+    monkeypatch.setattr(text_renderer, "_fonts", LRUCache(FONT_CACHE_SIZE))
+    monkeypatch.setattr(text_renderer, "_advances", LRUCache(text_renderer.ADVANCE_CACHE_SIZE))
+
+
+def test_fonts_and_advance_widths_are_cached_per_size(font_path, caches):
+    renderer = TextRenderer(font_path)
+    renderer.text_width("ab", 12)
+    stats = TextRenderer.cache_stats()
+    assert (stats["fonts"]["misses"], stats["advances"]["misses"]) == (1, 2)
+
+    TextRenderer(font_path).text_width("ab", 12)        # 同一字号: 字体和字符宽度都命中
+    stats = TextRenderer.cache_stats()
+    assert stats["advances"]["hits"] == 2 and stats["advances"]["misses"] == 2
+
+    renderer.text_width("ab", 14)                       # 新字号: 重新加载字体, 重新测量
+    stats = TextRenderer.cache_stats()
+    assert stats["fonts"]["size"] == 2 and stats["advances"]["misses"] == 4
+
+
+def test_font_cache_is_bounded(font_path, caches):
+    renderer = TextRenderer(font_path)
+    for size in range(8, 8 + FONT_CACHE_SIZE + 3):
+        renderer.font_loader(size)
+    stats = TextRenderer.cache_stats()["fonts"]
+    assert stats["size"] == FONT_CACHE_SIZE and stats["evictions"] == 3
+    renderer.font_loader(8)                             # 最早加载的字号已被淘汰
+    assert TextRenderer.cache_stats()["fonts"]["misses"] == FONT_CACHE_SIZE + 4
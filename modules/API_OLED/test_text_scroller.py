@@ -0,0 +1,63 @@
+"""
+TextScroller 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_text_scroller.py
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from modules.API_OLED.text_renderer import TextRenderer
+from modules.API_OLED.text_scroller import TextScroller
+
+
+def crop_horizontal(source, left, width, height):
+    """原来的实现: 每帧从源图像裁剪, 越过末尾时把开头拼接到后面"""
+    frame = Image.new("1", (width, height))
+    frame.paste(source.crop((left, 0, min(left + width, source.width), height)), (0, 0))
+    if left + width > source.width:
+        frame.paste(source.crop((0, 0, left + width - source.width, height)), (source.width - left, 0))
+    return np.asarray(frame, dtype=bool)
+
+
+def crop_vertical(source, text_y, width, height):
+    """原来的实现: 把源图像的可见部分贴到空白帧中 text_y 处"""
+    frame = Image.new("1", (width, height))
+    src_top, src_bottom = max(0, -text_y), min(source.height, height - text_y)
+    if src_top < src_bottom:
+        frame.paste(source.crop((0, src_top, width, src_bottom)), (0, max(0, text_y)))
+    return np.asarray(frame, dtype=bool)
+
+
+@pytest.fixture
+def renderer(font_path):
+    return TextRenderer(font_path)
+
+
+def test_horizontal_frames_wrap_like_the_per_frame_crop(renderer):
+    scroller = TextScroller(renderer, "wrap around text", 16, 64, 24, "horizontal", scroll_speed=3)
+    assert scroller.strip.any()
+    for _ in range(2 * scroller.source_width // 3 + 1):     # 至少绕回一次
+        left = scroller.current_position_x
+        frame = scroller.next_frame()
+        assert frame.shape == (24, 64) and not frame.flags.writeable
+        assert (frame == crop_horizontal(scroller.source_image, left, 64, 24)).all()
+    with pytest.raises(ValueError):
+        frame[0, 0] = True
+
+
+def test_vertical_frames_wrap_like_the_per_frame_crop(renderer):
+    scroller = TextScroller(renderer, "line one line two line three line four", 16, 48, 32, "vertical",
+                            scroll_speed=2)
+    assert scroller.strip.any()
+    wrapped = False
+    for _ in range((scroller.source_height + 32) // 2 + 5):
+        text_y = scroller.current_position_y
+        frame = scroller.next_frame()
+        wrapped |= scroller.current_position_y > text_y
+        assert frame.shape == (32, 48) and not frame.flags.writeable
+        assert (frame == crop_vertical(scroller.source_image, text_y, 48, 32)).all()
+    assert wrapped
@@ -0,0 +1,31 @@
+"""
+tween 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest API_OLED/test_tween.py
+"""
+
+from modules.API_OLED.tween import Tween, ease_out_cubic, linear
+
+
+def test_progress_depends_on_time_not_frame_count():
+    fast, slow = Tween(0, 0.2, linear), Tween(0, 0.2, linear)
+    fast.retarget(100, 0.0)
+    slow.retarget(100, 0.0)
+    for i in range(1, 11):              # 50 fps
+        fast.update(i * 0.02)
+    slow.update(0.2)                    # 5 fps, 一帧就到
+    assert fast.value == slow.value == 100 and fast.settled
+    fast.retarget(0, 1.0)
+    assert round(fast.update(1.1), 6) == 50
+
+
+def test_retarget_starts_from_current_value():
+    tween = Tween(0, 0.1, ease_out_cubic)
+    tween.retarget(10, 0.0)
+    middle = tween.update(0.05)
+    assert 5 < middle < 10              # ease-out: 前半段走得更多
+    tween.retarget(-10, 0.05)
+    assert tween.update(0.05) == middle and not tween.settled
+    assert tween.update(0.2) == -10
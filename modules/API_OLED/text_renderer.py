@@ -1,13 +1,84 @@
-from PIL import Image, ImageDraw, ImageFont
+import os
+from itertools import accumulate
+
+import numpy as np
+from PIL import Image, ImageFont
+
+if __name__ == "__main__":
+    from modules.API_OLED.glyph_atlas import GlyphAtlas
+    from modules.API_OLED.lru_cache import LRUCache
+else:
+    from .glyph_atlas import GlyphAtlas
+    from .lru_cache import LRUCache
+
+# Loaded fonts, keyed by (font_path, font_size). Shared by all renderers, so the TTF is parsed
+# once per size instead of on every render_text / get_multiline_text_size call.
+FONT_CACHE_SIZE = 8
+# Advance widths, keyed by (font_path, font_size, char); each entry is a few dozen bytes
+ADVANCE_CACHE_SIZE = 8192
+# Glyph atlases, keyed by (font_path, font_size, atlas_dir); one per font size in use
+ATLAS_CACHE_SIZE = 4
+
+# Line-breaking rules: closing punctuation never starts a line, opening punctuation never ends one
+NO_BREAK_BEFORE = set("，。、；：！？）》」』】〉〕”’…·～,.;:!?)]}%")
+NO_BREAK_AFTER = set("（《「『【〈〔“‘([{")
+
+_fonts = LRUCache(FONT_CACHE_SIZE)
+_advances = LRUCache(ADVANCE_CACHE_SIZE)
+_atlases = LRUCache(ATLAS_CACHE_SIZE)
 
 
 class TextRenderer:
-    def __init__(self, font_path):
+    def __init__(self, font_path, atlas_dir=None):
+        """
+        font_path: TrueType font file or font name
+        atlas_dir: directory for the on-disk glyph atlas cache (e.g. "localfiles/glyph_atlas"), None to keep it in memory
+        """
         self.font_path = font_path
+        self.atlas_dir = atlas_dir
 
     def font_loader(self, font_size):
-        """Loads and returns a font object."""
-        return ImageFont.truetype(self.font_path, font_size)
+        """Returns the font object for font_size, loading it only on the first use."""
+        key = (self.font_path, font_size)
+        font = _fonts.get(key)
+        if font is None:
+            font = _fonts.put(key, ImageFont.truetype(self.font_path, font_size))
+        return font
+
+    def char_width(self, char, font_size):
+        """Returns the advance width of a single character, measured once per font and size."""
+        key = (self.font_path, font_size, char)
+        width = _advances.get(key)
+        if width is None:
+            width = _advances.put(key, self.font_loader(font_size).getlength(char))
+        return width
+
+    def text_width(self, text, font_size):
+        """Returns the width of a single line as the sum of cached advance widths (no kerning)."""
+        return sum(self.char_width(char, font_size) for char in text)
+
+    def atlas(self, font_size):
+        """Returns the glyph atlas for font_size; every glyph is rasterized once and then blitted."""
+        key = (self.font_path, font_size, self.atlas_dir)
+        atlas = _atlases.get(key)
+        if atlas is None:
+            cache_path = None
+            if self.atlas_dir:
+                name = os.path.splitext(os.path.basename(str(self.font_path)))[0]
+                cache_path = os.path.join(self.atlas_dir, f"{name}-{font_size}.npz")
+            atlas = _atlases.put(key, GlyphAtlas(self.font_loader(font_size), cache_path))
+        return atlas
+
+    @staticmethod
+    def save_atlases():
+        """Writes glyph atlases with new glyphs to their on-disk cache."""
+        for atlas in _atlases.values():
+            atlas.save()
+
+    @staticmethod
+    def cache_stats():
+        """Hit/miss counters and sizes of the shared font, advance-width and atlas caches."""
+        return {"fonts": _fonts.stats(), "advances": _advances.stats(), "atlases": _atlases.stats()}
 
     def render_text(
         self,
@@ -25,17 +96,15 @@ class TextRenderer:
         """
         Renders text onto a monochrome image for SSD1306 OLED compatibility.
         """
-        font = self.font_loader(font_size)
-        # Create monochrome image (mode "1") for OLED compatibility
-        image = Image.new("1", (image_width, image_height), bg_color)
-        draw = ImageDraw.Draw(image)
+        atlas = self.atlas(font_size)
 
         final_text = text
         if wrap:
-            final_text = self._wrap_text(text, font, image_width - padding * 2)
+            final_text = self._wrap_text(text, font_size, image_width - padding * 2)
 
         # Get bounding box of the whole text
-        text_bbox = draw.textbbox((0, 0), final_text, font=font)
+        lines = final_text.split("\n")
+        text_bbox = atlas.bbox(lines)
         text_width = text_bbox[2] - text_bbox[0]
         text_height = text_bbox[3] - text_bbox[1]
 
@@ -55,55 +124,87 @@ class TextRenderer:
         else:  # Default to center
             y = (image_height - text_height) / 2 - text_bbox[1]
 
-        draw.text((x, y), final_text, font=font, fill=text_color, align=align)
-
-        return image
+        # Blit the glyphs from the atlas onto a monochrome (mode "1") image for OLED compatibility
+        pixels = np.zeros((image_height, image_width), dtype=bool)
+        atlas.draw(pixels, lines, (x, y), align)
+        if text_color != 1 or bg_color != 0:
+            pixels = np.where(pixels, bool(text_color), bool(bg_color))
+        return Image.fromarray(pixels)
 
     def get_multiline_text_size(self, text, font_size, max_width, padding=2):
         """Calculates the size of a text block after wrapping."""
-        font = self.font_loader(font_size)
-        wrapped_text = self._wrap_text(text, font, max_width - padding * 2)
-
-        # Use a dummy image to get the bounding box
-        dummy_image = Image.new("1", (1, 1), 0)
-        dummy_draw = ImageDraw.Draw(dummy_image)
-        bbox = dummy_draw.textbbox((0, 0), wrapped_text, font=font)
+        wrapped_text = self._wrap_text(text, font_size, max_width - padding * 2)
+        bbox = self.atlas(font_size).bbox(wrapped_text.split("\n"))
 
         width = bbox[2] - bbox[0]
         height = bbox[3] - bbox[1]
         return width, height
 
-    def _wrap_text(self, text, font, max_width):
+    def _wrap_text(self, text, font_size, max_width):
         """
         Wraps text to fit within a specified width.
+
+        Each glyph is measured once (cached advance widths) and summed into a prefix array, so the
+        width of any span is one subtraction and the whole text is wrapped in a single scan.
+        Existing newlines are kept as hard breaks. Text that needs no wrapping is returned unchanged.
         """
-        if font.getlength(text) <= max_width:
-            return text
+        lines = []
+        for paragraph in text.split("\n"):
+            lines.extend(self._wrap_paragraph(paragraph, font_size, max_width))
+        wrapped = "\n".join(lines)
+        return text if wrapped == text else wrapped.strip()
+
+    def _wrap_paragraph(self, text, font_size, max_width):
+        """Breaks one paragraph (no newlines) into lines no wider than max_width."""
+        prefix = list(accumulate((self.char_width(char, font_size) for char in text), initial=0))
+        if prefix[-1] <= max_width:
+            return [text]
 
         lines = []
-        words = text.split(" ")
-        current_line = ""
-        for word in words:
-            if font.getlength(current_line + " " + word) <= max_width:
-                current_line += " " + word
-            else:
-                lines.append(current_line.strip())
-                current_line = word
-        lines.append(current_line.strip())
-
-        # For languages without spaces like Chinese, we might need a character-by-character wrap
-        if " " not in text:
-            lines = []
-            current_line = ""
-            for char in text:
-                if font.getlength(current_line + char) <= max_width:
-                    current_line += char
-                else:
-                    lines.append(current_line)
-                    current_line = char
-            lines.append(current_line)
-
-        return "\n".join(lines).strip()
+        n = len(text)
+        start = 0           # first character of the current line
+        last_break = None   # latest index the current line may end before
+        i = 0
+        while i < n:
+            if i > start and _can_break_before(text, i):
+                last_break = i
+            if i > start and prefix[i + 1] - prefix[start] > max_width and text[i] != " ":
+                # Overflow: end at the last break opportunity, or mid-word if there is none
+                end = last_break if last_break is not None else i
+                lines.append(text[start:end].rstrip(" "))
+                start = end
+                while start < n and text[start] == " ":
+                    start += 1
+                last_break = None
+                i = start
+                continue
+            i += 1
+        lines.append(text[start:].rstrip(" "))
+        return lines
+
+
+def _is_cjk(char):
+    """True for characters that may be broken around without a space (CJK ideographs, kana, hangul, fullwidth forms)."""
+    code = ord(char)
+    return (
+        0x2E80 <= code <= 0x9FFF
+        or 0xAC00 <= code <= 0xD7AF
+        or 0xF900 <= code <= 0xFAFF
+        or 0xFE30 <= code <= 0xFE4F
+        or 0xFF00 <= code <= 0xFFEF
+        or 0x1100 <= code <= 0x11FF
+        or code >= 0x20000
+    )
+
+
+def _can_break_before(text, i):
+    """Whether a line may end between text[i - 1] and text[i]."""
+    prev, char = text[i - 1], text[i]
+    if prev == " " or char == " ":
+        return True
+    if char in NO_BREAK_BEFORE or prev in NO_BREAK_AFTER:
+        return False
+    return _is_cjk(prev) or _is_cjk(char)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import numpy as np
 from PIL import Image
 
 if __name__ == "__main__":
@@ -33,8 +34,7 @@ class TextScroller:
 
     def _init_horizontal(self, text, font_size):
         """Initializes the source image for horizontal scrolling."""
-        temp_font = self.renderer.font_loader(font_size)
-        text_width = int(temp_font.getlength(text))
+        text_width = int(self.renderer.text_width(text, font_size))
 
         self.source_image = self.renderer.render_text(
             text,
@@ -47,6 +47,11 @@ class TextScroller:
         self.source_width = self.source_image.width
         self.current_position_x = 0
 
+        # Doubled strip: the first viewport_width columns are repeated after the end, so the
+        # frame at the wrap point is still one contiguous slice
+        pixels = np.asarray(self.source_image, dtype=bool)
+        self.strip = _read_only(np.hstack((pixels, pixels[:, :self.viewport_width])))
+
     def _init_vertical(self, text, font_size):
         """Initializes the source image for vertical scrolling using precise height calculation."""
         # 1. Calculate the exact size of the wrapped text block
@@ -60,9 +65,7 @@ class TextScroller:
             actual_text_height = self.viewport_height
 
         if actual_text_height == 0:  # Handle empty text
-            self.source_image = Image.new(
-                "RGB", (self.viewport_width, self.viewport_height)
-            )
+            self.source_image = Image.new("1", (self.viewport_width, self.viewport_height))
             self.finished = True
             return
 
@@ -82,8 +85,17 @@ class TextScroller:
         # 文本从视窗下方开始，向上移动进入视窗（从下往上滚动）
         self.current_position_y = self.viewport_height
 
+        # 上下各补一屏空白, 文本在任何位置时的一帧都是其中连续的一段
+        blank = np.zeros((self.viewport_height, self.viewport_width), dtype=bool)
+        self.strip = _read_only(np.vstack((blank, np.asarray(self.source_image, dtype=bool), blank)))
+
     def next_frame(self):
-        """Returns the next frame of the scrolling animation based on direction."""
+        """
+        Returns the next frame of the scrolling animation based on direction.
+
+        Frames are read-only (viewport_height, viewport_width) boolean views into a strip
+        rendered once in __init__, so producing a frame allocates no pixels.
+        """
         if self.finished:
             return None
 
@@ -95,60 +107,19 @@ class TextScroller:
     def _next_horizontal_frame(self):
         """Calculates the next frame for horizontal scrolling."""
         left = self.current_position_x
-        top = 0
-        right = left + self.viewport_width
-        bottom = self.viewport_height
+        if left + self.viewport_width > self.source_width and not self.loop:
+            self.finished = True
+            return None
 
-        if right > self.source_image.width:
-            if self.loop:
-                frame = Image.new("RGB", (self.viewport_width, self.viewport_height))
-                end_part_width = self.source_image.width - left
-                end_part = self.source_image.crop(
-                    (left, top, self.source_image.width, bottom)
-                )
-                frame.paste(end_part, (0, 0))
-
-                remaining_width = self.viewport_width - end_part_width
-                start_part = self.source_image.crop((0, top, remaining_width, bottom))
-                frame.paste(start_part, (end_part_width, 0))
-
-                self.current_position_x = (
-                    self.current_position_x + self.scroll_speed
-                ) % self.source_image.width
-            else:
-                self.finished = True
-                return None
-        else:
-            frame = self.source_image.crop((left, top, right, bottom))
-            self.current_position_x += self.scroll_speed
+        frame = self.strip[:, left:left + self.viewport_width]
+        self.current_position_x = (left + self.scroll_speed) % self.source_width
         return frame
 
     def _next_vertical_frame(self):
         """Calculates the next frame for vertical scrolling (bottom to top)."""
-        # 创建一个视窗大小的帧，使用与源图像相同的模式
-        frame = Image.new(
-            self.source_image.mode, (self.viewport_width, self.viewport_height), 0
-        )
-
-        # 计算文本在帧中的位置（从下往上滚动）
-        text_y = self.current_position_y
-
-        # 如果文本还在视窗范围内
-        if text_y > -self.source_height and text_y < self.viewport_height:
-            # 计算需要裁剪的源图像区域
-            src_top = max(0, -text_y)
-            src_bottom = min(self.source_height, self.viewport_height - text_y)
-
-            # 计算在帧中粘贴的位置
-            dst_top = max(0, text_y)
-
-            if src_top < src_bottom:
-                # 裁剪源图像的可见部分
-                visible_part = self.source_image.crop(
-                    (0, src_top, self.viewport_width, src_bottom)
-                )
-                # 粘贴到帧中
-                frame.paste(visible_part, (0, dst_top))
+        # 文本顶端在视窗中的位置为 current_position_y, 对应补白后条带中从 viewport_height - y 开始的一段
+        top = self.viewport_height - self.current_position_y
+        frame = self.strip[top:top + self.viewport_height]
 
         # 更新位置：向上移动文本（从下往上滚动效果）
         self.current_position_y -= self.scroll_speed
@@ -165,24 +136,29 @@ class TextScroller:
         return frame
 
 
+def _read_only(pixels):
+    """Frames are views shared with the display thread; nothing may write through them."""
+    pixels.setflags(write=False)
+    return pixels
+
+
 if __name__ == "__main__":
     import os
     import sys
 
     import cv2
-    import numpy as np
 
     # Add project root to path to allow importing config
     sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
     from configs.api_config import config
 
     def create_video(frames, output_path, fps, size):
-        """Creates a video from a list of PIL Images."""
+        """Creates a video from a list of boolean frames."""
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
         video_writer = cv2.VideoWriter(output_path, fourcc, fps, size)
         for frame in frames:
-            # Convert PIL image to numpy array (OpenCV uses BGR format)
-            frame_np = np.array(frame.convert("RGB"))
+            # Frames are boolean arrays; OpenCV expects 8-bit BGR
+            frame_np = np.repeat(frame[:, :, np.newaxis], 3, axis=2).astype(np.uint8) * 255
             video_writer.write(frame_np)
         video_writer.release()
 
@@ -208,7 +184,7 @@ if __name__ == "__main__":
     print("Generating horizontal animation frames for video...")
     for i in range(400):
         frame = scroller_h.next_frame()
-        if frame:
+        if frame is not None:
             frames_h.append(frame)
         else:
             break
@@ -233,7 +209,7 @@ if __name__ == "__main__":
     # Generate enough frames to see the full loop
     for i in range(scroller_v.source_height + scroller_v.viewport_height):
         frame = scroller_v.next_frame()
-        if frame:
+        if frame is not None:
             frames_v.append(frame)
         else:
             break
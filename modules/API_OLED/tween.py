@@ -0,0 +1,79 @@
+"""
+基于时间的补间动画
+
+每个动画参数 (位置, 尺寸, 眼睑高度等) 都是一个 Tween: 目标值改变时,
+从当前值开始, 在 duration 秒内按缓动曲线过渡到新的目标值。
+插值只取决于经过的时间, 与帧率无关: 帧率降低或某几帧被跳过时, 动画速度不变, 只是画面更稀疏。
+
+使用方法:
+    tween = Tween(0, duration=0.15, easing=ease_out_cubic)
+    tween.retarget(100, now)        # 目标值变化时重新开始过渡, 目标不变时什么也不做
+    value = tween.update(now)       # 计算 now 时刻的值
+    tween.settled                   # 已经到达目标值
+"""
+
+
+def linear(t):
+    return t
+
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+
+def ease_out_cubic(t):
+    t = 1 - t
+    return 1 - t * t * t
+
+
+def ease_in_out_cubic(t):
+    if t < 0.5:
+        return 4 * t * t * t
+    t = 2 - 2 * t
+    return 1 - t * t * t / 2
+
+
+class Tween:
+    """
+    一个数值参数的补间
+
+    param value: 初始值
+    param duration: 每次过渡的时长 (秒), 0 表示立即到达
+    param easing: 缓动函数, 把 [0, 1] 的时间进度映射到 [0, 1] 的数值进度
+    """
+    __slots__ = ("value", "start", "target", "start_time", "duration", "easing")
+
+    def __init__(self, value, duration=0.15, easing=ease_out_cubic):
+        self.value = self.start = self.target = value
+        self.start_time = 0.0
+        self.duration = duration
+        self.easing = easing
+
+    @property
+    def settled(self):
+        return self.value == self.target
+
+    def retarget(self, target, now, duration=None):
+        """设置新的目标值, 从 now 时刻的当前值开始过渡"""
+        if target == self.target:
+            return
+        self.start = self.update(now)
+        self.target = target
+        self.start_time = now
+        if duration is not None:
+            self.duration = duration
+
+    def update(self, now):
+        """计算并返回 now 时刻的值"""
+        if self.value != self.target:
+            elapsed = now - self.start_time
+            if elapsed >= self.duration:
+                self.value = self.target
+            elif elapsed > 0:
+                progress = self.easing(elapsed / self.duration)
+                self.value = self.start + (self.target - self.start) * progress
+        return self.value
+
+    def jump(self, value):
+        """立即跳到 value, 不做过渡"""
+        self.value = self.start = self.target = value
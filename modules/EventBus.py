@@ -10,6 +10,30 @@
 # 订阅
     my_queue = queue.Queue()                             # 创建一个自己的事件队列(收件箱)
     event_bus.subscribe("类型", my_queue, "订阅人")   # 订阅某种类型的事件 ("订阅人"可不填, 默认为空字符串)
+    event_bus.unsubscribe("类型", my_queue, "订阅人") # 取消订阅
+
+# 按前缀订阅一组事件 (只支持末尾的 *)
+    event_bus.subscribe("LED_*", my_queue, "订阅人")     # 所有以 LED_ 开头的事件
+    event_bus.subscribe("*", my_queue, "监控")           # 所有事件, 例如事件记录器或统计工具
+
+# 订阅高频 "最新值" 类事件 (只保留最新的一条, 旧的未读事件被直接替换)
+    my_queue = EventQueue()                              # 需要使用支持合并的 EventQueue 作为收件箱
+    event_bus.subscribe("FACE_RECT", my_queue, "订阅人", conflate=True)           # 按事件类型合并
+    event_bus.subscribe("UPDATE_LAYER", my_queue, "订阅人", conflate="layer_id")  # 按事件类型 + data["layer_id"] 合并
+
+# 订阅数据量大的事件时限制未读事件数 (同样需要使用 EventQueue)
+    event_bus.subscribe("VOICE_COMMAND_DETECTED", my_queue, "订阅人", maxsize=2)  # 超过 2 条未读时丢弃最早的一条
+    event_bus.subscribe("类型", my_queue, "订阅人", maxsize=5, overflow="block", timeout=0.5)  # 已满时阻塞发布者最多 0.5 秒
+    event_bus.get_stats()                                # 查看每条订阅的投递数, 丢弃数, 队列深度最高水位
+
+# 优先级 (同样需要使用 EventQueue): EXIT, INTERRUPTION_DETECTED 等控制事件默认走高优先级通道,
+# 即使收件箱里积压了大量图像帧或音频数据, 也会被最先取出
+    event_bus.subscribe("类型", my_queue, "订阅人", priority=HIGH)    # 指定优先级: HIGH / NORMAL / LOW
+    my_queue.lane_stats()                                # 查看每个通道事件的平均/最长等待时间
+
+# 事件日志
+    event_bus.tracer.set_sample_rate("FACE_RECT", 0.1)   # 每 10 条 FACE_RECT 记录 1 条 (0 表示不记录)
+    event_bus.set_tracer(None)                           # 关闭事件日志
 
 # 发布
     data = {"key1": value1, "key2": value2, ...}         # 以字典格式准备要发布的消息
@@ -17,6 +41,17 @@
     
     # 发送一个事件给总线, 总线就会根据事件类型, 自动将事件转发到订阅者的队列中
 
+# 请求/应答 (直接把结果交给请求者, 不需要订阅广播的应答事件)
+    result = event_bus.request("GET_TEMPERATURE", timeout=1.0)   # 阻塞等待应答, 超时返回 None
+    # 应答方: 收到的事件 data 中带有 "reply_to" 字段
+    event_bus.reply(event, {"temperature": 25})          # 返回 False 表示这条事件不是请求, 或请求者已超时
+
+# 在 asyncio 协程中使用 (多个模块可以作为协程跑在同一个事件循环里, 不再各占一个线程)
+    async for event in event_bus.stream("STT_RESULT_RECEIVED", "EXIT", name="订阅人"):   # 退出循环时自动取消订阅
+        if event["type"] == "EXIT":
+            break
+        await event_bus.apublish("SPEAK_TEXT", {"text": "..."}, "发布人")   # 不会阻塞事件循环
+
 # 获取消息
     event = self.my_queue.get()             # 获取一条事件: 如果队列为空, 一直阻塞等待, 直到有事件到来
     event = self.my_queue.getnowait()       # 获取一条事件: 如果队列为空, 立即返回 None, 并抛出异常(queue.Empty)
@@ -29,12 +64,416 @@
 """
 
 
+import asyncio
+import os
 import threading
 import queue
+import itertools
+import time
+from collections import OrderedDict, deque
 import logging
 logger = logging.getLogger("消息总线")
 
 
+# 各类事件的日志采样率: 1 表示每条都记录, 0 表示从不记录, 0.1 表示每 10 条记录 1 条
+# 未列出的事件默认全部记录。
+DEFAULT_SAMPLE_RATES = {
+    "UPDATE_LAYER": 0,          # OLED屏幕刷新事件,非常频繁
+    "CAR_STEER": 0,
+    "HEAD_ANGLE": 0,
+    "FACE_RECT": 0,
+}
+
+
+def summarize(value, max_items=8, max_str=40, depth=2):
+    """
+    把事件数据压缩成简短的一行文本, 用于日志
+
+    bytes / 图像 / 数组等大对象只输出类型和尺寸, 长字符串和长列表会被截断,
+    不会因为数据无法序列化而出错, 耗时也与数据大小无关。
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return repr(value if len(value) <= max_str else value[:max_str] + "…")
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{type(value).__name__} {len(value)}>"
+    if hasattr(value, "shape") and hasattr(value, "dtype"):     # numpy 数组
+        return f"<ndarray {value.dtype} {'x'.join(map(str, value.shape))}>"
+    if hasattr(value, "mode") and hasattr(value, "size"):       # PIL 图像
+        return f"<Image {value.mode} {value.size[0]}x{value.size[1]}>"
+    if depth <= 0:
+        return f"<{type(value).__name__}>"
+    if isinstance(value, dict):
+        items = [f"{k}: {summarize(v, max_items, max_str, depth - 1)}"
+                 for k, v in itertools.islice(value.items(), max_items)]
+        if len(value) > max_items:
+            items.append(f"…+{len(value) - max_items}")
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        items = [summarize(v, max_items, max_str, depth - 1) for v in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"…+{len(value) - max_items}")
+        return ("[%s]" if isinstance(value, list) else "(%s)") % ", ".join(items)
+    return f"<{type(value).__name__}>"
+
+
+class EventTracer:
+    """
+    事件追踪器: 决定哪些事件需要写入日志, 并把事件格式化成简短的一行
+
+    只有在日志级别允许, 且该事件被采样命中时才会格式化数据, 否则 publish 几乎没有额外开销。
+    可以继承本类并重写 emit() 把追踪记录写到其它地方, 再通过 event_bus.set_tracer() 替换。
+    """
+
+    def __init__(self, sample_rates=None, level=logging.INFO, trace_logger=None):
+        self.sample_rates = dict(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates)
+        self.level = level
+        self.logger = trace_logger or logger
+        self._credit = {}                   # 每类事件累积的采样额度, 满 1 时记录一条
+
+    def set_sample_rate(self, event_type, rate):
+        """设置某类事件的采样率 (0 ~ 1)"""
+        self.sample_rates[str(event_type).upper()] = rate
+
+    def sample(self, event_type):
+        """判断这条事件是否需要记录"""
+        rate = self.sample_rates.get(event_type, 1)
+        if rate <= 0 or not self.logger.isEnabledFor(self.level):
+            return False
+        if rate >= 1:
+            return True
+        # 每条事件累积 rate 的额度, 满 1 记录一条: 任意采样率 (包括 0.5 以上) 都能精确实现,
+        # 第一条事件总是被记录
+        credit = self._credit.get(event_type, 1.0 - rate) + rate
+        sampled = credit >= 1 - 1e-9
+        if sampled:
+            credit -= 1
+        self._credit[event_type] = credit
+        return sampled
+
+    def trace(self, event_type, data, source, subscribers):
+        """格式化并输出一条追踪记录"""
+        if _served(subscribers):
+            line = f'{source} 发布了 {event_type} 消息'
+        else:
+            line = f'{source} 发布了 {event_type} 消息 (无人订阅)'
+        # 不对 data 求真值 (numpy 数组会报错), 只跳过 None 和空容器
+        if data is not None and not (isinstance(data, (dict, list, tuple, str)) and not data):
+            line += f' data = {summarize(data)}'
+        self.emit(line)
+
+    def emit(self, line):
+        self.logger.log(self.level, line)
+
+
+# 有界订阅的溢出策略
+DROP_OLDEST = "drop_oldest"     # 丢弃该订阅最早的一条未读事件, 放入新事件
+DROP_NEWEST = "drop_newest"     # 丢弃新事件
+BLOCK = "block"                 # 阻塞发布者, 直到有空位或超时 (超时后丢弃新事件)
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# 优先级通道: EventQueue 总是先取出高优先级通道中的事件, 同一通道内先进先出
+HIGH = 0                        # 控制类事件: 急停, 打断, 退出
+NORMAL = 1
+LOW = 2
+PRIORITIES = (HIGH, NORMAL, LOW)
+
+# 各类事件的默认优先级, 未列出的事件为 NORMAL; 订阅时可用 priority 参数覆盖
+DEFAULT_PRIORITIES = {
+    "EXIT": HIGH,
+    "INTERRUPTION_DETECTED": HIGH,  # 语音打断, 必须立即停止 TTS
+    "FACE_TRACK_OFF": HIGH,         # 停止人脸追踪 (舵机)
+}
+
+WILDCARD = "*"                  # 只能出现在事件类型末尾, 表示前缀匹配
+MAX_ROUTES = 4096               # 路由缓存最多记录的事件类型数量, 防止被大量一次性的事件类型撑大
+_UNRESOLVED = object()
+REPLY_TOPIC = "_REPLY"          # 跨进程应答使用的内部事件类型
+
+
+class EventQueue(queue.Queue):
+    """
+    支持 "优先级通道", "最新值合并" 和 "分组限长" 的事件队列 (收件箱)
+
+    用法与 queue.Queue 完全相同, 额外提供:
+    - 优先级通道: 每条事件属于 HIGH / NORMAL / LOW 其中一个通道, get() 总是先取高优先级通道,
+      因此 EXIT, 打断这类控制事件不会排在成百上千条图像帧或音频数据之后。
+      普通的 put() 放入 NORMAL 通道, put_lane() 可以指定通道。
+    - put_latest(): 同一个 key 的事件在队列中最多只保留一条,
+      新事件会替换掉尚未被取走的旧事件, 并移动到队尾 (保证与其它事件之间的先后顺序不被打乱)。
+      消费者卡顿时, 高频事件占用的内存只与 key 的数量有关, 取出的永远是最新的状态。
+    - put_bounded(): 同一分组 (通常是一条订阅) 的未读事件数不超过 maxsize,
+      溢出时按策略处理; 其它分组 (例如 EXIT) 不受影响, 不会被挤掉, 也不会被阻塞。
+    - lane_stats(): 每个通道从放入到取出的等待时间统计。
+    """
+
+    def _init(self, maxsize):
+        # 每个通道: key -> (group, event, 放入时间), 普通事件使用自增整数作为 key
+        self.lanes = tuple(OrderedDict() for _ in PRIORITIES)
+        self._seq = itertools.count()
+        self._groups = {}                   # group -> 该分组未读事件的 (通道, key) (先进先出)
+        self.conflated = 0                  # 被合并 (替换) 掉的旧事件数量
+        self._waits = [[0, 0.0, 0.0] for _ in PRIORITIES]    # 每个通道: [取出数, 总等待时间, 最长等待时间]
+
+    def _qsize(self):
+        return sum(map(len, self.lanes))
+
+    def _put(self, item):
+        self.lanes[NORMAL][next(self._seq)] = (None, item, time.monotonic())
+
+    def _get(self):
+        for lane, entries in enumerate(self.lanes):
+            if entries:
+                break
+        key, (group, item, enqueued) = entries.popitem(last=False)
+        waits = self._waits[lane]
+        wait = time.monotonic() - enqueued
+        waits[0] += 1
+        waits[1] += wait
+        if wait > waits[2]:
+            waits[2] = wait
+        if group is not None:
+            # 通配订阅的分组跨多个通道, 先取出的不一定是分组里最早放入的那条
+            self._groups[group].remove((lane, key))
+            self.not_full.notify_all()      # 唤醒因该分组已满而阻塞的发布者
+        return item
+
+    def put_lane(self, item, lane):
+        """放入一条事件到指定的优先级通道 (不会阻塞)"""
+        with self.mutex:
+            self.lanes[lane][next(self._seq)] = (None, item, time.monotonic())
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def put_latest(self, item, key, lane=NORMAL):
+        """放入一条事件, 并替换掉队列中 key 相同的旧事件 (不会阻塞)"""
+        with self.mutex:
+            entries = self.lanes[lane]
+            if key in entries:
+                # 保留旧事件的放入时间, 等待时间统计反映的是该 key 实际被延迟了多久
+                enqueued = entries.pop(key)[2]
+                self.conflated += 1
+            else:
+                enqueued = time.monotonic()
+                self.unfinished_tasks += 1
+            entries[key] = (None, item, enqueued)
+            self.not_empty.notify()
+
+    def put_bounded(self, item, group, maxsize, overflow=DROP_OLDEST, timeout=None, lane=NORMAL):
+        """
+        放入一条事件, 并限制 group 分组的未读事件数不超过 maxsize
+
+        return: (丢弃的事件数, 放入后该分组的未读事件数)
+        """
+        with self.mutex:
+            keys = self._groups.get(group)
+            if keys is None:
+                keys = self._groups[group] = deque()
+            dropped = 0
+            if len(keys) >= maxsize:
+                if overflow == DROP_NEWEST:
+                    return 1, len(keys)
+                elif overflow == DROP_OLDEST:
+                    oldest_lane, oldest_key = keys.popleft()
+                    del self.lanes[oldest_lane][oldest_key]
+                    # 丢弃的事件不会再有 task_done(), 和 task_done() 一样在计数归零时唤醒 join()
+                    self.unfinished_tasks -= 1
+                    if self.unfinished_tasks <= 0:
+                        self.all_tasks_done.notify_all()
+                    dropped = 1
+                else:  # BLOCK
+                    endtime = None if timeout is None else time.monotonic() + timeout
+                    while len(keys) >= maxsize:
+                        remaining = None if endtime is None else endtime - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            return 1, len(keys)
+                        self.not_full.wait(remaining)
+            key = next(self._seq)
+            self.lanes[lane][key] = (group, item, time.monotonic())
+            keys.append((lane, key))
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+            return dropped, len(keys)
+
+    def lane_stats(self):
+        """返回每个优先级通道的等待时间统计 (单位: 毫秒)"""
+        with self.mutex:
+            return [
+                {
+                    "lane": lane,
+                    "depth": len(self.lanes[lane]),
+                    "count": count,
+                    "mean_wait_ms": round(total / count * 1000, 3) if count else 0.0,
+                    "max_wait_ms": round(longest * 1000, 3),
+                }
+                for lane, (count, total, longest) in enumerate(self._waits)
+            ]
+
+
+class AsyncEventQueue(EventQueue):
+    """
+    可以在 asyncio 协程中等待的事件队列
+
+    发布者仍然在任意线程中同步放入事件; 协程通过 await get_async() 取出事件,
+    队列为空时挂起协程而不是阻塞线程。只有协程正在等待时, 放入事件才会唤醒事件循环。
+    """
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._waiter = None                 # 正在等待的协程的 Future
+
+    def _wakeup(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.get_loop().call_soon_threadsafe(self._resolve, waiter)
+
+    @staticmethod
+    def _resolve(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self._wakeup()
+
+    def put_lane(self, item, lane):
+        super().put_lane(item, lane)
+        self._wakeup()
+
+    def put_latest(self, item, key, lane=NORMAL):
+        super().put_latest(item, key, lane)
+        self._wakeup()
+
+    def put_bounded(self, item, group, maxsize, overflow=DROP_OLDEST, timeout=None, lane=NORMAL):
+        result = super().put_bounded(item, group, maxsize, overflow, timeout, lane)
+        self._wakeup()
+        return result
+
+    async def get_async(self):
+        """取出一条事件, 队列为空时挂起当前协程"""
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                # 设置 waiter 后再检查一次, 防止事件恰好在两步之间放入而错过唤醒
+                if self.qsize():
+                    continue
+                await self._waiter
+            finally:
+                self._waiter = None
+
+
+class _ReplyInbox(queue.Queue):
+    """接收其它进程发来的应答 (REPLY_TOPIC), 直接交给等待中的请求者, 本身不保存事件"""
+
+    def __init__(self, event_bus):
+        super().__init__()
+        self.event_bus = event_bus
+
+    def put(self, item, block=True, timeout=None):
+        self.event_bus._resolve(item["data"]["reply_to"], item["data"]["data"])
+
+    def _qsize(self):
+        return 0
+
+
+class _Subscription:
+    """一条订阅记录: 订阅者的队列 + 投递方式 + 统计数据"""
+    __slots__ = ("event_type", "queue", "name", "conflate", "maxsize", "overflow", "timeout", "lane",
+                 "passive", "deliver", "delivered", "dropped", "high_water")
+
+    def __init__(self, event_type, event_queue, name, conflate, maxsize, overflow, timeout, priority=None,
+                 passive=False):
+        self.event_type = event_type
+        self.queue = event_queue
+        self.name = name
+        self.conflate = conflate
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.timeout = timeout
+        # 优先级通道; 前缀订阅 ("*") 未指定优先级时为 None, 投递时按每条事件的类型确定
+        if priority is None and WILDCARD not in event_type:
+            priority = DEFAULT_PRIORITIES.get(event_type, NORMAL)
+        self.lane = priority
+        self.passive = passive          # 旁路订阅: 只观察事件, 不算作该事件有人订阅
+        self.delivered = 0              # 成功投递的事件数
+        self.dropped = 0                # 因队列已满被丢弃的事件数
+        self.high_water = 0             # 投递时观察到的最大队列深度
+        if conflate is not None:
+            self.deliver = self._deliver_latest
+        elif maxsize:
+            self.deliver = self._deliver_bounded
+        elif isinstance(event_queue, EventQueue):
+            self.deliver = self._deliver_lane
+        else:
+            self.deliver = self._deliver        # 普通 queue.Queue 没有优先级通道
+
+    def _lane(self, event):
+        lane = self.lane
+        return DEFAULT_PRIORITIES.get(event["type"], NORMAL) if lane is None else lane
+
+    def _deliver(self, event):
+        event_queue = self.queue
+        event_queue.put(event)
+        self.delivered += 1
+        depth = event_queue.qsize()
+        if depth > self.high_water:
+            self.high_water = depth
+
+    def _deliver_lane(self, event):
+        event_queue = self.queue
+        event_queue.put_lane(event, self._lane(event))
+        self.delivered += 1
+        depth = event_queue.qsize()
+        if depth > self.high_water:
+            self.high_water = depth
+
+    def _deliver_latest(self, event):
+        data = event["data"]
+        if self.conflate is True:
+            key = (event["type"],)
+        else:
+            key = (event["type"], data.get(self.conflate) if isinstance(data, dict) else None)
+        self.queue.put_latest(event, key, self._lane(event))
+        self.delivered += 1
+
+    def _deliver_bounded(self, event):
+        dropped, depth = self.queue.put_bounded(event, self, self.maxsize, self.overflow, self.timeout,
+                                                self._lane(event))
+        if depth > self.high_water:
+            self.high_water = depth
+        if dropped:
+            self.dropped += 1
+            # 只在第 1, 100, 200... 次丢弃时打印, 避免刷屏
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(f'{self.name} 的 {self.event_type} 队列已满 ({self.maxsize}), 累计丢弃 {self.dropped} 条')
+        if dropped == 0 or self.overflow == DROP_OLDEST:
+            self.delivered += 1
+
+    def stats(self):
+        """返回该订阅的统计数据"""
+        return {
+            "name": self.name,
+            "type": self.event_type,
+            "priority": self.lane,
+            "depth": self.queue.qsize(),
+            "maxsize": self.maxsize,
+            "overflow": self.overflow if self.maxsize else None,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "high_water": self.high_water,
+        }
+
+
+def _served(subscriptions):
+    """是否有订阅者会处理这类事件 (旁路订阅不算)"""
+    return bool(subscriptions) and any(not sub.passive for sub in subscriptions)
+
+
 class EventBus:
     _instance = None
     _lock = threading.Lock()
@@ -48,33 +487,167 @@ class EventBus:
 
     def __init__(self):
         if not hasattr(self, "listeners"):   # 避免多次初始化
+            self._sub_lock = threading.Lock()   # 只保护 subscribe/unsubscribe 之间的互斥, publish 不加锁
             self.listeners = {}
-            """实际结构:
+            """实际结构 (写时复制, 整个字典和其中的元组都不会被原地修改):
             self.listeners = {
-                "TYPE1": [queue1, queue2, queue3],
-                "TYPE2": [queue1, queue4],
-                "TYPE3": [queue2],
+                "TYPE1": (subscription1, subscription2, subscription3),
+                "TYPE2": (subscription1, subscription4),
+                "TYPE3": (subscription2,),
             }
+            每条 _Subscription 记录了订阅者的队列, 以及投递到该队列的方式 (普通 / 合并 / 限长) 和统计数据。
+            订阅表变化时, 在锁内构造一个新字典, 再整体替换 self.listeners;
+            publish 读到的永远是一个完整的快照, 因此无需加锁。
             """
+            self.patterns = {}
+            """前缀订阅表, 结构同 listeners, 键为去掉末尾 * 的前缀 ("LED_*" -> "LED_", "*" -> "")"""
+            self._routes = {}
+            """路由缓存: 事件类型 -> 该类型的全部订阅 (精确订阅 + 匹配的前缀订阅), None 表示无人订阅。
+            第一次发布某类事件时计算并缓存, 之后 publish 只需一次字典查询, 与前缀订阅的数量无关;
+            订阅表变化时整体替换为空字典。"""
+            self.tracer = EventTracer()     # 事件日志, 设为 None 则完全不记录
+            self.bridges = ()               # 跨进程桥接 (见 EventBusIPC.py), 同样写时复制
+            self._pending = {}              # 等待应答的请求: 关联 ID -> 应答收件箱
+            self._request_ids = itertools.count(1)
+            self._reply_inbox = None        # 接收其它进程应答的内部订阅, 第一次请求时创建
 
-    def subscribe(self, event_type, event_queue, name = ""):
+    def subscribe(self, event_type, event_queue, name = "", conflate = None,
+                  maxsize = 0, overflow = DROP_OLDEST, timeout = None, priority = None, passive = False):
+        """
+        订阅事件
+
+        param conflate: 合并模式, 仅对 EventQueue 有效
+            None  - 不合并, 每条事件都会投递 (默认)
+            True  - 同一类型的事件只保留最新一条
+            str   - 按 data 中该字段的值分别保留最新一条, 例如 "layer_id"
+        param maxsize: 该订阅最多允许的未读事件数, 0 表示不限制, 仅对 EventQueue 有效
+        param overflow: 超出 maxsize 时的策略: "drop_oldest" (默认), "drop_newest", "block"
+        param timeout: "block" 策略下发布者最多等待的秒数, None 表示一直等待
+        param priority: 优先级通道 HIGH / NORMAL / LOW, None 表示使用 DEFAULT_PRIORITIES 中的默认值,
+                        仅对 EventQueue 有效 (普通 queue.Queue 始终先进先出)
+        param passive: 旁路订阅, 用于事件记录器这类只观察总线的内部工具:
+                       照常收到事件, 但不算作 "有人订阅", request() 和事件日志的判断不受它影响
+        """
         if not isinstance(event_queue, queue.Queue):
             raise TypeError(f'{name} 模块使用 subscribe() 时传入了错误的容器类型')
+        if (conflate is not None or maxsize) and not isinstance(event_queue, EventQueue):
+            raise TypeError(f'{name} 模块使用合并模式或限长订阅时, 必须使用 EventQueue 作为容器')
+        if conflate is not None and maxsize:
+            raise ValueError(f'{name} 模块订阅时不能同时使用合并模式和限长')
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'{name} 模块订阅时使用了未知的溢出策略: {overflow}')
+        if priority is not None:
+            if priority not in PRIORITIES:
+                raise ValueError(f'{name} 模块订阅时使用了未知的优先级: {priority}')
+            if not isinstance(event_queue, EventQueue):
+                raise TypeError(f'{name} 模块指定优先级时, 必须使用 EventQueue 作为容器')
 
         # 事件类型转换为大写字符串
         event_type = str(event_type).upper()
+        table_name, key = self._table_key(event_type)
 
-        # 订阅者的队列列表不存在, 则创建
-        if event_type not in self.listeners:
-            self.listeners[event_type] = []
+        with self._sub_lock:
+            table = getattr(self, table_name)
+            subscriptions = table.get(key, ())
+            is_new_type = not subscriptions
+            # 同一个队列重复订阅时, 用新的订阅参数替换旧记录
+            subscriptions = tuple(sub for sub in subscriptions if sub.queue is not event_queue)
+            table = dict(table)
+            subscription = _Subscription(event_type, event_queue, name, conflate, maxsize, overflow, timeout,
+                                         priority, passive)
+            table[key] = subscriptions + (subscription,)
+            setattr(self, table_name, table)    # 原子替换快照
+            self._routes = {}                   # 最后清空路由缓存 (publish 先读缓存, 再读订阅表)
 
-        # 订阅者的队列列表中不存在该队列, 则添加
-        if event_queue not in self.listeners[event_type]:
-            self.listeners[event_type].append(event_queue)
+        # 通知其它进程: 本进程开始关注这类事件
+        if is_new_type:
+            for bridge in self.bridges:
+                bridge.announce(event_type)
 
         # 打印日志
         logger.info(f'{name} 订阅了 {event_type} 消息')
 
+    def unsubscribe(self, event_type, event_queue, name = ""):
+        # 事件类型转换为大写字符串
+        event_type = str(event_type).upper()
+        table_name, key = self._table_key(event_type)
+
+        with self._sub_lock:
+            table = getattr(self, table_name)
+            subscriptions = table.get(key, ())
+            remaining = tuple(sub for sub in subscriptions if sub.queue is not event_queue)
+            if len(remaining) == len(subscriptions):
+                return
+            table = dict(table)
+            if remaining:
+                table[key] = remaining
+            else:
+                del table[key]
+            setattr(self, table_name, table)    # 原子替换快照
+            self._routes = {}
+
+        # 通知其它进程: 本进程不再关注这类事件
+        if not remaining:
+            for bridge in self.bridges:
+                bridge.withdraw(event_type)
+
+        # 打印日志
+        logger.info(f'{name} 取消订阅了 {event_type} 消息')
+
+    @staticmethod
+    def _table_key(event_type):
+        """返回订阅应记录在哪张表中, 以及在表中的键"""
+        if WILDCARD not in event_type:
+            return "listeners", event_type
+        prefix = event_type[:-1]
+        if not event_type.endswith(WILDCARD) or WILDCARD in prefix:
+            raise ValueError(f'通配符 * 只能出现在事件类型末尾: {event_type}')
+        return "patterns", prefix
+
+    def _route(self, event_type):
+        """计算并缓存 event_type 的全部订阅; 同一个队列同时命中多条订阅时只投递一次"""
+        routes = self._routes               # 必须先于订阅表读取, 保证缓存不会混入过期的订阅表
+        subscriptions = self.listeners.get(event_type)
+        patterns = self.patterns
+        if patterns:
+            matched = list(subscriptions or ())
+            queues = {id(sub.queue) for sub in matched}
+            # 依次检查 event_type 的每个前缀 (由长到短), 耗时只与事件类型长度有关
+            for end in range(len(event_type), -1, -1):
+                for sub in patterns.get(event_type[:end], ()):
+                    if id(sub.queue) not in queues:
+                        queues.add(id(sub.queue))
+                        matched.append(sub)
+            subscriptions = tuple(matched) or None
+        if len(routes) < MAX_ROUTES:
+            routes[event_type] = subscriptions
+        return subscriptions
+
+    def attach_bridge(self, bridge):
+        """接入一个跨进程桥接, 之后发布的事件会同时转发给它"""
+        with self._sub_lock:
+            self.bridges = self.bridges + (bridge,)
+            event_types = tuple(self.listeners) + tuple(prefix + WILDCARD for prefix in self.patterns)
+        for event_type in event_types:
+            bridge.announce(event_type)
+
+    def detach_bridge(self, bridge):
+        with self._sub_lock:
+            self.bridges = tuple(b for b in self.bridges if b is not bridge)
+
+    def set_tracer(self, tracer):
+        """替换事件追踪器, 传入 None 关闭事件日志"""
+        self.tracer = tracer
+
+    def get_stats(self):
+        """返回所有订阅的统计数据列表, 用于监控各模块收件箱的积压和丢弃情况"""
+        return [
+            subscription.stats()
+            for table in (self.listeners, self.patterns)
+            for subscriptions in table.values()
+            for subscription in subscriptions
+        ]
+
     def publish(self, event_type, data = {}, source = "未知"):
         # 事件类型转换为大写字符串
         event_type = str(event_type).upper()
@@ -84,32 +657,136 @@ class EventBus:
             source, data = data, source
             if data == "未知": data = {}
 
-        # 打印日志
-        # 对于高频或data过大的事件，在此处列出以禁止其内容被打印到日志。
-        frequent_event_types = [
-            "UPDATE_LAYER",             # OLED屏幕刷新事件,非常频繁
-            "VOICE_COMMAND_DETECTED",   # VAD检测到语音结束,data较大,不打印
-            "CAR_STEER",
-            "HEAD_ANGLE",
-            "FACE_RECT",
-        ]
-        
-        # 丢弃未被订阅的事件, 并打印日志
-        if event_type not in self.listeners:
-            if event_type not in frequent_event_types:
-                logger.info(f'{source} 发布了 {event_type} 消息 (无人订阅)')
+        # 一次字典查询取得订阅者快照 (元组), 之后的遍历不受并发订阅的影响
+        subscriptions = self._routes.get(event_type, _UNRESOLVED)
+        if subscriptions is _UNRESOLVED:
+            subscriptions = self._route(event_type)
+
+        # 打印事件发布日志 (按采样率, 且只在日志级别允许时才格式化数据)
+        tracer = self.tracer
+        if tracer is not None and tracer.sample(event_type):
+            tracer.trace(event_type, data, source, subscriptions)
+
+        # 丢弃未被订阅 (本进程和其它进程都没有订阅) 的事件
+        bridges = self.bridges
+        if subscriptions is None and not bridges:
             return
-        
-        # 打印事件发布日志
-        if event_type not in frequent_event_types:
-            logger.info(f'{source} 发布了 {event_type} 消息')
-            if data:
-                import json
-                print("data = ",json.dumps(data, indent=4,ensure_ascii=False))
 
         # 将事件类型,数据,发布人打包进字典
         event = {"type": event_type, "data": data, "source": source}
 
         # 发送给所有订阅者
-        for event_queue in self.listeners[event_type]:
-            event_queue.put(event)
\ No newline at end of file
+        if subscriptions is not None:
+            for subscription in subscriptions:
+                subscription.deliver(event)
+
+        # 转发给其它进程
+        for bridge in bridges:
+            bridge.forward(event)
+
+    def request(self, event_type, data = {}, source = "未知", timeout = 1.0):
+        """
+        发布一条请求事件, 并等待订阅者用 reply() 直接应答
+
+        请求事件的 data 中会附带 "reply_to" 关联 ID, 只有第一个应答会被接收。
+        return: 应答数据; 无人订阅或超时返回 None
+        """
+        if isinstance(data, str):
+            source, data = data, source
+            if data == "未知": data = {}
+        event_type = str(event_type).upper()
+
+        subscriptions = self._routes.get(event_type, _UNRESOLVED)
+        if subscriptions is _UNRESOLVED:
+            subscriptions = self._route(event_type)
+        if not _served(subscriptions) and not self.bridges:
+            logger.warning(f'{source} 请求 {event_type} 失败: 无人订阅')
+            return None
+        if self.bridges and self._reply_inbox is None:
+            self._reply_inbox = _ReplyInbox(self)
+            self.subscribe(REPLY_TOPIC, self._reply_inbox, "消息总线")
+
+        # 关联 ID 带上进程号, 跨进程请求时也不会重复
+        reply_to = (os.getpid(), next(self._request_ids))
+        inbox = queue.Queue(maxsize=1)
+        self._pending[reply_to] = inbox
+        try:
+            self.publish(event_type, dict(data, reply_to=reply_to), source)
+            return inbox.get(timeout=timeout)
+        except queue.Empty:
+            logger.warning(f'{source} 请求 {event_type} 超时 ({timeout} 秒)')
+            return None
+        finally:
+            self._pending.pop(reply_to, None)
+
+    def reply(self, event, data = {}):
+        """
+        应答一条由 request() 发出的请求事件
+
+        return: True 表示应答已交给请求者 (或已转发给其它进程);
+                False 表示该事件不是请求, 或请求者已经超时 / 已收到其它应答
+        """
+        request = event.get("data")
+        reply_to = request.get("reply_to") if isinstance(request, dict) else None
+        if reply_to is None:
+            return False
+        if self._resolve(reply_to, data):
+            return True
+        if reply_to[0] != os.getpid() and self.bridges:
+            self.publish(REPLY_TOPIC, {"reply_to": reply_to, "data": data}, "消息总线")
+            return True
+        return False
+
+    def _resolve(self, reply_to, data):
+        """把应答交给本进程中等待的请求者"""
+        inbox = self._pending.pop(reply_to, None)
+        if inbox is None:
+            return False
+        inbox.put(data)
+        return True
+
+    async def apublish(self, event_type, data = {}, source = "未知"):
+        """
+        在 asyncio 协程中发布事件
+
+        publish 本身不会等待, 可以直接调用; 只有存在 "block" 策略的限长订阅时
+        才可能阻塞, 这时转到线程池中执行, 避免卡住事件循环 (以及同一循环上等待的消费者)。
+        """
+        event_type = str(event_type).upper()
+        subscriptions = self._routes.get(event_type, _UNRESOLVED)
+        if subscriptions is _UNRESOLVED:
+            subscriptions = self._route(event_type)
+        if subscriptions and any(sub.maxsize and sub.overflow == BLOCK for sub in subscriptions):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.publish, event_type, data, source)
+        else:
+            self.publish(event_type, data, source)
+
+    async def stream(self, *event_types, name = "", **options):
+        """
+        以异步迭代器的形式订阅事件, 用法: async for event in event_bus.stream("类型1", "类型2"): ...
+
+        options 与 subscribe 的参数相同 (conflate, maxsize, overflow, timeout)。
+        迭代结束 (break / 异常 / 协程被取消) 时自动取消订阅。
+        """
+        inbox = AsyncEventQueue()
+        for event_type in event_types:
+            self.subscribe(event_type, inbox, name, **options)
+        try:
+            while True:
+                yield await inbox.get_async()
+        finally:
+            for event_type in event_types:
+                self.unsubscribe(event_type, inbox, name)
+
+    def _dispatch(self, event, origin=None):
+        """投递一条来自其它进程的事件: 发给本进程的订阅者, 并转发给除来源以外的其它桥接"""
+        subscriptions = self._routes.get(event["type"], _UNRESOLVED)
+        if subscriptions is _UNRESOLVED:
+            subscriptions = self._route(event["type"])
+        if subscriptions is not None:
+            for subscription in subscriptions:
+                subscription.deliver(event)
+        for bridge in self.bridges:
+            if bridge is not origin:
+                bridge.forward(event)
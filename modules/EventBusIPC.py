@@ -0,0 +1,453 @@
+"""
+消息总线的跨进程扩展
+
+把一个 threading.Thread 模块放到独立的子进程中运行, 让 torch / mediapipe / openwakeword
+等计算密集的模块不再和其它模块争抢同一个 GIL。
+子进程里的模块代码无需任何修改: 它照常使用 EventBus().subscribe / publish,
+事件会在父子进程之间自动转发。
+
+使用方法:
+
+    from modules.EventBusIPC import ProcessTask
+    from modules.mod_voice_io import VoiceThread
+
+    robot.add_task(ProcessTask(VoiceThread))            # 原来是 robot.add_task(VoiceThread())
+    robot.add_task(ProcessTask(STTThread, config))      # 构造参数直接跟在后面
+
+实现:
+- 每个方向各有一个共享内存环形缓冲区 (SharedRing), 单进程内多线程写入时用线程锁串行化,
+  跨进程读写不加锁, 只用一个信号量通知 "有新消息" (信号量同时充当内存屏障)。
+- 小事件直接序列化进环形缓冲区;
+  大块数据 (PCM 音频, 摄像头画面, PIL 图像, numpy 数组) 单独放进一块 multiprocessing.shared_memory,
+  环形缓冲区里只传递它的名字, 接收方取出数据后立即释放这块共享内存。
+  共享内存在确认消息能放进环形缓冲区之后才创建; 对方进程退出后, 未读消息引用的共享内存由父进程释放,
+  不会遗留在 /dev/shm (内存) 中。
+- 环形缓冲区满时 (对方进程卡住) 只短暂等待一次, 之后直接丢弃并计数, 发布者不会被拖慢。
+- 子进程会把自己订阅的事件类型告诉父进程, 父进程只转发子进程关心的事件;
+  子进程发布的事件全部交给父进程, 由父进程的总线统一分发 (包括转发给其它子进程)。
+"""
+
+import io
+import logging
+import multiprocessing
+import pickle
+import secrets
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from .EventBus import WILDCARD, EventBus
+
+logger = logging.getLogger("跨进程总线")
+
+
+LARGE_PAYLOAD = 32 * 1024       # 超过该字节数的数据块通过独立的共享内存传递
+RING_SIZE = 1024 * 1024         # 每个方向环形缓冲区的默认容量
+SEND_TIMEOUT = 0.005            # 环形缓冲区刚满时最多等待的秒数; 一直满着时不再等待, 直接丢弃
+
+_HEAD = 0                       # 读位置 (只由消费者写), 与写位置分开在不同的缓存行
+_TAIL = 64                      # 写位置 (只由生产者写)
+_DATA = 128                     # 数据区起始偏移
+_WRAP = 0xFFFFFFFF              # 回绕标记: 数据区末尾剩余空间不够, 从头开始
+
+
+class SharedRing:
+    """
+    共享内存中的单生产者/单消费者环形缓冲区
+
+    消息格式: 4 字节长度 + 内容。读写位置都是单调递增的 64 位计数, 对容量取模得到实际偏移。
+    """
+
+    def __init__(self, size=RING_SIZE, name=None):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_DATA + size)
+            self.shm.buf[:_DATA] = bytes(_DATA)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.capacity = size
+        self.items = multiprocessing.Semaphore(0)     # 可读的消息数
+        self._write_lock = threading.Lock()
+
+    def __getstate__(self):
+        # 传给子进程时只传共享内存的名字和信号量, 子进程重新打开
+        return {"name": self.shm.name, "capacity": self.capacity, "items": self.items}
+
+    def __setstate__(self, state):
+        self.shm = shared_memory.SharedMemory(name=state["name"])
+        resource_tracker.unregister(self.shm._name, "shared_memory")     # 由父进程负责释放
+        self.owner = False
+        self.capacity = state["capacity"]
+        self.items = state["items"]
+        self._write_lock = threading.Lock()
+
+    def _load(self, offset):
+        return struct.unpack_from("<Q", self.shm.buf, offset)[0]
+
+    def _store(self, offset, value):
+        struct.pack_into("<Q", self.shm.buf, offset, value)
+
+    def put(self, payload, timeout=None, before_write=None):
+        """
+        写入一条消息; 缓冲区已满时等待消费者读取
+
+        param before_write: 确认有空间之后, 写入之前调用 (用于创建消息引用的共享内存,
+                            消息放不进来时就不会创建)
+        return: 是否写入成功, 等待超过 timeout 秒时放弃写入并返回 False
+        """
+        need = 4 + len(payload)
+        if need > self.capacity // 2:
+            raise ValueError(f"消息过大 ({len(payload)} 字节), 超过环形缓冲区容量的一半")
+        buf = self.shm.buf
+        with self._write_lock:
+            waited = 0
+            endtime = None if timeout is None else time.monotonic() + timeout
+            while True:
+                head, tail = self._load(_HEAD), self._load(_TAIL)
+                pos = tail % self.capacity
+                contiguous = self.capacity - pos
+                total = need if contiguous >= need else contiguous + need
+                if self.capacity - (tail - head) >= total:
+                    break
+                if endtime is not None and time.monotonic() >= endtime:
+                    return False
+                if waited == 1000:
+                    logger.warning("环形缓冲区已满, 对方进程可能已卡住")
+                waited += 1
+                time.sleep(0.001)
+            if before_write is not None:
+                before_write()
+            if contiguous < need:
+                if contiguous >= 4:
+                    struct.pack_into("<I", buf, _DATA + pos, _WRAP)
+                tail += contiguous
+                pos = 0
+            struct.pack_into("<I", buf, _DATA + pos, len(payload))
+            buf[_DATA + pos + 4:_DATA + pos + need] = payload
+            self._store(_TAIL, tail + need)
+        self.items.release()
+        return True
+
+    def get(self, timeout=None):
+        """读取一条消息; 超时返回 None"""
+        if not self.items.acquire(timeout=timeout):
+            return None
+        buf = self.shm.buf
+        head = self._load(_HEAD)
+        pos = head % self.capacity
+        contiguous = self.capacity - pos
+        size = struct.unpack_from("<I", buf, _DATA + pos)[0] if contiguous >= 4 else _WRAP
+        if size == _WRAP:
+            head += contiguous
+            pos = 0
+            size = struct.unpack_from("<I", buf, _DATA)[0]
+        payload = bytes(buf[_DATA + pos + 4:_DATA + pos + 4 + size])
+        self._store(_HEAD, head + 4 + size)
+        return payload
+
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _to_shared_memory(data, name=None):
+    """把一块数据拷贝进新建的共享内存, 返回共享内存的名字"""
+    shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, len(data)))
+    shm.buf[:len(data)] = data
+    name = shm.name
+    shm.close()
+    # 所有权交给接收方, 由它取出数据后释放; 发送方进程退出时不应再回收这块内存
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return name
+
+
+def _create_segments(blocks):
+    """创建 encode(message, blocks) 推迟创建的共享内存; 中途失败时释放已经创建的部分"""
+    created = []
+    try:
+        for name, data in blocks:
+            created.append(_to_shared_memory(data, name))
+    except BaseException:
+        for name in created:
+            _unlink(name)
+        raise
+
+
+def _unlink(name):
+    """释放一块不会再被读取的共享内存"""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _from_shared_memory(name, size):
+    """取出共享内存中的数据, 并释放这块共享内存"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+class _Pickler(pickle.Pickler):
+    """
+    大块数据不进入序列化流, 而是换成共享内存句柄
+
+    param blocks: None 表示立即创建共享内存; 传入列表时只分配名字, 把 (名字, 数据) 追加到列表中,
+                  由调用者在确认消息能够发出之后再用 _create_segments 创建
+    """
+
+    def __init__(self, file, protocol, blocks=None):
+        super().__init__(file, protocol=protocol)
+        self.blocks = blocks
+
+    def _share(self, data):
+        if self.blocks is None:
+            return _to_shared_memory(data)
+        name = "psm_" + secrets.token_hex(8)
+        self.blocks.append((name, data))
+        return name
+
+    def persistent_id(self, obj):
+        if isinstance(obj, (bytes, bytearray)):
+            if len(obj) >= LARGE_PAYLOAD:
+                return ("bytes", type(obj) is bytearray, self._share(obj), len(obj))
+        elif type(obj).__module__ == "numpy" and getattr(obj, "nbytes", 0) >= LARGE_PAYLOAD:
+            data = obj.tobytes()
+            return ("ndarray", obj.dtype.str, obj.shape, self._share(data), len(data))
+        elif type(obj).__module__.startswith("PIL.") and hasattr(obj, "tobytes") and hasattr(obj, "mode"):
+            data = obj.tobytes()
+            if len(data) >= LARGE_PAYLOAD:
+                return ("image", obj.mode, obj.size, self._share(data), len(data))
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == "bytes":
+            _, is_bytearray, name, size = pid
+            data = _from_shared_memory(name, size)
+            return bytearray(data) if is_bytearray else data
+        if kind == "ndarray":
+            import numpy as np
+            _, dtype, shape, name, size = pid
+            return np.frombuffer(bytearray(_from_shared_memory(name, size)), dtype=dtype).reshape(shape)
+        if kind == "image":
+            from PIL import Image
+            _, mode, image_size, name, size = pid
+            return Image.frombytes(mode, image_size, _from_shared_memory(name, size))
+        raise pickle.UnpicklingError(f"未知的共享内存句柄: {kind}")
+
+
+class _Discarder(pickle.Unpickler):
+    """丢弃一条消息: 不取出数据, 只释放它引用的共享内存"""
+
+    def persistent_load(self, pid):
+        _unlink(pid[-2])
+        return None
+
+
+def encode(message, blocks=None):
+    buffer = io.BytesIO()
+    _Pickler(buffer, pickle.HIGHEST_PROTOCOL, blocks).dump(message)
+    return buffer.getvalue()
+
+
+def decode(payload):
+    return _Unpickler(io.BytesIO(payload)).load()
+
+
+def discard_pending(ring):
+    """
+    丢弃环形缓冲区中不会再有人读取的消息 (对方进程已退出), 释放它们引用的共享内存
+
+    return: 丢弃的消息数
+    """
+    count = 0
+    while True:
+        payload = ring.get(timeout=0)
+        if payload is None:
+            return count
+        count += 1
+        try:
+            _Discarder(io.BytesIO(payload)).load()
+        except Exception:
+            logger.error("释放未读消息的共享内存失败", exc_info=True)
+
+
+class Bridge:
+    """
+    总线桥接: 连接本进程的 EventBus 和另一个进程
+
+    param forward_all: True 表示本进程发布的所有事件都转发给对方 (子进程一侧),
+                       False 表示只转发对方订阅过的事件 (父进程一侧)
+    param peer: 对方进程 (父进程一侧传入子进程), 它退出后桥接自动断开, 不再向它转发事件
+    """
+
+    def __init__(self, event_bus, send_ring, recv_ring, name, forward_all, peer=None):
+        self.event_bus = event_bus
+        self.send_ring = send_ring
+        self.recv_ring = recv_ring
+        self.name = name
+        self.forward_all = forward_all
+        self.peer = peer
+        self.dropped = 0                    # 因环形缓冲区已满而丢弃的消息数
+        self._congested = False             # 上一条消息是否因缓冲区已满被丢弃
+        self.remote_types = frozenset()     # 对方订阅的事件类型 (含 "LED_*" 这样的前缀订阅), 写时复制
+        self._routes = {}                   # 事件类型 -> 是否需要转发, 对方订阅变化时清空
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._receive_loop, daemon=True, name=f"{name}-桥接")
+
+    def start(self):
+        self._drain()                       # 先处理对方已经发来的订阅通知, 再接入总线
+        self.event_bus.attach_bridge(self)
+        self._thread.start()
+
+    def stop(self):
+        self.event_bus.detach_bridge(self)
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+    # ---- 由 EventBus 调用 ----
+    def announce(self, event_type):
+        if self.forward_all:
+            self._send(("sub", event_type))
+
+    def withdraw(self, event_type):
+        if self.forward_all:
+            self._send(("unsub", event_type))
+
+    def forward(self, event):
+        if self.forward_all or self._wanted(event["type"]):
+            self._send(("event", event["type"], event["data"], event["source"]))
+
+    def _wanted(self, event_type):
+        routes = self._routes
+        wanted = routes.get(event_type)
+        if wanted is None:
+            remote_types = self.remote_types
+            wanted = event_type in remote_types or any(
+                event_type[:end] + WILDCARD in remote_types for end in range(len(event_type) + 1)
+            )
+            routes[event_type] = wanted
+        return wanted
+
+    # ---- 内部实现 ----
+    def _send(self, message):
+        # 大块数据的共享内存在确认消息能放进环形缓冲区之后才创建, 发送失败时不会遗留
+        blocks = []
+        try:
+            payload = encode(message, blocks)
+            # 对方卡住时缓冲区会一直满着: 只在刚满时短暂等待, 之后直接丢弃, 不拖慢发布者
+            timeout = 0 if self._congested else SEND_TIMEOUT
+            sent = self.send_ring.put(payload, timeout, before_write=lambda: _create_segments(blocks))
+        except Exception:
+            logger.error(f"{self.name} 转发消息失败: {message[:2]}", exc_info=True)
+            return
+        self._congested = not sent
+        if not sent:
+            self.dropped += 1
+            # 只在第 1, 100, 200... 次丢弃时打印, 避免刷屏
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(f"{self.name} 环形缓冲区已满, 累计丢弃 {self.dropped} 条消息: {message[:2]}")
+            self._check_peer()
+
+    def _check_peer(self):
+        """对方进程已退出时断开桥接; 返回对方是否还在运行"""
+        if self.peer is None or self.peer.is_alive():
+            return True
+        if not self._stop_event.is_set():
+            logger.warning(f"{self.name} 进程已退出 (exitcode={self.peer.exitcode}), 断开桥接")
+            self.stop()
+            # 对方不会再读取发给它的消息, 释放这些消息引用的共享内存
+            discard_pending(self.send_ring)
+        return False
+
+    def _handle(self, message):
+        kind = message[0]
+        if kind == "event":
+            _, event_type, data, source = message
+            self.event_bus._dispatch({"type": event_type, "data": data, "source": source}, origin=self)
+        elif kind == "sub":
+            self.remote_types = self.remote_types | {message[1]}
+            self._routes = {}
+        elif kind == "unsub":
+            self.remote_types = self.remote_types - {message[1]}
+            self._routes = {}
+
+    def _drain(self):
+        while True:
+            payload = self.recv_ring.get(timeout=0)
+            if payload is None:
+                return
+            self._handle(decode(payload))
+
+    def _receive_loop(self):
+        while not self._stop_event.is_set():
+            payload = self.recv_ring.get(timeout=0.5)
+            if payload is None:
+                self._check_peer()
+                continue
+            try:
+                self._handle(decode(payload))
+            except Exception:
+                logger.error(f"{self.name} 处理消息失败", exc_info=True)
+
+
+class ProcessTask(multiprocessing.Process):
+    """
+    在独立进程中运行一个 threading.Thread 模块
+
+    对 DeskRobot 来说它和普通的模块线程一样: 支持 start() / join() / is_alive() / name。
+    """
+
+    def __init__(self, module_class, *args, ring_size=RING_SIZE, **kwargs):
+        super().__init__(daemon=True, name=module_class.__name__)
+        self.module_class = module_class
+        self.module_args = args
+        self.module_kwargs = kwargs
+        self.to_child = SharedRing(ring_size)
+        self.to_parent = SharedRing(ring_size)
+        self.bridge = None
+
+    def start(self):
+        # 先启动子进程, 再接入父进程一侧的桥接: 子进程在此之前发出的订阅通知和事件都留在
+        # 环形缓冲区里, 桥接接入总线前先处理已到达的订阅通知, 之后由接收线程继续处理
+        self.bridge = Bridge(EventBus(), self.to_child, self.to_parent, self.name, forward_all=False, peer=self)
+        super().start()
+        self.bridge.start()
+        logger.info(f"{self.name} 已在子进程 {self.pid} 中启动")
+
+    def run(self):
+        """子进程入口"""
+        EventBus._instance = None           # fork 出的子进程不能沿用父进程的订阅表
+        event_bus = EventBus()
+        bridge = Bridge(event_bus, self.to_parent, self.to_child, self.name, forward_all=True)
+        bridge.start()
+        try:
+            module = self.module_class(*self.module_args, **self.module_kwargs)
+            module.start()
+            module.join()
+        finally:
+            bridge.stop()
+
+    def join(self, timeout=None):
+        super().join(timeout)
+        if self.exitcode is not None and self.bridge is not None:
+            self.bridge.stop()
+            self.bridge = None
+            # 两个方向上都不会再有人读取的消息: 释放它们引用的共享内存, 避免遗留在 /dev/shm 中
+            dropped = discard_pending(self.to_child) + discard_pending(self.to_parent)
+            if dropped:
+                logger.info(f"{self.name} 退出时丢弃了 {dropped} 条未读消息")
+            self.to_child.close()
+            self.to_parent.close()
@@ -0,0 +1,319 @@
+"""
+事件记录器 (飞行记录仪)
+
+始终在后台记录消息总线上最近一段时间的事件, 内存占用固定;
+机器人出现异常时, 把记录下来的事件保存为二进制文件, 之后可以离线查看或按原速/加速回放。
+
+使用方法:
+
+# 记录 (DeskRobot 启动时已自动创建)
+    recorder = EventRecorder(window=30, max_events=20000)    # 保留最近 30 秒, 最多 20000 条事件
+    recorder.install_crash_hooks("localfiles/crash_events.evrec")  # 任意线程未捕获异常时自动保存
+    recorder.dump("localfiles/events.evrec")                 # 手动保存
+    event_bus.publish("DUMP_EVENTS", {"path": "localfiles/events.evrec"})  # 通过事件保存 (path 可不填)
+
+# 回放 (例如: 单独启动 OLED 模块, 再回放现场录下的事件, 离线分析性能)
+    replayer = EventReplayer("localfiles/events.evrec", speed=4)   # 4 倍速, speed=0 表示不等待
+    replayer.run()
+
+# 命令行查看记录文件
+    python -m modules.EventRecorder localfiles/events.evrec
+
+记录内容:
+- 每条事件的单调时钟时间戳 (time.monotonic), 类型, 发布人, 数据
+- 大块数据 (PCM 音频, 图像, 数组) 不保存内容, 只保存一个 PayloadRef:
+  bytes 记录长度和 CRC32, 图像和数组记录模式/形状。回放时用同样大小的空白数据代替。
+"""
+
+import argparse
+import collections
+import logging
+import os
+import pickle
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+if __name__ != '__main__':
+    from .EventBus import EventBus, WILDCARD, summarize
+
+logger = logging.getLogger("事件记录器")
+
+
+MAGIC = b"EVREC\x00"
+VERSION = 1
+LARGE_PAYLOAD = 4096            # 超过该字节数的数据只记录引用
+DUMP_EVENT = "DUMP_EVENTS"
+
+
+class PayloadRef:
+    """大块数据的引用: 只记录类型, 大小和校验值"""
+    __slots__ = ("kind", "nbytes", "crc", "shape", "fmt")
+
+    def __init__(self, kind, nbytes, crc=None, shape=None, fmt=None):
+        self.kind = kind            # "bytes" / "bytearray" / "ndarray" / "image"
+        self.nbytes = nbytes        # 字节数
+        self.crc = crc              # bytes 类数据的 CRC32
+        self.shape = shape          # 数组形状或图像尺寸
+        self.fmt = fmt              # 数组 dtype 或图像模式
+
+    def __getstate__(self):
+        return (self.kind, self.nbytes, self.crc, self.shape, self.fmt)
+
+    def __setstate__(self, state):
+        self.kind, self.nbytes, self.crc, self.shape, self.fmt = state
+
+    def __repr__(self):
+        if self.kind in ("bytes", "bytearray"):
+            return f"<{self.kind} {self.nbytes} crc={self.crc:08x}>"
+        return f"<{self.kind} {self.fmt} {self.shape}>"
+
+    def placeholder(self):
+        """生成与原数据同样大小的空白数据, 供回放使用"""
+        if self.kind == "bytes":
+            return bytes(self.nbytes)
+        if self.kind == "bytearray":
+            return bytearray(self.nbytes)
+        if self.kind == "ndarray":
+            import numpy as np
+            return np.zeros(self.shape, dtype=self.fmt)
+        if self.kind == "image":
+            from PIL import Image
+            return Image.new(self.fmt, self.shape)
+        return None
+
+
+def reduce_payload(value):
+    """
+    把大块数据替换为 PayloadRef, 只处理 data 字典的第一层 (与现有事件的结构一致)
+
+    字典总是返回浅拷贝: 发布者之后修改或复用自己的字典时, 不影响已经记录的事件
+    """
+    if isinstance(value, dict):
+        reduced = dict(value)
+        for key, item in value.items():
+            ref = _payload_ref(item)
+            if ref is not None:
+                reduced[key] = ref
+        return reduced
+    ref = _payload_ref(value)
+    return value if ref is None else ref
+
+
+def _payload_ref(value):
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) >= LARGE_PAYLOAD:
+            return PayloadRef(type(value).__name__, len(value), zlib.crc32(value))
+    elif hasattr(value, "shape") and hasattr(value, "dtype"):      # numpy 数组
+        if value.nbytes >= LARGE_PAYLOAD:
+            return PayloadRef("ndarray", value.nbytes, shape=tuple(value.shape), fmt=value.dtype.str)
+    elif hasattr(value, "mode") and hasattr(value, "size") and hasattr(value, "tobytes"):   # PIL 图像
+        return PayloadRef("image", None, shape=tuple(value.size), fmt=value.mode)
+    return None
+
+
+class _Tap(queue.Queue):
+    """挂在总线上的 "收件箱": 事件一放入就交给记录器, 本身不保存任何事件"""
+
+    def __init__(self, recorder):
+        super().__init__()
+        self.recorder = recorder
+
+    def put(self, item, block=True, timeout=None):
+        self.recorder.record(item)
+
+    def _qsize(self):
+        return 0
+
+
+class EventRecorder:
+    """
+    环形事件记录器
+
+    param window: 保留最近多少秒的事件
+    param max_events: 最多保留的事件数, 与 window 一起决定内存上限
+    """
+
+    def __init__(self, window=30.0, max_events=20000, event_bus=None):
+        self.window = window
+        self.events = collections.deque(maxlen=max_events)     # (时间戳, 类型, 发布人, 数据)
+        self.recorded = 0                                       # 累计记录的事件数
+        self.started = (time.time(), time.monotonic())          # 用于把单调时钟换算成日期
+        self._dump_lock = threading.Lock()
+        self._tap = _Tap(self)
+        self.event_bus = event_bus or EventBus()
+        self.event_bus.subscribe(WILDCARD, self._tap, "事件记录器", passive=True)
+
+    def record(self, event):
+        """记录一条事件 (在发布者线程中调用, 只做常数时间的工作)"""
+        now = time.monotonic()
+        events = self.events
+        events.append((now, event["type"], event["source"], reduce_payload(event["data"])))
+        self.recorded += 1
+        # 丢弃超出时间窗口的旧事件
+        horizon = now - self.window
+        try:
+            while events[0][0] < horizon:
+                events.popleft()
+        except IndexError:              # 其它发布者线程同时在清理
+            pass
+        if event["type"] == DUMP_EVENT:
+            data = event["data"] if isinstance(event["data"], dict) else {}
+            path = data.get("path", "localfiles/events.evrec")
+            threading.Thread(target=self.dump, args=(path,), daemon=True, name="事件记录器-保存").start()
+
+    def stop(self):
+        self.event_bus.unsubscribe(WILDCARD, self._tap, "事件记录器")
+
+    def snapshot(self):
+        """返回当前记录的事件列表 (拷贝)"""
+        while True:
+            try:
+                return list(self.events)
+            except RuntimeError:        # 复制过程中其它线程修改了 deque, 重试
+                continue
+
+    def dump(self, path):
+        """
+        把当前记录的事件保存为二进制文件
+
+        文件格式: MAGIC + 头部 (版本, 起始时间) + zlib 压缩的事件流,
+        每条事件为 4 字节长度 + pickle 数据; 无法序列化的数据会被替换为 summarize() 生成的文本。
+        """
+        events = self.snapshot()
+        body = bytearray()
+        for record in events:
+            try:
+                payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                timestamp, event_type, source, data = record
+                payload = pickle.dumps((timestamp, event_type, str(source), summarize(data)),
+                                       protocol=pickle.HIGHEST_PROTOCOL)
+            body += struct.pack("<I", len(payload)) + payload
+        wall, mono = self.started
+        header = MAGIC + struct.pack("<Bdd", VERSION, wall, mono)
+        with self._dump_lock:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(header + zlib.compress(bytes(body)))
+        logger.info(f"已保存最近 {len(events)} 条事件到 {path}")
+        return len(events)
+
+    def install_crash_hooks(self, path="localfiles/crash_events.evrec"):
+        """任意线程出现未捕获的异常时, 自动保存事件记录"""
+        previous_excepthook = sys.excepthook
+        previous_thread_hook = threading.excepthook
+
+        def excepthook(exc_type, exc_value, exc_traceback):
+            self._dump_on_crash(path)
+            previous_excepthook(exc_type, exc_value, exc_traceback)
+
+        def thread_excepthook(args):
+            self._dump_on_crash(path)
+            previous_thread_hook(args)
+
+        sys.excepthook = excepthook
+        threading.excepthook = thread_excepthook
+
+    def _dump_on_crash(self, path):
+        try:
+            self.dump(path)
+        except Exception:
+            logger.error("异常时保存事件记录失败", exc_info=True)
+
+
+def load(path):
+    """
+    读取事件记录文件
+
+    事件用 pickle 保存, 读取时会执行文件中的任意代码: 只能读取自己或可信来源生成的 .evrec 文件
+
+    return: (起始时间 (wall, monotonic), [(时间戳, 类型, 发布人, 数据), ...])
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.startswith(MAGIC):
+        raise ValueError(f"{path} 不是事件记录文件")
+    offset = len(MAGIC)
+    version, wall, mono = struct.unpack_from("<Bdd", content, offset)
+    if version != VERSION:
+        raise ValueError(f"不支持的事件记录文件版本: {version}")
+    body = zlib.decompress(content[offset + struct.calcsize("<Bdd"):])
+    events = []
+    position = 0
+    while position < len(body):
+        size = struct.unpack_from("<I", body, position)[0]
+        position += 4
+        events.append(pickle.loads(body[position:position + size]))
+        position += size
+    return (wall, mono), events
+
+
+class EventReplayer:
+    """
+    按记录时的节奏重新发布事件
+
+    param speed: 回放倍速, 1 为原速, 0 表示不等待, 尽快发布
+    param event_types: 只回放这些类型的事件, None 表示全部 (EXIT 和 DUMP_EVENTS 始终跳过)
+    param placeholders: 用同样大小的空白数据代替被省略的大块数据; 为 False 时直接发布 PayloadRef
+    """
+
+    def __init__(self, path, speed=1.0, event_types=None, placeholders=True, event_bus=None):
+        self.started, self.events = load(path)
+        self.speed = speed
+        self.event_types = None if event_types is None else {t.upper() for t in event_types}
+        self.placeholders = placeholders
+        self.event_bus = event_bus or EventBus()
+
+    def _restore(self, data):
+        if not self.placeholders:
+            return data
+        if isinstance(data, PayloadRef):
+            return data.placeholder()
+        if isinstance(data, dict) and any(isinstance(v, PayloadRef) for v in data.values()):
+            return {k: v.placeholder() if isinstance(v, PayloadRef) else v for k, v in data.items()}
+        return data
+
+    def run(self, stop_event=None):
+        """回放全部事件, 返回发布的事件数"""
+        if not self.events:
+            return 0
+        published = 0
+        first = self.events[0][0]
+        begin = time.monotonic()
+        for timestamp, event_type, source, data in self.events:
+            if stop_event is not None and stop_event.is_set():
+                break
+            if event_type in ("EXIT", DUMP_EVENT):
+                continue
+            if self.event_types is not None and event_type not in self.event_types:
+                continue
+            if self.speed:
+                delay = begin + (timestamp - first) / self.speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            self.event_bus.publish(event_type, self._restore(data), source)
+            published += 1
+        return published
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="查看事件记录文件")
+    parser.add_argument("path", help="事件记录文件路径")
+    parser.add_argument("--limit", type=int, default=0, help="只显示最后 N 条事件")
+    args = parser.parse_args()
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from modules.EventBus import summarize
+    (wall, mono), events = load(args.path)
+    counts = collections.Counter(event[1] for event in events)
+    print(f"共 {len(events)} 条事件")
+    for event_type, count in counts.most_common():
+        print(f"  {event_type:<28} {count}")
+    for timestamp, event_type, source, data in events[-args.limit:] if args.limit else events:
+        clock = time.strftime("%H:%M:%S", time.localtime(wall + timestamp - mono))
+        print(f"{clock}.{int(timestamp * 1000) % 1000:03d}  {source} 发布了 {event_type}: {summarize(data)}")
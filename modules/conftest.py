@@ -0,0 +1,25 @@
+"""
+pytest 公共配置
+
+把仓库根目录加入 sys.path, 测试统一以包路径 (modules.xxx) 导入被测模块,
+这样使用相对导入的模块 (例如 API_OLED/text_renderer.py) 也能直接测试。
+"""
+
+import os
+import sys
+
+import pytest
+from PIL import ImageFont
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def font_path(tmp_path_factory):
+    """Pillow 内置的 TrueType 字体写成的字体文件, 文本相关的测试不依赖系统中安装的字体"""
+    font = ImageFont.load_default(16)
+    if not isinstance(font, ImageFont.FreeTypeFont):
+        pytest.skip("需要 FreeType")
+    path = tmp_path_factory.mktemp("fonts") / "default.ttf"
+    path.write_bytes(font.path.getvalue())
+    return str(path)
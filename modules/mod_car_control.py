@@ -1,11 +1,10 @@
 if __name__ != '__main__':
-    from .EventBus import EventBus
+    from .EventBus import EventBus, EventQueue
     from .API_CAR.Servo import HeadServo
     from .API_CAR.LED import RGB
     from .API_CAR.Car import Car
 
 
-from queue import Queue
 import threading
 import logging
 
@@ -18,15 +17,15 @@ class CarControl(threading.Thread):
         self.rgb = RGB(10, 9, 11)            # LED灯接口
         self.head = HeadServo()              # 头部舵机接口
 
-        self.event_queue = Queue()
+        self.event_queue = EventQueue()
         self.event_bus = EventBus()
         self._stop_event = threading.Event()
 
         self.event_bus.subscribe("EXIT", self.event_queue, self.name)
         self.event_bus.subscribe("CAR_SPEED", self.event_queue, self.name)
-        self.event_bus.subscribe("CAR_STEER", self.event_queue, self.name)
+        self.event_bus.subscribe("CAR_STEER", self.event_queue, self.name, conflate=True)   # 摇杆数据只保留最新值
         self.event_bus.subscribe("HEAD_NOD", self.event_queue, self.name)
-        self.event_bus.subscribe("HEAD_ANGLE", self.event_queue, self.name)
+        self.event_bus.subscribe("HEAD_ANGLE", self.event_queue, self.name, conflate=True)
         self.event_bus.subscribe("LED_ON", self.event_queue, self.name)
         self.event_bus.subscribe("LED_OFF", self.event_queue, self.name)
         self.event_bus.subscribe("LED_FLASH", self.event_queue, self.name)
@@ -5,7 +5,7 @@ if __name__ != '__main__':
     
     from .API_Camera.FaceDetector import FaceDetector
     from .API_Camera.PiCamera import PiCamera
-    from .EventBus import EventBus
+    from .EventBus import EventBus, EventQueue
     from .API_CAR.Servo import HeadServo
     from .API_CAR.Car import Car
 
@@ -42,7 +42,6 @@ class FilteredPID(PID):
 
 
 import threading
-import queue
 import logging
 from time import sleep
 logger = logging.getLogger("人脸追踪") # 日志工具
@@ -53,7 +52,7 @@ HEIGHT = 480
 class FaceTrack(threading.Thread):
     def __init__(self):
         super().__init__(daemon=True, name="人脸追踪")
-        self.event_queue = queue.Queue()     # 事件队列
+        self.event_queue = EventQueue()      # 事件队列
         self.event_bus = EventBus()          # 事件总线
         self.car = Car()                     # 小车接口
         self.head = HeadServo()              # 舵机接口
@@ -73,7 +72,7 @@ class FaceTrack(threading.Thread):
         self.event_bus.subscribe("EXIT", self.event_queue, self.name)
         self.event_bus.subscribe("FACE_TRACK_ON", self.event_queue, self.name)
         self.event_bus.subscribe("FACE_TRACK_OFF", self.event_queue, self.name)
-        self.event_bus.subscribe("FACE_RECT", self.event_queue, self.name)
+        self.event_bus.subscribe("FACE_RECT", self.event_queue, self.name, conflate=True)  # 只关心最新的人脸位置
 
     def trackloop(self):
         """人脸追踪循环"""
@@ -142,7 +141,7 @@ class FaceTrack(threading.Thread):
 if __name__ == '__main__':
     from API_Camera.FaceDetector import FaceDetector
     from API_Camera.PiCamera import PiCamera
-    from EventBus import EventBus
+    from EventBus import EventBus, EventQueue
     from API_CAR.Servo import HeadServo
     from API_CAR.Car import Car
 
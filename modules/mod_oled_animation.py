@@ -17,6 +17,7 @@ import queue
 import threading
 import time
 
+from .API_OLED.frame_clock import FrameClock
 from .API_OLED.oled_animation_api import OledAnimationAPI
 from .EventBus import EventBus
 
@@ -29,10 +30,13 @@ class ThinkingAnimationThread(threading.Thread):
         self.event_bus = EventBus()
         self.api = OledAnimationAPI(width, height)
         self._stop_event = threading.Event()
+        self.frame_rate = frame_rate
         self.frame_interval = 1.0 / frame_rate
+        self.frame_clock = FrameClock.get_instance()    # 与 OLED 合成线程同步的帧时钟
 
         self.is_active = False
         self.frame_index = 0
+        self.start_time = 0.0
 
         self.event_queue = queue.Queue()
         self.event_bus.subscribe("START_AI_THINKING", self.event_queue, self.name)
@@ -43,12 +47,13 @@ class ThinkingAnimationThread(threading.Thread):
         logger.info(f"{self.name} 启动")
         self.event_bus.publish("THREAD_STARTED", self.name)
 
+        frame_time = time.monotonic()
         while not self._stop_event.is_set():
-            start_time = time.monotonic()
-
             self.handle_events()
 
             if self.is_active:
+                # 帧序号按时间计算, 帧时钟降低帧率时动画速度不变
+                self.frame_index = max(0, int((frame_time - self.start_time) * self.frame_rate))
                 image = self.api.get_thinking_spinner_frame(self.frame_index)
                 self.event_bus.publish(
                     "UPDATE_LAYER",
@@ -61,12 +66,8 @@ class ThinkingAnimationThread(threading.Thread):
                         "duration": None,  # 动画由事件控制，不自动过期
                     }
                 )
-                self.frame_index += 1
 
-            elapsed_time = time.monotonic() - start_time
-            sleep_time = self.frame_interval - elapsed_time
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            frame_time = self.frame_clock.wait(self._stop_event, fps=self.frame_rate)
 
         logger.info(f"{self.name} 已停止。")
 
@@ -80,6 +81,7 @@ class ThinkingAnimationThread(threading.Thread):
                     logger.info("接收到 START_AI_THINKING，开始动画。")
                     self.is_active = True
                     self.frame_index = 0
+                    self.start_time = time.monotonic()
 
                 elif event_type == "STOP_AI_THINKING":
                     logger.info("接收到 STOP_AI_THINKING，停止动画并删除图层。")
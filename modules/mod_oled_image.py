@@ -7,10 +7,11 @@ subscribe:
     - data格式:
   {
     "layer_id": str,  # 图层唯一标识符
-    "image": PIL.Image.Image,  # 要显示的图像
+    "image": PIL.Image.Image,  # 要显示的图像, 也可以是 (高, 宽) 的布尔数组 (numpy.ndarray)
     "z_index": int,  # 图层的Z轴索引
     "position": tuple,  # 图像在屏幕上的位置 (x, y)
-    "duration": int  # 图像显示的持续时间（秒）
+    "duration": int,  # 图像显示的持续时间（秒）
+    "opaque": bool  # 可选, 为 True 时图层矩形范围内先清空下层内容再绘制, 默认与下层按位或
   }
 - SET_LAYER_VISIBILITY: 设置图层可见性
     - data格式:
@@ -32,22 +33,28 @@ import queue
 import threading
 import time
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 if __name__ != "__main__":
     from .API_OLED.OLED_API import OLED
-    from .EventBus import EventBus
+    from .API_OLED.frame_clock import FrameClock
+    from .API_OLED.framebuffer import image_size, pack_image, pack_rect, pages_shape, unpack_pages
+    from .EventBus import EventBus, EventQueue
 
 logger = logging.getLogger("OLED模块")
 
+IDLE_WAKEUP = 1.0   # 没有任何事件和待过期图层时, 最长阻塞时间 (秒), 用于响应 stop()
+
 
 class Layer:
-    def __init__(self, image, z_index, position, duration=None):
+    def __init__(self, image, z_index, position, duration=None, opaque=False):
         """
         图层类，用于管理显示的图像、位置和持续时间。
-        param image: PIL.Image.Image - 要显示的图像。
+        param image: PIL.Image.Image 或 (高, 宽) 的布尔数组 - 要显示的图像。
         param z_index: int - 图层的Z轴索引，决定图像的显示顺序。
         param position: tuple - 图像在屏幕上的位置，格式为 (x, y)。
         param duration: int - 图像显示的持续时间（秒），如果为 None，则永久显示。
+        param opaque: bool - 为 True 时遮挡下层图层在本图层矩形范围内的内容。
         例如：Layer(image, z_index=1, position=(0, 0), duration=5)
         这将创建一个图层，显示在屏幕左上角 (0, 0)，Z轴索引为1，持续时间为5秒。
         """
@@ -55,23 +62,58 @@ class Layer:
         self.z_index = z_index
         self.position = position
         self.visible = True
-        self.expiry_time = time.time() + duration if duration else None
-
-    def update(self, image, z_index=None, position=None, duration=None):
+        self.opaque = opaque
+        self.expiry_time = time.monotonic() + duration if duration else None
+        self._packed = None     # 页格式的 (像素, 遮罩), 图像或位置变化后重新生成
+        self._content = _content(image)  # 图像内容, 用于识别内容相同的重复帧
+
+    def packed(self, width, height):
+        """返回图层在整屏上的页格式像素和遮罩 (非不透明图层的遮罩为 None), 每次更新后只转换一次"""
+        if self._packed is None:
+            bits = pack_image(self.image, self.position, width, height)
+            mask = None
+            if self.opaque:
+                mask = pack_rect((*self.position, *image_size(self.image)), width, height)
+            self._packed = (bits, mask)
+        return self._packed
+
+    def update(self, image, z_index=None, position=None, duration=None, opaque=None):
         """
         更新图层的属性。
-        param image: PIL.Image.Image - 新的图像。
+        param image: PIL.Image.Image 或 (高, 宽) 的布尔数组 - 新的图像。
         param z_index: int - 新的Z轴索引，默认为当前值。
         param position: tuple - 新的位置，格式为 (x, y)，默认为当前位置。
         param duration: int - 新的持续时间（秒），默认为当前值。
+        return: bool - 画面是否有变化; 内容, 位置和 Z 轴都没变的重复帧返回 False, 无需重新合成
         """
+        if duration is not None:
+            self.expiry_time = time.monotonic() + duration
+        content = _content(image)
+        changed = (content != self._content
+                   or (z_index is not None and z_index != self.z_index)
+                   or (position is not None and tuple(position) != tuple(self.position))
+                   or (opaque is not None and opaque != self.opaque))
         self.image = image
+        if not changed:
+            return False
+        self._content = content
+        self._packed = None
         if z_index is not None:
             self.z_index = z_index
         if position is not None:
             self.position = position
-        if duration is not None:
-            self.expiry_time = time.time() + duration
+        if opaque is not None:
+            self.opaque = opaque
+        return True
+
+
+def _content(image):
+    """图像内容的指纹 (模式, 尺寸, 像素字节); 128x64 的 "1" 模式图像只有 1 KB, 比较的开销可以忽略"""
+    if image is None:
+        return None
+    if isinstance(image, np.ndarray):
+        return image.dtype.str, image.shape, image.tobytes()
+    return image.mode, image.size, image.tobytes()
 
 
 class OLEDThread(threading.Thread):
@@ -82,12 +124,20 @@ class OLEDThread(threading.Thread):
         fps=50,
         i2c_address=0x3C,
         is_simulation=False,
+        frame_clock=None,
     ):
+        """
+        param fps: 最高帧率
+        param frame_clock: 帧时钟, 默认使用与各个图层生产者共用的单例; 两种情况下都按 fps 设置它的最高帧率
+                           (单例可能已经被先启动的生产者以默认帧率创建)
+        """
         super().__init__(daemon=True)
         self.width = width
         self.height = height
         self.fps = fps
-        self.frame_duration = 1.0 / fps
+        # 与各个图层生产者共用的帧时钟, 会根据发送耗时和系统负载自动降低帧率
+        self.frame_clock = frame_clock if frame_clock is not None else FrameClock.get_instance()
+        self.frame_clock.set_fps(fps)
 
         self.oled_device = OLED.get_instance(
             width=width,
@@ -96,39 +146,56 @@ class OLEDThread(threading.Thread):
             is_simulation=is_simulation,
         )
         self.layers = {}  # 存储所有图层，用 layer_id 作为 key
+        self._z_order = None  # 按 z_index 排好序的图层列表, 图层增删或 z_index 变化时置为 None
+        self._frame = np.zeros(pages_shape(width, height), dtype=np.uint8)  # 复用的页格式帧缓冲
         self.event_bus = EventBus()
-        self.event_queue = queue.Queue()  # 用于接收来自事件监听器的请求
+        self.event_queue = EventQueue()  # 用于接收来自事件监听器的请求
         self.needs_render = threading.Event()  # 用于通知渲染线程需要重新合成
         self._stop_event = threading.Event()
 
-        self.event_bus.subscribe("UPDATE_LAYER", self.event_queue, "OLED模块")
+        # 同一图层只保留最新一帧, 渲染卡顿时不会积压过期画面
+        self.event_bus.subscribe("UPDATE_LAYER", self.event_queue, "OLED模块", conflate="layer_id")
         self.event_bus.subscribe("SET_LAYER_VISIBILITY", self.event_queue, "OLED模块")
         self.event_bus.subscribe("DELETE_LAYER", self.event_queue, "OLED模块")
         self.event_bus.subscribe("EXIT", self.event_queue, "OLED模块")
 
     def run(self):
-        """线程主循环"""
-        last_render_time = 0
+        """
+        线程主循环
+
+        平时阻塞在收件箱上, 不轮询; 等待的最长时间由 "下一帧可以渲染的时刻" (有待渲染的变化时)
+        和 "最近一个图层的过期时刻" 决定。只有画面有变化时才渲染, 渲染时刻对齐帧时钟的网格
+        (生产者在网格点上发布图像, 合成稍晚一点, 同一帧的各图层一起显示), 并把发送耗时报告给帧时钟。
+        """
+        last_render_time = None
+        render_at = None        # 有待渲染的变化时, 下一次合成的时刻
         while not self._stop_event.is_set():
             try:
-                self._check_expirations()
-                self._process_event_queue()
-
-                # 如果有渲染需求且达到了帧率要求
-                if self.needs_render.is_set() and (
-                    time.time() - last_render_time > self.frame_duration
-                ):
-                    self.needs_render.clear()  # 重置事件
+                now = time.monotonic()
+                self._check_expirations(now)
+
+                if self.needs_render.is_set():
+                    if render_at is None:
+                        render_at = self.frame_clock.render_time(now, last_render_time)
+                    if now >= render_at:
+                        self.needs_render.clear()  # 重置事件
+
+                        # 直接发送页格式的帧缓冲, 屏幕驱动只传输与上一帧不同的部分
+                        self.oled_device.display_pages(self._composite_pages())
+                        self.frame_clock.report_display(time.monotonic() - now)
+                        last_render_time = render_at    # 按计划时刻记录, 醒来的延迟不会让下一帧错过网格点
+                        render_at = None
+                        continue
+
+                # 计算可以阻塞等待的时间
+                deadline = now + IDLE_WAKEUP
+                if render_at is not None:
+                    deadline = min(deadline, render_at)
+                next_expiry = self._next_expiry()
+                if next_expiry is not None:
+                    deadline = min(deadline, next_expiry)
+                self._process_event_queue(max(0.0, deadline - now))
 
-                    final_frame = self._composite_layers()
-                    self.oled_device.display_image(final_frame)
-                    last_render_time = time.time()
-
-                # 短暂休眠，避免CPU占用过高
-                time.sleep(0.01)
-
-            except queue.Empty:
-                continue
             except Exception as e:
                 logger.error(f"OLEDThread 发生错误: {e}", exc_info=True)
 
@@ -138,10 +205,13 @@ class OLEDThread(threading.Thread):
         self._stop_event.set()
         logger.info("OLEDThread 已停止。")
 
-    def _process_event_queue(self):
-        # 处理队列中的所有待办事项
-        while not self.event_queue.empty():
-            event = self.event_queue.get()
+    def _process_event_queue(self, timeout=0.0):
+        """最多等待 timeout 秒, 收到事件后处理队列中的所有待办事项"""
+        try:
+            event = self.event_queue.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
             # event["type"] & event["data"]  # 获取事件类型和负载
             if event["type"] == "UPDATE_LAYER":
                 layer_id = event["data"]["layer_id"]
@@ -149,13 +219,19 @@ class OLEDThread(threading.Thread):
                 z_index = event["data"]["z_index"]
                 position = event["data"]["position"]
                 duration = event["data"].get("duration")
-
-                if layer_id in self.layers:
-                    self.layers[layer_id].update(image, z_index, position, duration)
+                opaque = event["data"].get("opaque")
+
+                layer = self.layers.get(layer_id)
+                if layer is not None:
+                    if z_index != layer.z_index:
+                        self._z_order = None
+                    # 与当前画面相同的重复帧不触发重新合成
+                    if layer.update(image, z_index, position, duration, opaque):
+                        self.needs_render.set()
                 else:
-                    self.layers[layer_id] = Layer(image, z_index, position, duration)
-
-                self.needs_render.set()
+                    self.layers[layer_id] = Layer(image, z_index, position, duration, bool(opaque))
+                    self._z_order = None
+                    self.needs_render.set()
             elif event["type"] == "SET_LAYER_VISIBILITY":
                 layer_id = event["data"]["layer_id"]
                 visible = event["data"]["visible"]
@@ -167,16 +243,27 @@ class OLEDThread(threading.Thread):
                 layer_id = event["data"]["layer_id"]
                 if layer_id in self.layers:
                     del self.layers[layer_id]
+                    self._z_order = None
                     self.needs_render.set()  # 触发重绘以确保图层消失
             elif event["type"] == "EXIT":
                 self.stop()
                 break
             else:
                 logger.warning(f"未知事件类型: {event['type']}")
+            try:
+                event = self.event_queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def _next_expiry(self):
+        """返回最早过期的图层的过期时刻, 没有会过期的图层时返回 None"""
+        expiries = [layer.expiry_time for layer in self.layers.values() if layer.expiry_time]
+        return min(expiries) if expiries else None
 
-    def _check_expirations(self):
+    def _check_expirations(self, now=None):
         # 检查并移除过期的图层
-        now = time.time()
+        if now is None:
+            now = time.monotonic()
         expired_layers = [
             layer_id
             for layer_id, layer in self.layers.items()
@@ -185,72 +272,41 @@ class OLEDThread(threading.Thread):
         if expired_layers:
             for layer_id in expired_layers:
                 del self.layers[layer_id]
+            self._z_order = None
             self.needs_render.set()  # 需要重新渲染
 
+    def _composite_pages(self):
+        """
+        核心：合成图层, 返回 SSD1306 页格式的帧缓冲 (pages, width)
+
+        每个图层在更新时已转换为整屏大小的页格式数组, 这里只做按位运算:
+        普通图层与下层按位或, 不透明图层先用遮罩清空 (AND-NOT) 自己矩形范围内的下层内容。
+        """
+        if self._z_order is None:
+            self._z_order = sorted(self.layers.values(), key=lambda layer: layer.z_index)
+
+        frame = self._frame
+        frame.fill(0)
+        for layer in self._z_order:
+            if layer.visible and layer.image is not None:
+                bits, mask = layer.packed(self.width, self.height)
+                if mask is not None:
+                    np.bitwise_and(frame, ~mask, out=frame)
+                np.bitwise_or(frame, bits, out=frame)
+        return frame
+
     def _composite_layers(self):
-        # 核心：合成图层
-        # 创建一个空白的基底图像
-        final_image = Image.new("1", (self.width, self.height), 0)
-
-        # 按 z_index 排序图层
-        sorted_layers = sorted(self.layers.values(), key=lambda layer: layer.z_index)
-
-        for layer in sorted_layers:
-            if layer.visible and layer.image:
-                # For monochrome displays, convert image if necessary
-                if layer.image.mode != "1":
-                    layer_image = layer.image.convert("1")
-                else:
-                    layer_image = layer.image
-
-                # Use PIL's logical operations for proper blending
-                # Create a temporary image to hold the layer at the correct position
-                temp_image = Image.new("1", (self.width, self.height), 0)
-
-                # Paste the layer image onto the temporary image
-                x, y = layer.position
-                layer_width, layer_height = layer_image.size
-
-                # Ensure the layer fits within bounds
-                if (
-                    x < self.width
-                    and y < self.height
-                    and x + layer_width > 0
-                    and y + layer_height > 0
-                ):
-                    # Crop the layer if it extends beyond bounds
-                    crop_x = max(0, -x)
-                    crop_y = max(0, -y)
-                    paste_x = max(0, x)
-                    paste_y = max(0, y)
-
-                    end_x = min(x + layer_width, self.width)
-                    end_y = min(y + layer_height, self.height)
-
-                    if crop_x < layer_width and crop_y < layer_height:
-                        cropped_layer = layer_image.crop(
-                            (
-                                crop_x,
-                                crop_y,
-                                crop_x + (end_x - paste_x),
-                                crop_y + (end_y - paste_y),
-                            )
-                        )
-                        temp_image.paste(cropped_layer, (paste_x, paste_y))
-
-                # Use logical OR to combine with final image
-                from PIL import ImageChops
-
-                final_image = ImageChops.logical_or(final_image, temp_image)
-
-        return final_image
+        """合成图层, 返回 PIL 图像"""
+        return unpack_pages(self._composite_pages(), self.height)
 
 
 if __name__ == "__main__":
     
     from PIL import Image, ImageDraw, ImageFont
-    from EventBus import EventBus
+    from EventBus import EventBus, EventQueue
     from API_OLED.OLED_API import OLED
+    from API_OLED.frame_clock import FrameClock
+    from API_OLED.framebuffer import image_size, pack_image, pack_rect, pages_shape, unpack_pages
 
     # ==================================================================
     # 测试 OLEDThread 的功能
@@ -25,15 +25,15 @@ Subscribe:
 
 Publish:
 - UPDATE_LAYER: 更新图层显示
-    - 发布眼睛动画帧到显示系统
+    - 发布眼睛动画帧到显示系统, 只在画面变化时发布 (眼睛静止时不发布任何事件)
 
 """
 
 import logging
 import queue
 import threading
-import time
 
+from .API_OLED.frame_clock import FrameClock
 from .API_OLED.roboeyes_api import RoboeyesAPI
 from .EventBus import EventBus
 
@@ -47,6 +47,7 @@ class RoboeyesThread(threading.Thread):
         self.event_bus = EventBus()
         self.api = RoboeyesAPI(frame_rate, width, height)
         self.frame_interval = 1.0 / frame_rate
+        self.frame_clock = FrameClock.get_instance()    # 与 OLED 合成线程同步的帧时钟
         self._stop_event = threading.Event()
 
         self.event_bus.subscribe("SET_EXPRESSION", self.event_queue, self.name)
@@ -70,8 +71,6 @@ class RoboeyesThread(threading.Thread):
         self.event_bus.publish("THREAD_STARTED", self.name)
 
         while not self._stop_event.is_set():
-            start_time = time.monotonic()
-
             # 检查是否有来自事件总线的指令
             self.handle_events()
 
@@ -79,26 +78,25 @@ class RoboeyesThread(threading.Thread):
             if self._stop_event.is_set():
                 break
 
-            # 生成新的一帧动画
+            # 生成新的一帧动画, 与上一帧相同时返回 None
             image = self.api.update()
 
-            # 如果生成了有效图像，则发布到事件总线
+            # 如果生成了新的图像，则发布到事件总线
+            # RoboEyes 每帧都在同一个图像对象上绘制, 发布拷贝, 避免 OLED 线程合成时读到画了一半的帧
             if image:
                 self.event_bus.publish(
                     "UPDATE_LAYER",
                     {
                         "layer_id": "roboeyes",
-                        "image": image,
+                        "image": image.copy(),
                         "z_index": 0,  # 总是在底层
                         "position": (0, 0),  # 图像位置，左上角
                         "duration": None,  # 持续时间为 None，表示永久显示
                     }
                 )
-            # 控制帧率
-            elapsed_time = time.monotonic() - start_time
-            sleep_time = self.frame_interval - elapsed_time
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            # 控制帧率: 睡到帧时钟的下一个网格点, 负载高时帧时钟会自动降低帧率
+            # (眼睛动画按时间插值, 帧率降低不影响动作快慢)
+            self.frame_clock.wait(self._stop_event, fps=1.0 / self.frame_interval)
 
         logger.info(f"{self.name} 已停止。")
 
@@ -4,7 +4,7 @@
 需安装中文字体: sudo apt install fonts-wqy-microhei
 
 Subscribe:
-- SUB_TEXT_DISPLAY_REQUEST: 滚动文本显示请求
+- SUB_TEXT_DISPLAY_REQUEST: 滚动文本显示请求 (所有滚动文本在同一个线程中推进, 同时最多 MAX_SCROLLS 个)
     - data格式:
     {
         "text_id": str,  # 滚动文本唯一标识符（可选）
@@ -13,7 +13,7 @@ Subscribe:
         "scroll_direction": str,  # 滚动方向："horizontal"或"vertical"
         "scroll_speed": int,  # 滚动速度（默认1）
         "loop": bool,  # 是否循环滚动（默认True）
-        "layer_id": str,  # 图层ID
+        "layer_id": str,  # 图层ID（默认与 text_id 相同）
         "z_index": int,  # 图层深度（默认0）
         "position": tuple,  # 显示位置 (x, y)（默认(0, 0)）
         "duration": float  # 显示持续时间（秒）（可选）
@@ -48,6 +48,8 @@ Publish:
 
 """
 
+import heapq
+import itertools
 import logging
 import threading
 import time
@@ -55,11 +57,15 @@ import uuid
 from queue import Empty, Queue
 
 from .EventBus import EventBus
+from .API_OLED.frame_clock import FrameClock
 from .API_OLED.text_renderer import TextRenderer
 from .API_OLED.text_scroller import TextScroller
 
 logger = logging.getLogger("OLED文本")
 
+MAX_SCROLLS = 4     # 同时滚动的文本数上限, 超过时结束最早开始的那个
+ATLAS_SAVE_INTERVAL = 60.0      # 把新栅格化的字形写入磁盘缓存的间隔 (秒), 退出时也会写入
+
 
 class TextDisplayThread(threading.Thread):
     def __init__(
@@ -68,21 +74,28 @@ class TextDisplayThread(threading.Thread):
         oled_width: int = 128,
         oled_height: int = 64,
         oled_fps: int = 50,
+        max_scrolls: int = MAX_SCROLLS,
+        atlas_dir = "localfiles/glyph_atlas",
     ):
         super().__init__(daemon=True, name="OLED文本")
         self.event_bus = EventBus()
         self._stop_event = threading.Event()
-        self.active_scrolls = {}
+        self.active_scrolls = {}        # text_id -> 滚动状态, 按开始顺序排列
+        self.max_scrolls = max_scrolls
+        self._schedule = []             # 最小堆: (下一帧的时刻, 序号, text_id, 滚动状态)
+        self._sequence = itertools.count()
 
         # Store config values
         self.oled_width = oled_width
         self.oled_height = oled_height
         self.oled_fps = oled_fps
+        self.frame_clock = FrameClock.get_instance(oled_fps)   # 与 OLED 合成线程同步的帧时钟
 
-        # Initialize renderer with font path
+        # Initialize renderer with font path; glyph atlases are cached on disk under atlas_dir (None to disable)
         self.renderer = TextRenderer(
-            font_path
+            font_path, atlas_dir
         )  # Create private queue and subscribe to events
+        self._next_atlas_save = time.monotonic() + ATLAS_SAVE_INTERVAL
         self.event_queue = Queue()
         self.event_bus.subscribe("SUB_TEXT_DISPLAY_REQUEST", self.event_queue, self.name)
         self.event_bus.subscribe("SUB_TEXT_DISPLAY_CANCEL", self.event_queue, self.name)
@@ -90,11 +103,21 @@ class TextDisplayThread(threading.Thread):
         self.event_bus.subscribe("EXIT", self.event_queue, self.name)
 
     def run(self):
+        """
+        线程主循环
+
+        所有滚动文本都在这个线程里推进, 不再为每个滚动请求创建线程:
+        每个滚动文本在最小堆里有一个 "下一帧的时刻", 线程阻塞在事件队列上, 最多等到最早的那个时刻,
+        到期后推进对应的滚动文本并发布一帧, 再按帧时钟排好它的下一帧。
+        """
         logger.info(f"{self.name} started.")
         while not self._stop_event.is_set():
             try:
-                # Process events from the queue
-                event = self.event_queue.get(timeout=1)
+                self._advance_scrolls()
+                self._save_atlases()
+
+                # Process events from the queue, waiting at most until the next scroll frame is due
+                event = self.event_queue.get(timeout=self._next_timeout())
                 event_type = event.get("type")
                 data = event.get("data", {})
 
@@ -108,7 +131,7 @@ class TextDisplayThread(threading.Thread):
                     self.stop()
                     break
             except Empty:
-                # This is normal, just means no events for a second
+                # This is normal, just means no events until the next scroll frame
                 continue
             except Exception as e:
                 logger.error(f"{self.name} caught an exception: {e}", exc_info=True)
@@ -117,9 +140,21 @@ class TextDisplayThread(threading.Thread):
     def stop(self):
         logger.info(f"Stopping {self.name}...")
         self._stop_event.set()
-        # Stop all active scrolling child threads
-        for text_id, scroll_info in list(self.active_scrolls.items()):
-            scroll_info["stop_event"].set()
+        # Stop all active scrolls
+        for text_id in list(self.active_scrolls):
+            self._cancel_scroll(text_id)
+        self._save_atlases(force=True)
+
+    def _save_atlases(self, force=False):
+        """定期把新栅格化的字形写入磁盘缓存, 重启后不需要重新栅格化"""
+        now = time.monotonic()
+        if not force and now < self._next_atlas_save:
+            return
+        self._next_atlas_save = now + ATLAS_SAVE_INTERVAL
+        try:
+            self.renderer.save_atlases()
+        except OSError as e:
+            logger.warning(f"保存字形缓存失败: {e}")
 
     def _handle_display_request(self, data):
         text_id = data.get("text_id", f"text-scroll-{uuid.uuid4()}")
@@ -128,32 +163,12 @@ class TextDisplayThread(threading.Thread):
         if text_id in self.active_scrolls:
             self._cancel_scroll(text_id)
 
-        scroll_thread = threading.Thread(
-            target=self._scroll_task, args=(text_id, data), daemon=True
-        )
-
-        stop_event = threading.Event()
-        self.active_scrolls[text_id] = {
-            "thread": scroll_thread,
-            "stop_event": stop_event,
-            "layer_id": data.get("layer_id"),
-        }
-        scroll_thread.start()
-        logger.info(f"Started text scroll task: {text_id}")
-
-    def _handle_cancel_request(self, data):
-        text_id = data.get("text_id")
-        if text_id in self.active_scrolls:
-            self._cancel_scroll(text_id)
-            logger.info(f"Cancelled text scroll task via event: {text_id}")
-
-    def _cancel_scroll(self, text_id):
-        if text_id in self.active_scrolls:
-            scroll_info = self.active_scrolls[text_id]
-            scroll_info["stop_event"].set()  # Signal the thread to stop
-            # The thread will clean itself up
+        # Too many concurrent scrolls: end the one that started first
+        while len(self.active_scrolls) >= self.max_scrolls:
+            oldest = next(iter(self.active_scrolls))
+            logger.warning(f"Too many text scrolls, cancelling the oldest one: {oldest}")
+            self._cancel_scroll(oldest)
 
-    def _scroll_task(self, text_id, data):
         scroller = TextScroller(
             renderer=self.renderer,
             text=data.get("text", ""),
@@ -164,50 +179,71 @@ class TextDisplayThread(threading.Thread):
             scroll_speed=data.get("scroll_speed", 1),
             loop=data.get("loop", True),
         )
-
-        layer_id = data.get("layer_id")
-        z_index = data.get("z_index", 0)
-        position = data.get("position", (0, 0))
         duration = data.get("duration")
+        now = time.monotonic()
+        scroll = {
+            "scroller": scroller,
+            "layer_id": data.get("layer_id") or text_id,
+            "z_index": data.get("z_index", 0),
+            "position": data.get("position", (0, 0)),
+            "end_time": now + duration if duration else None,
+        }
+        self.active_scrolls[text_id] = scroll
+        # 第一帧立即显示
+        heapq.heappush(self._schedule, (now, next(self._sequence), text_id, scroll))
+        logger.info(f"Started text scroll: {text_id}")
 
-        # Ensure text_id exists before trying to access it
-        if text_id not in self.active_scrolls:
-            logger.warning(
-                f"Scroll task {text_id} started but was cancelled before it could run."
-            )
-            return
-        stop_event = self.active_scrolls[text_id]["stop_event"]
+    def _handle_cancel_request(self, data):
+        text_id = data.get("text_id")
+        if text_id in self.active_scrolls:
+            self._cancel_scroll(text_id)
+            logger.info(f"Cancelled text scroll via event: {text_id}")
 
-        start_time = time.time()
-        frame_interval = 1 / self.oled_fps
+    def _cancel_scroll(self, text_id):
+        """结束滚动并删除它的图层; 它在堆里剩下的条目会在到期时被跳过"""
+        scroll = self.active_scrolls.pop(text_id, None)
+        if scroll is not None:
+            self.event_bus.publish("DELETE_LAYER", {"layer_id": scroll["layer_id"]}, self.name)
+
+    def _next_timeout(self):
+        """距离最早一个滚动帧的秒数, 没有滚动文本时最多等待 1 秒"""
+        if not self._schedule:
+            return 1.0
+        return max(0.0, min(1.0, self._schedule[0][0] - time.monotonic()))
+
+    def _advance_scrolls(self):
+        """推进所有已到期的滚动文本, 每个发布一帧"""
+        now = time.monotonic()
+        while self._schedule and self._schedule[0][0] <= now:
+            _, _, text_id, scroll = heapq.heappop(self._schedule)
+            if self.active_scrolls.get(text_id) is not scroll:
+                continue    # 已被取消或被同名的新请求替换
 
-        while not stop_event.is_set():
             # Check for duration timeout
-            if duration and (time.time() - start_time) > duration:
-                break
-
-            frame = scroller.next_frame()
+            if scroll["end_time"] is not None and now >= scroll["end_time"]:
+                logger.info(f"Text scroll finished: {text_id}")
+                self._cancel_scroll(text_id)
+                continue
 
+            frame = scroll["scroller"].next_frame()
             if frame is None:  # Animation finished naturally (non-looping)
-                break
+                logger.info(f"Text scroll finished: {text_id}")
+                self._cancel_scroll(text_id)
+                continue
 
             self.event_bus.publish(
                 "UPDATE_LAYER",
                 {
-                    "layer_id": layer_id,
+                    "layer_id": scroll["layer_id"],
                     "image": frame,
-                    "z_index": z_index,
-                    "position": position,
+                    "z_index": scroll["z_index"],
+                    "position": scroll["position"],
                 }
             )
-
-            time.sleep(frame_interval)
-
-        # --- Cleanup ---
-        logger.info(f"Text scroll task finished or cancelled: {text_id}")
-        self.event_bus.publish("DELETE_LAYER", layer_id=layer_id)
-        if text_id in self.active_scrolls:
-            del self.active_scrolls[text_id]
+            # 落后时直接排到下一个网格点, 不补发错过的帧
+            heapq.heappush(
+                self._schedule, (self.frame_clock.next_tick(now), next(self._sequence), text_id, scroll)
+            )
 
     def _handle_static_display_request(self, data):
         """
@@ -1,7 +1,15 @@
 """
 温湿度传感器模块
 定时读取环境温湿度
-当
+
+Subscribe:
+- GET_TEMPERATURE: 查询当前温湿度
+    - 使用 event_bus.request("GET_TEMPERATURE") 时直接应答 {"temperature": ..., "humidity": ...}
+    - 使用 publish 时广播 TEMPERATURE 事件
+- EXIT: 停止线程
+
+Publish:
+- TEMPERATURE: 当前温湿度
 """
 
 # 自定义模块
@@ -45,7 +53,14 @@ class Temperature(threading.Thread):
             if event['type'] == "EXIT":
                 break
             elif event['type'] == "GET_TEMPERATURE":
-                self.event_bus.publish("TEMPERATURE", {"temperature": self.temperature, "humidity": self.humidity})
+                data = {"temperature": self.temperature, "humidity": self.humidity}
+                # 通过 event_bus.request() 发来的请求 (data 中带 reply_to) 直接应答, 请求者已超时时应答被丢弃;
+                # 普通的 publish 才广播 TEMPERATURE 事件
+                request = event.get("data")
+                if isinstance(request, dict) and "reply_to" in request:
+                    self.event_bus.reply(event, data)
+                else:
+                    self.event_bus.publish("TEMPERATURE", data, self.name)
         logger.info(f"{self.name}已退出")
 
     def data_updater(self):
@@ -3,11 +3,11 @@ import os
 import tempfile
 import threading
 import wave
-from queue import Empty, Queue
+from queue import Empty
 
 from .API_Voice.STT.iflytek_stt import IflytekSTTClient
 from .API_Voice.STT.siliconflow_stt import SiliconFlowSTT
-from .EventBus import EventBus
+from .EventBus import EventBus, EventQueue
 
 logger = logging.getLogger("STT模块")
 
@@ -34,7 +34,7 @@ class STTThread(threading.Thread):
         super().__init__(daemon=True, name="STT 模块")
         self.event_bus = EventBus()
         self.config = config
-        self.event_queue = Queue()
+        self.event_queue = EventQueue()
         self.stop_event = threading.Event()
         self.stt_client = None
         logger.info("STTThread 初始化完成。")
@@ -69,8 +69,9 @@ class STTThread(threading.Thread):
                 logger.error(f"不支持的 STT 提供商: {stt_provider}")
                 return False
 
+            # 语音数据较大, 识别卡住时最多积压 2 段, 更早的直接丢弃
             self.event_bus.subscribe(
-                "VOICE_COMMAND_DETECTED", self.event_queue, self.name
+                "VOICE_COMMAND_DETECTED", self.event_queue, self.name, maxsize=2
             )
             self.event_bus.subscribe("EXIT", self.event_queue, self.name)
             logger.info("STTThread 底层组件设置成功。")
@@ -32,12 +32,12 @@ import subprocess
 import tempfile
 import threading
 import time
-from queue import Empty, Queue
+from queue import Empty
 logger = logging.getLogger("TTS模块")
 
 
 
-from .EventBus import EventBus
+from .EventBus import EventBus, EventQueue
 from pydub.utils import get_player_name
 logger.info("正在导入 EdgeTTS ...")
 from .API_Voice.TTS.edge_tts1 import EdgeTTS
@@ -64,7 +64,7 @@ class TTSThread(threading.Thread):
     def __init__(self):
         super().__init__(daemon=True, name="TTS模块")
         self.event_bus = EventBus()
-        self.event_queue = Queue()
+        self.event_queue = EventQueue()     # INTERRUPTION_DETECTED 走高优先级通道, 不会排在待播报文本之后
         self.stop_event = threading.Event()
         self.playback_handle = None  # 用于跟踪播放进程
         self.temp_audio_file_path = None  # 用于跟踪临时音频文件
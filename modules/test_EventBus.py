@@ -0,0 +1,392 @@
+"""
+EventBus 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest test_EventBus.py
+"""
+
+import logging
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from modules.EventBus import EventBus, EventQueue, EventTracer, summarize
+
+
+@pytest.fixture
+def bus():
+    """每个测试使用一个全新的 EventBus 单例"""
+    EventBus._instance = None
+    yield EventBus()
+    EventBus._instance = None
+
+
+def test_singleton(bus):
+    assert EventBus() is bus
+
+
+def test_publish_delivers_to_all_subscribers(bus):
+    q1, q2 = queue.Queue(), queue.Queue()
+    bus.subscribe("ping", q1, "A")
+    bus.subscribe("PING", q2, "B")
+    bus.subscribe("PING", q2, "B")      # 重复订阅不会重复投递
+
+    bus.publish("ping", {"n": 1}, "测试")
+
+    for q in (q1, q2):
+        assert q.get_nowait() == {"type": "PING", "data": {"n": 1}, "source": "测试"}
+        assert q.empty()
+
+
+def test_publish_swaps_source_and_data(bus):
+    q = queue.Queue()
+    bus.subscribe("EXIT", q)
+    bus.publish("EXIT", "DeskRobot")
+    assert q.get_nowait() == {"type": "EXIT", "data": {}, "source": "DeskRobot"}
+
+
+def test_subscribe_rejects_non_queue(bus):
+    with pytest.raises(TypeError):
+        bus.subscribe("PING", [], "A")
+
+
+def test_unsubscribe(bus):
+    q1, q2 = queue.Queue(), queue.Queue()
+    bus.subscribe("PING", q1)
+    bus.subscribe("PING", q2)
+    bus.unsubscribe("PING", q1)
+    bus.publish("PING")
+    assert q1.empty() and not q2.empty()
+
+    bus.unsubscribe("PING", q2)
+    assert "PING" not in bus.listeners
+    bus.unsubscribe("PING", q2)         # 重复取消订阅不报错
+
+
+def test_subscribe_does_not_mutate_published_snapshot(bus):
+    q1 = queue.Queue()
+    bus.subscribe("PING", q1)
+    snapshot = bus.listeners
+    bus.subscribe("PING", queue.Queue())
+    assert [sub.queue for sub in snapshot["PING"]] == [q1]
+    assert bus.listeners is not snapshot
+
+
+def test_concurrent_subscribe_and_publish(bus):
+    queues = [queue.Queue() for _ in range(50)]
+    stop = threading.Event()
+
+    def publisher():
+        while not stop.is_set():
+            bus.publish("UPDATE_LAYER", {"layer_id": "x"})
+
+    t = threading.Thread(target=publisher)
+    t.start()
+    for q in queues:
+        bus.subscribe("UPDATE_LAYER", q)
+    stop.set()
+    t.join()
+
+    assert len(bus.listeners["UPDATE_LAYER"]) == len(queues)
+    bus.publish("UPDATE_LAYER", {"layer_id": "x"})
+    assert all(not q.empty() for q in queues)
+
+
+def test_conflate_by_topic(bus):
+    q = EventQueue()
+    bus.subscribe("FACE_RECT", q, conflate=True)
+    bus.subscribe("EXIT", q)
+    for i in range(100):
+        bus.publish("FACE_RECT", {"x": i})
+    bus.publish("EXIT")
+
+    assert q.qsize() == 2
+    assert q.get_nowait()["type"] == "EXIT"          # EXIT 走高优先级通道
+    assert q.get_nowait()["data"] == {"x": 99}
+    assert q.conflated == 99
+
+
+def test_conflate_by_key_keeps_latest_order(bus):
+    q = EventQueue()
+    bus.subscribe("UPDATE_LAYER", q, conflate="layer_id")
+    bus.subscribe("DELETE_LAYER", q)
+
+    bus.publish("UPDATE_LAYER", {"layer_id": "eyes", "v": 1})
+    bus.publish("UPDATE_LAYER", {"layer_id": "text", "v": 1})
+    bus.publish("DELETE_LAYER", {"layer_id": "eyes"})
+    bus.publish("UPDATE_LAYER", {"layer_id": "eyes", "v": 2})
+
+    events = [q.get_nowait() for _ in range(q.qsize())]
+    assert [(e["type"], e["data"].get("v")) for e in events] == [
+        ("UPDATE_LAYER", 1),     # text
+        ("DELETE_LAYER", None),
+        ("UPDATE_LAYER", 2),     # eyes 的新帧排在删除之后
+    ]
+
+
+def test_conflate_requires_event_queue(bus):
+    with pytest.raises(TypeError):
+        bus.subscribe("FACE_RECT", queue.Queue(), conflate=True)
+
+
+def test_event_queue_blocking_get():
+    q = EventQueue()
+    threading.Timer(0.05, q.put, args=("late",)).start()
+    assert q.get(timeout=1) == "late"
+    q.task_done()
+    q.join()
+
+
+def test_bounded_drop_oldest_keeps_other_topics(bus):
+    q = EventQueue()
+    bus.subscribe("VOICE_COMMAND_DETECTED", q, "STT", maxsize=2)
+    bus.subscribe("EXIT", q, "STT")
+    bus.publish("EXIT")
+    for i in range(5):
+        bus.publish("VOICE_COMMAND_DETECTED", {"n": i})
+
+    events = [q.get_nowait() for _ in range(q.qsize())]
+    assert [e["type"] for e in events] == ["EXIT", "VOICE_COMMAND_DETECTED", "VOICE_COMMAND_DETECTED"]
+    assert [e["data"]["n"] for e in events[1:]] == [3, 4]
+
+    stats = {s["type"]: s for s in bus.get_stats()}
+    assert stats["VOICE_COMMAND_DETECTED"]["dropped"] == 3
+    assert stats["VOICE_COMMAND_DETECTED"]["high_water"] == 2
+    assert stats["EXIT"]["dropped"] == 0
+
+
+def test_bounded_drop_newest(bus):
+    q = EventQueue()
+    bus.subscribe("PING", q, maxsize=2, overflow="drop_newest")
+    for i in range(5):
+        bus.publish("PING", {"n": i})
+    assert [q.get_nowait()["data"]["n"] for _ in range(q.qsize())] == [0, 1]
+    assert bus.get_stats()[0]["dropped"] == 3
+    assert bus.get_stats()[0]["delivered"] == 2
+
+
+def test_bounded_block_with_timeout(bus):
+    q = EventQueue()
+    bus.subscribe("PING", q, maxsize=1, overflow="block", timeout=0.05)
+    bus.publish("PING", {"n": 0})
+    bus.publish("PING", {"n": 1})       # 超时后丢弃
+    assert q.qsize() == 1
+    assert bus.get_stats()[0]["dropped"] == 1
+
+
+
+def test_bounded_block_until_consumed(bus):
+    q = EventQueue()
+    bus.subscribe("PING", q, maxsize=1, overflow="block", timeout=2)
+    bus.publish("PING", {"n": 0})
+    threading.Timer(0.05, q.get).start()
+    bus.publish("PING", {"n": 1})       # 等到消费者取走后放入
+    assert q.get_nowait()["data"]["n"] == 1
+    assert bus.get_stats()[0]["dropped"] == 0
+
+
+def test_bounded_subscription_validation(bus):
+    with pytest.raises(TypeError):
+        bus.subscribe("PING", queue.Queue(), maxsize=1)
+    with pytest.raises(ValueError):
+        bus.subscribe("PING", EventQueue(), maxsize=1, overflow="explode")
+    with pytest.raises(ValueError):
+        bus.subscribe("PING", EventQueue(), conflate=True, maxsize=1)
+
+
+def test_summarize_large_payloads():
+    class FakeImage:
+        mode, size = "1", (128, 64)
+
+    text = summarize({"audio_data": b"\0" * 32000, "image": FakeImage(), "text": "x" * 100,
+                      "rect": (1, 2, 3, 4), "nested": {"a": {"b": {"c": 1}}}})
+    assert "<bytes 32000>" in text
+    assert "<Image 1 128x64>" in text
+    assert "(1, 2, 3, 4)" in text
+    assert "x" * 100 not in text
+    assert "<dict>" in text
+    assert len(text) < 200
+
+
+def test_tracer_sampling(bus, caplog):
+    bus.set_tracer(EventTracer({"FACE_RECT": 0.25, "UPDATE_LAYER": 0}))
+    with caplog.at_level(logging.INFO, logger="消息总线"):
+        for _ in range(8):
+            bus.publish("FACE_RECT", {"x": 1}, "摄像头")
+            bus.publish("UPDATE_LAYER", {"image": object()})
+        bus.publish("PING", "测试")
+    lines = [r.getMessage() for r in caplog.records]
+    assert sum("FACE_RECT" in line for line in lines) == 2
+    assert not any("UPDATE_LAYER" in line for line in lines)
+    assert "测试 发布了 PING 消息 (无人订阅)" in lines
+
+
+def test_tracer_sampling_rates_and_array_payloads(bus, caplog):
+    bus.set_tracer(EventTracer({"A": 0.7, "B": 0.3}))
+    with caplog.at_level(logging.INFO, logger="消息总线"):
+        for _ in range(10):
+            bus.publish("A")
+            bus.publish("B")
+        bus.publish("FRAME", np.zeros((2, 3), dtype=bool), "摄像头")     # 数组不能求真值
+    lines = [r.getMessage() for r in caplog.records]
+    assert sum(" A " in line for line in lines) == 7
+    assert sum(" B " in line for line in lines) == 3
+    assert "摄像头 发布了 FRAME 消息 (无人订阅) data = <ndarray bool 2x3>" in lines
+
+
+def test_tracer_skips_formatting_when_level_disabled(bus, monkeypatch):
+    tracer = EventTracer(level=logging.DEBUG)
+    monkeypatch.setattr(tracer, "trace", lambda *args: pytest.fail("不应格式化事件"))
+    bus.set_tracer(tracer)
+    logging.getLogger("消息总线").setLevel(logging.INFO)
+    try:
+        bus.publish("PING", {"data": b"123"})
+    finally:
+        logging.getLogger("消息总线").setLevel(logging.NOTSET)
+
+
+def test_async_stream(bus):
+    import asyncio
+
+    async def consumer(received):
+        async for event in bus.stream("PING", "EXIT", name="协程"):
+            if event["type"] == "EXIT":
+                break
+            received.append(event["data"]["n"])
+
+    async def main():
+        received = []
+        task = asyncio.create_task(consumer(received))
+        await asyncio.sleep(0)                  # 让消费者先完成订阅
+        await bus.apublish("PING", {"n": 1})
+        # 其它线程发布的事件同样能唤醒协程
+        threading.Thread(target=bus.publish, args=("PING", {"n": 2})).start()
+        await asyncio.sleep(0.05)
+        await bus.apublish("EXIT")
+        await asyncio.wait_for(task, 1)
+        return received
+
+    assert asyncio.run(main()) == [1, 2]
+    assert "PING" not in bus.listeners          # 退出迭代后自动取消订阅
+
+
+def test_async_publish_does_not_block_loop(bus):
+    import asyncio
+
+    async def main():
+        stream = bus.stream("PING", maxsize=1, overflow="block", timeout=2)
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        await bus.apublish("PING", {"n": 0})
+        await bus.apublish("PING", {"n": 1})    # 队列未被取走时, 同步发布会卡住事件循环
+        assert (await first)["data"]["n"] == 0
+        assert (await stream.__anext__())["data"]["n"] == 1
+        await stream.aclose()
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+
+
+def test_wildcard_subscriptions(bus):
+    leds, everything = queue.Queue(), queue.Queue()
+    bus.subscribe("led_*", leds, "LED")
+    bus.subscribe("*", everything, "监控")
+    bus.subscribe("LED_ON", everything, "监控")    # 与 "*" 重叠, 只投递一次
+
+    bus.publish("LED_ON", {"r": 1})
+    bus.publish("LED_OFF")
+    bus.publish("EXIT")
+
+    assert [leds.get_nowait()["type"] for _ in range(leds.qsize())] == ["LED_ON", "LED_OFF"]
+    assert [everything.get_nowait()["type"] for _ in range(everything.qsize())] == ["LED_ON", "LED_OFF", "EXIT"]
+
+    # 订阅变化后路由缓存失效
+    bus.unsubscribe("LED_*", leds)
+    bus.publish("LED_ON")
+    assert leds.empty()
+    assert {s["type"] for s in bus.get_stats()} == {"*", "LED_ON"}
+
+    with pytest.raises(ValueError):
+        bus.subscribe("LED_*_ON", leds)
+
+
+def test_priority_lanes(bus):
+    from EventBus import HIGH, LOW
+    q = EventQueue()
+    bus.subscribe("UPDATE_LAYER", q, "OLED", conflate="layer_id")
+    bus.subscribe("SPEAK_TEXT", q, "TTS")
+    bus.subscribe("LOG", q, "TTS", priority=LOW)
+    bus.subscribe("INTERRUPTION_DETECTED", q, "TTS")
+    bus.subscribe("EXIT", q, "TTS")
+
+    bus.publish("LOG")
+    for i in range(100):
+        bus.publish("UPDATE_LAYER", {"layer_id": i})
+        bus.publish("SPEAK_TEXT", {"n": i})
+    bus.publish("INTERRUPTION_DETECTED")
+    bus.publish("EXIT")
+
+    events = [q.get_nowait()["type"] for _ in range(q.qsize())]
+    assert events[:2] == ["INTERRUPTION_DETECTED", "EXIT"]
+    assert events[-1] == "LOG"
+    stats = q.lane_stats()
+    assert [s["count"] for s in stats] == [2, 200, 1]
+    assert stats[HIGH]["max_wait_ms"] >= 0
+
+    with pytest.raises(TypeError):
+        bus.subscribe("PING", queue.Queue(), priority=HIGH)
+    with pytest.raises(ValueError):
+        bus.subscribe("PING", q, priority=7)
+
+
+def test_wildcard_subscription_uses_topic_priority(bus):
+    q = EventQueue()
+    bus.subscribe("*", q, "监控")
+    bus.publish("PING")
+    bus.publish("EXIT")
+    assert q.get_nowait()["type"] == "EXIT"
+
+
+def test_bounded_wildcard_subscription_across_lanes(bus):
+    q = EventQueue()
+    bus.subscribe("*", q, "监控", maxsize=2)
+    bus.publish("FOO")
+    bus.publish("EXIT")
+    assert q.get()["type"] == "EXIT"    # 先取出的是高优先级通道里后放入的事件
+    bus.publish("BAR")
+    bus.publish("BAZ")                  # 分组已满, 丢弃最早的 FOO
+    assert [q.get_nowait()["type"] for _ in range(q.qsize())] == ["BAR", "BAZ"]
+
+
+def test_join_returns_after_dropped_events(bus):
+    q = EventQueue()
+    bus.subscribe("PING", q, "测试", maxsize=1)
+    for i in range(3):
+        bus.publish("PING", {"n": i})       # 丢弃 0 和 1
+    assert q.get_nowait()["data"] == {"n": 2}
+    q.task_done()
+    waiter = threading.Thread(target=q.join, daemon=True)
+    waiter.start()
+    waiter.join(timeout=1)
+    assert not waiter.is_alive() and q.unfinished_tasks == 0
+
+
+def test_request_reply(bus):
+    inbox = queue.Queue()
+    bus.subscribe("GET_TEMPERATURE", inbox, "温湿度")
+
+    def responder():
+        event = inbox.get(timeout=1)
+        assert bus.reply(event, {"temperature": 25})
+        assert not bus.reply(event, {"temperature": 26})    # 只接收第一个应答
+
+    threading.Thread(target=responder).start()
+    assert bus.request("GET_TEMPERATURE", "AI", timeout=1) == {"temperature": 25}
+    assert bus._pending == {}
+
+    assert bus.request("GET_TEMPERATURE", timeout=0.01) is None     # 无人应答, 超时
+    assert bus.request("NO_SUCH_TOPIC", timeout=5) is None          # 无人订阅, 立即返回
+    assert not bus.reply(inbox.get_nowait(), {})                    # 请求者已超时
+    assert not bus.reply({"type": "PING", "data": {}}, {})          # 普通事件不是请求
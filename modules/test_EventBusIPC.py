@@ -0,0 +1,159 @@
+"""
+EventBusIPC 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest test_EventBusIPC.py
+"""
+
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from modules.EventBus import EventBus
+from modules.EventBusIPC import Bridge, ProcessTask, SharedRing, decode, discard_pending, encode
+
+
+@pytest.fixture
+def bus():
+    EventBus._instance = None
+    yield EventBus()
+    EventBus._instance = None
+
+
+class EchoThread(threading.Thread):
+    """在子进程中运行的测试模块: 收到 PING 就回复 PONG"""
+
+    def __init__(self, prefix):
+        super().__init__(daemon=True, name="回声模块")
+        self.prefix = prefix
+        self.event_queue = queue.Queue()
+        self.event_bus = EventBus()
+        self.event_bus.subscribe("PING", self.event_queue, self.name)
+        self.event_bus.subscribe("GET_PID", self.event_queue, self.name)
+        self.event_bus.subscribe("EXIT", self.event_queue, self.name)
+
+    def run(self):
+        while True:
+            event = self.event_queue.get()
+            if event["type"] == "EXIT":
+                break
+            if event["type"] == "GET_PID":
+                self.event_bus.reply(event, os.getpid())
+                continue
+            data = event["data"]
+            self.event_bus.publish("PONG", {"text": self.prefix + data["text"], "audio": data["audio"],
+                                            "pid": os.getpid()}, self.name)
+
+
+class CrashThread(threading.Thread):
+    """在子进程中运行的测试模块: 订阅 PING 后整个进程直接退出"""
+
+    def __init__(self):
+        super().__init__(daemon=True, name="崩溃模块")
+        EventBus().subscribe("PING", queue.Queue(), self.name)
+
+    def run(self):
+        time.sleep(0.2)
+        os._exit(1)
+
+
+def test_ring_wraps_around():
+    ring = SharedRing(size=256)
+    try:
+        for i in range(50):
+            payload = bytes([i]) * (i % 40 + 1)
+            ring.put(payload)
+            assert ring.get(timeout=1) == payload
+        assert ring.get(timeout=0) is None
+        with pytest.raises(ValueError):
+            ring.put(bytes(200))
+    finally:
+        ring.close()
+
+
+def test_full_ring_put_times_out():
+    ring = SharedRing(size=256)
+    try:
+        while ring.put(bytes(100), timeout=0):
+            pass
+        start = time.monotonic()
+        assert not ring.put(bytes(100), timeout=0.05)
+        assert time.monotonic() - start < 1
+        assert ring.get(timeout=0) == bytes(100)
+    finally:
+        ring.close()
+
+
+def shm_segments():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_full_ring_drops_without_blocking_or_leaking_shared_memory(bus):
+    send_ring, recv_ring = SharedRing(size=4096), SharedRing(size=4096)
+    before = shm_segments()
+    bridge = Bridge(bus, send_ring, recv_ring, "测试", forward_all=True)
+    try:
+        start = time.monotonic()
+        for i in range(400):
+            bridge.forward({"type": "PING", "data": {"audio": os.urandom(100_000)}, "source": "测试"})
+        assert time.monotonic() - start < 2              # 缓冲区一直满着时不再等待
+        sent = discard_pending(send_ring)                 # 对方从未读取
+        assert sent + bridge.dropped == 400 and bridge.dropped > 300
+        assert shm_segments() <= before
+    finally:
+        send_ring.close()
+        recv_ring.close()
+
+
+def test_large_payload_goes_through_shared_memory():
+    audio = os.urandom(100_000)
+    payload = encode(("event", "VOICE_COMMAND_DETECTED", {"audio_data": audio}, "语音"))
+    assert len(payload) < 1000
+    assert decode(payload)[2]["audio_data"] == audio
+
+
+def test_process_task_round_trip(bus):
+    inbox = queue.Queue()
+    bus.subscribe("PONG", inbox, "测试")
+    task = ProcessTask(EchoThread, "回声: ")
+    task.start()
+    try:
+        audio = os.urandom(64_000)
+        # 子进程订阅 PING 之前发布的事件不会被转发, 因此重复发送直到收到回复
+        for _ in range(50):
+            bus.publish("PING", {"text": "你好", "audio": audio}, "测试")
+            try:
+                event = inbox.get(timeout=0.1)
+                break
+            except queue.Empty:
+                pass
+        else:
+            pytest.fail("没有收到子进程的回复")
+        assert event["data"]["text"] == "回声: 你好"
+        assert event["data"]["audio"] == audio
+        assert event["data"]["pid"] == task.pid != os.getpid()
+        assert bus.request("GET_PID", timeout=2) == task.pid       # 跨进程请求/应答
+    finally:
+        bus.publish("EXIT", "测试")
+        task.join(timeout=5)
+    assert task.exitcode == 0
+
+
+def test_bridge_detaches_when_child_exits(bus):
+    task = ProcessTask(CrashThread, ring_size=4096)
+    task.start()
+    try:
+        deadline = time.monotonic() + 10
+        while bus.bridges and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not bus.bridges and task.exitcode == 1
+        start = time.monotonic()
+        for _ in range(100):                # 远超环形缓冲区的容量, 也不会阻塞
+            bus.publish("PING", {"text": "x" * 100}, "测试")
+        assert time.monotonic() - start < 1
+    finally:
+        task.join(timeout=5)
@@ -0,0 +1,80 @@
+"""
+EventRecorder 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest test_EventRecorder.py
+"""
+
+import logging
+import os
+import queue
+import time
+
+import pytest
+
+from modules.EventBus import EventBus
+from modules.EventRecorder import EventRecorder, EventReplayer, PayloadRef, load
+
+
+@pytest.fixture
+def bus():
+    EventBus._instance = None
+    yield EventBus()
+    EventBus._instance = None
+
+
+def test_ring_is_bounded_by_count_and_window(bus):
+    recorder = EventRecorder(window=0.05, max_events=10)
+    for i in range(25):
+        bus.publish("PING", {"n": i})
+    assert [e[3]["n"] for e in recorder.events] == list(range(15, 25))
+    time.sleep(0.06)
+    bus.publish("PONG")
+    assert [e[1] for e in recorder.events] == ["PONG"]
+    assert recorder.recorded == 26
+
+
+def test_recorded_dict_is_not_changed_by_the_publisher(bus):
+    recorder = EventRecorder()
+    data = {"text": "你好"}
+    bus.publish("PING", data)
+    data["text"] = "再见"                  # 发布者复用自己的字典
+    assert recorder.events[-1][3] == {"text": "你好"}
+
+
+def test_recorder_does_not_count_as_a_subscriber(bus, caplog):
+    recorder = EventRecorder()
+    start = time.monotonic()
+    assert bus.request("NO_SUCH_TOPIC", timeout=5) is None         # 无人订阅, 立即返回而不是等满 5 秒
+    assert time.monotonic() - start < 1
+    with caplog.at_level(logging.INFO, logger="消息总线"):
+        bus.publish("PING", "测试")
+    assert "测试 发布了 PING 消息 (无人订阅)" in [r.getMessage() for r in caplog.records]
+    assert [e[1] for e in recorder.events] == ["PING"]
+
+
+def test_dump_and_replay(bus, tmp_path):
+    recorder = EventRecorder()
+    audio = os.urandom(32000)
+    bus.publish("VOICE_COMMAND_DETECTED", {"audio_data": audio, "sample_rate": 16000}, "语音")
+    time.sleep(0.02)
+    bus.publish("SPEAK_TEXT", {"text": "你好", "callback": lambda: None}, "AI")   # 无法序列化的数据
+    bus.publish("EXIT")
+
+    path = tmp_path / "events.evrec"
+    assert recorder.dump(path) == 3
+    _, events = load(path)
+    ref = events[0][3]["audio_data"]
+    assert isinstance(ref, PayloadRef) and ref.nbytes == 32000
+    assert "你好" in events[1][3]
+    recorder.stop()
+
+    inbox = queue.Queue()
+    bus.subscribe("*", inbox, "测试")
+    start = time.monotonic()
+    assert EventReplayer(path, speed=2).run() == 2      # EXIT 不会被回放
+    assert time.monotonic() - start >= 0.01 - 0.002     # 按 2 倍速保留事件间隔
+    first = inbox.get_nowait()
+    assert first["data"]["audio_data"] == bytes(32000)
+    assert first["source"] == "语音"
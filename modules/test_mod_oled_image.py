@@ -0,0 +1,98 @@
+"""
+OLEDThread (图层合成线程) 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest test_mod_oled_image.py
+"""
+
+import time
+
+import pytest
+from PIL import Image
+
+from modules.API_OLED.OLED_API import OLED
+from modules.API_OLED.frame_clock import RENDER_LEAD, FrameClock
+from modules.EventBus import EventBus
+from modules.mod_oled_image import OLEDThread
+
+
+class FakeOLED:
+    """代替屏幕: 记录每次 display_pages 的时刻和内容"""
+
+    def __init__(self):
+        self.frames = []
+
+    def display_pages(self, pages):
+        self.frames.append((time.monotonic(), pages.copy()))
+
+
+@pytest.fixture
+def oled(monkeypatch):
+    EventBus._instance = None
+    fake = FakeOLED()
+    monkeypatch.setattr(OLED, "_instance", fake)
+    yield fake
+    EventBus._instance = None
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def layer(layer_id, image, position=(0, 0)):
+    return {"layer_id": layer_id, "image": image, "z_index": 0, "position": position}
+
+
+def test_fps_argument_configures_a_shared_clock_created_earlier(oled, monkeypatch):
+    monkeypatch.setattr(FrameClock, "_instance", None)
+    shared = FrameClock.get_instance()              # 生产者先以默认的 50 fps 创建
+    thread = OLEDThread(fps=20)
+    assert thread.frame_clock is shared and shared.interval == pytest.approx(0.05)
+
+
+def test_event_loop_renders_on_the_clock_grid_and_exits(oled):
+    clock = FrameClock(fps=20, loadavg=lambda: (0.0, 0.0, 0.0))
+    thread = OLEDThread(fps=20, frame_clock=clock)
+    thread.start()
+    bus = EventBus()
+    try:
+        for i in range(3):
+            published = time.monotonic()
+            bus.publish("UPDATE_LAYER", layer("dot", Image.new("1", (4, 4), 1), (i * 8, 0)))
+            assert wait_for(lambda: len(oled.frames) == i + 1)
+            shown, pages = oled.frames[-1]
+            assert shown - published < 0.05 + 0.03           # 收到事件就醒来, 最多等到下一个网格点
+            phase = (shown - clock.epoch - RENDER_LEAD) % clock.interval
+            assert phase < 0.02                               # 合成时刻对齐网格点
+            assert pages[0, i * 8] == 0x0F
+        bus.publish("EXIT")
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+    finally:
+        thread.stop()
+
+
+def test_duplicate_frames_skip_compositing_and_display(oled):
+    thread = OLEDThread(fps=50, frame_clock=FrameClock(fps=50, loadavg=lambda: (0.0, 0.0, 0.0)))
+    composites = []
+    composite = thread._composite_pages
+    thread._composite_pages = lambda: composites.append(1) or composite()
+    thread.start()
+    bus = EventBus()
+    try:
+        bus.publish("UPDATE_LAYER", layer("eyes", Image.new("1", (8, 8), 1)))
+        assert wait_for(lambda: len(oled.frames) == 1)
+        for _ in range(5):                  # 内容, 位置和 Z 轴都相同的新图像对象, 每帧一个 (不会被合并)
+            bus.publish("UPDATE_LAYER", layer("eyes", Image.new("1", (8, 8), 1)))
+            time.sleep(0.03)
+        bus.publish("UPDATE_LAYER", layer("eyes", Image.new("1", (8, 8), 1), (8, 0)))   # 只有位置变了
+        assert wait_for(lambda: len(oled.frames) == 2)
+        time.sleep(0.1)
+        assert len(oled.frames) == len(composites) == 2
+    finally:
+        bus.publish("EXIT")
+        thread.join(timeout=1)
@@ -0,0 +1,78 @@
+"""
+TextDisplayThread (滚动文本调度) 单元测试
+
+使用说明:
+在 `modules/` 目录下运行 pytest 命令:
+    pytest test_mod_oled_text.py
+"""
+
+import queue
+import time
+
+import pytest
+
+from modules.EventBus import EventBus
+from modules.mod_oled_text import TextDisplayThread
+
+
+@pytest.fixture
+def display(font_path):
+    """不启动线程, 直接调用处理函数; 返回 (线程对象, 收到的图层事件)"""
+    EventBus._instance = None
+    layers = queue.Queue()
+    EventBus().subscribe("UPDATE_LAYER", layers, "测试")
+    EventBus().subscribe("DELETE_LAYER", layers, "测试")
+    yield TextDisplayThread(font_path=font_path, atlas_dir=None), layers
+    EventBus._instance = None
+
+
+def drain(layers):
+    events = []
+    while not layers.empty():
+        event = layers.get_nowait()
+        events.append((event["type"], event["data"]["layer_id"]))
+    return events
+
+
+def start(thread, text_id, **options):
+    thread._handle_display_request(dict({"text_id": text_id, "text": "scrolling " * 4}, **options))
+
+
+def test_scroll_cap_ends_the_oldest_scroll(display):
+    thread, layers = display
+    for i in range(5):
+        start(thread, f"t{i}")
+    assert list(thread.active_scrolls) == ["t1", "t2", "t3", "t4"]
+    thread._advance_scrolls()
+    events = drain(layers)
+    assert events[0] == ("DELETE_LAYER", "t0")
+    assert sorted(events[1:]) == [("UPDATE_LAYER", f"t{i}") for i in range(1, 5)]
+
+
+def test_cancel_and_replace(display):
+    thread, layers = display
+    start(thread, "a")
+    start(thread, "a", layer_id="a2")           # 同名请求替换旧的滚动, 旧图层被删除
+    thread._handle_cancel_request({"text_id": "missing"})
+    thread._advance_scrolls()
+    assert drain(layers) == [("DELETE_LAYER", "a"), ("UPDATE_LAYER", "a2")]
+    assert len(thread._schedule) == 1           # 旧滚动留在堆里的条目已被跳过
+
+    thread._handle_cancel_request({"text_id": "a"})
+    assert drain(layers) == [("DELETE_LAYER", "a2")] and not thread.active_scrolls
+    time.sleep(0.05)
+    thread._advance_scrolls()                   # 已取消的滚动不再发布帧
+    assert drain(layers) == [] and not thread._schedule
+
+
+def test_duration_expiry(display):
+    thread, layers = display
+    start(thread, "short", duration=0.05)
+    start(thread, "long")
+    deadline = time.monotonic() + 1
+    while "short" in thread.active_scrolls and time.monotonic() < deadline:
+        time.sleep(thread._next_timeout())
+        thread._advance_scrolls()
+    events = drain(layers)
+    assert ("DELETE_LAYER", "short") in events and list(thread.active_scrolls) == ["long"]
+    assert events.count(("UPDATE_LAYER", "long")) >= 2     # 其它滚动照常推进